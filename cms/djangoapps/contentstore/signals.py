@@ -9,6 +9,7 @@ from xmodule.modulestore.django import SignalHandler
 from contentstore.courseware_index import CoursewareSearchIndexer, LibrarySearchIndexer
 from contentstore.proctoring import register_proctored_exams
 from openedx.core.djangoapps.credit.signals import on_course_publish
+from openedx.core.lib.cache_utils import reset_course_publish_version
 
 
 @receiver(SignalHandler.course_published)
@@ -27,6 +28,9 @@ def listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=
     # to perform any 'on_publish' workflow
     on_course_publish(course_key)
 
+    # discard the content the LMS cached from the previously published course
+    reset_course_publish_version(course_key)
+
     # Finally call into the course search subsystem
     # to kick off an indexing action
 
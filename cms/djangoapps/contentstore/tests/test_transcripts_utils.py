@@ -606,6 +606,18 @@ class TestTranscript(unittest.TestCase):
         with self.assertRaises(NotImplementedError):
             transcripts_utils.Transcript.convert(self.srt_transcript, 'srt', 'sjson')
 
+    def test_convert_cached(self):
+        transcript = self.sjson_transcript.replace('Dream', 'Dream {}'.format(uuid4().hex))
+        expected = transcripts_utils.Transcript.convert(transcript, 'sjson', 'srt')
+        with patch.object(transcripts_utils.Transcript, '_convert', return_value=u'converted') as mock_convert:
+            actual = transcripts_utils.Transcript.convert(transcript, 'sjson', 'srt')
+            self.assertFalse(mock_convert.called)
+
+            # Other formats are converted separately.
+            transcripts_utils.Transcript.convert(transcript, 'sjson', 'txt')
+            mock_convert.assert_called_once_with(transcript, 'sjson', 'txt')
+        self.assertEqual(actual, expected)
+
 
 class TestSubsFilename(unittest.TestCase):
     """
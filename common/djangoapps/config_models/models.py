@@ -1,16 +1,80 @@
 """
 Django Model baseclass for database-backed configuration.
+
+Current configuration entries are cached in three tiers:
+
+* a memo in the request cache, so that repeated checks during a request
+  are free;
+* a process-local LRU, whose entries are only used while the global
+  configuration version stored in the shared cache is unchanged;
+* the shared ``configuration`` cache (memcached in production).
+
+Saving any configuration entry changes the global configuration version,
+which invalidates the process-local tier of every process.
 """
+import copy
+
+import dogstats_wrapper as dog_stats_api
 from django.db import connection, models
 from django.contrib.auth.models import User
 from django.core.cache import get_cache, InvalidCacheBackendError
 from django.utils.translation import ugettext_lazy as _
 
+import request_cache
+from openedx.core.lib.cache_utils import LRUCache, get_version_stamp, reset_version_stamp
+
 try:
     cache = get_cache('configuration')  # pylint: disable=invalid-name
 except InvalidCacheBackendError:
     from django.core.cache import cache
 
+VERSION_STAMP_NAME = 'config_models.configuration'
+
+REQUEST_CACHE_NAME = 'config_models.current'
+
+# The fraction of cache lookups reported to datadog, by tier.
+CACHE_STATS_SAMPLE_RATE = 0.01
+
+# Process-local cache of (configuration version, current entry) by cache key.
+_LOCAL_CACHE = LRUCache(maxsize=1000)
+
+
+def _get_request_memo():
+    """
+    Returns the dict memoizing configuration during the current request, or
+    None when there is no request being processed.
+    """
+    if request_cache.get_request() is None:
+        return None
+    return request_cache.get_cache(REQUEST_CACHE_NAME)
+
+
+def _get_configuration_version(memo):
+    """
+    Returns the global configuration version stamp from the shared cache, or
+    the empty string if it can't be stored there.  The version is read once
+    per request.
+    """
+    if memo is not None and VERSION_STAMP_NAME in memo:
+        return memo[VERSION_STAMP_NAME]
+
+    version = get_version_stamp(VERSION_STAMP_NAME, cache)
+    if memo is not None:
+        memo[VERSION_STAMP_NAME] = version
+    return version
+
+
+def _record_cache_lookup(model_class, tier):
+    """
+    Reports a lookup of the current configuration of `model_class` served
+    by `tier`, one of 'request', 'local', 'shared' or 'database'.
+    """
+    dog_stats_api.increment(
+        'config_models.current',
+        tags=[u'tier:{}'.format(tier), u'model:{}'.format(model_class.__name__)],
+        sample_rate=CACHE_STATS_SAMPLE_RATE,
+    )
+
 
 class ConfigurationModelManager(models.Manager):
     """
@@ -97,6 +161,12 @@ class ConfigurationModel(models.Model):
         cache.delete(self.cache_key_name(*[getattr(self, key) for key in self.KEY_FIELDS]))
         if self.KEY_FIELDS:
             cache.delete(self.key_values_cache_key_name())
+        # Change the version after deleting the shared entries, so that no
+        # process can store an outdated entry under the new version.
+        reset_version_stamp(VERSION_STAMP_NAME, cache)
+        memo = _get_request_memo()
+        if memo is not None:
+            memo.clear()
 
     @classmethod
     def cache_key_name(cls, *args):
@@ -116,18 +186,43 @@ class ConfigurationModel(models.Model):
         Return the active configuration entry, either from cache,
         from the database, or by creating a new empty entry (which is not
         persisted).
+
+        Entries returned from the process-local cache are copies, so they can
+        be modified without affecting other requests.
         """
-        cached = cache.get(cls.cache_key_name(*args))
-        if cached is not None:
-            return cached
+        cache_key = cls.cache_key_name(*args)
+        memo = _get_request_memo()
+        if memo is not None and cache_key in memo:
+            _record_cache_lookup(cls, 'request')
+            return memo[cache_key]
+
+        version = _get_configuration_version(memo)
+        if version:
+            local_version, current = _LOCAL_CACHE.get(cache_key, (None, None))
+            if local_version == version:
+                _record_cache_lookup(cls, 'local')
+                current = copy.copy(current)
+                if memo is not None:
+                    memo[cache_key] = current
+                return current
+
+        current = cache.get(cache_key)
+        if current is not None:
+            _record_cache_lookup(cls, 'shared')
+        else:
+            _record_cache_lookup(cls, 'database')
+            key_dict = dict(zip(cls.KEY_FIELDS, args))
+            try:
+                current = cls.objects.filter(**key_dict).order_by('-change_date')[0]
+            except IndexError:
+                current = cls(**key_dict)
 
-        key_dict = dict(zip(cls.KEY_FIELDS, args))
-        try:
-            current = cls.objects.filter(**key_dict).order_by('-change_date')[0]
-        except IndexError:
-            current = cls(**key_dict)
+            cache.set(cache_key, current, cls.cache_timeout)
 
-        cache.set(cls.cache_key_name(*args), current, cls.cache_timeout)
+        if version:
+            _LOCAL_CACHE.set(cache_key, (version, copy.copy(current)))
+        if memo is not None:
+            memo[cache_key] = current
         return current
 
     @classmethod
@@ -10,7 +10,8 @@ from django.test import TestCase
 from freezegun import freeze_time
 
 from mock import patch
-from config_models.models import ConfigurationModel
+from config_models.models import ConfigurationModel, cache as config_cache, _LOCAL_CACHE
+from request_cache.middleware import RequestCache
 
 
 class ExampleConfig(ConfigurationModel):
@@ -282,3 +283,46 @@ class KeyedConfigurationModelTests(TestCase):
         fake_result = [('a', 'b'), ('c', 'd')]
         mock_cache.get.return_value = fake_result
         self.assertEquals(ExampleKeyedConfig.key_values(), fake_result)
+
+
+class ConfigurationModelCacheTierTests(TestCase):
+    """
+    Tests of the request and process-local caching of ConfigurationModel.current
+    """
+    def setUp(self):
+        super(ConfigurationModelCacheTierTests, self).setUp()
+        config_cache.clear()
+        _LOCAL_CACHE.clear()
+        ExampleConfig(string_field='first').save()
+        # Populate the caches
+        ExampleConfig.current()
+
+    def test_local_cache_hit(self):
+        config_cache.delete(ExampleConfig.cache_key_name())
+        with self.assertNumQueries(0):
+            self.assertEquals(ExampleConfig.current().string_field, 'first')
+
+    def test_local_cache_returns_copies(self):
+        ExampleConfig.current().string_field = 'modified'
+        self.assertEquals(ExampleConfig.current().string_field, 'first')
+
+    def test_save_invalidates_local_cache(self):
+        ExampleConfig(string_field='second').save()
+        self.assertEquals(ExampleConfig.current().string_field, 'second')
+
+    def test_cache_clear_invalidates_local_cache(self):
+        config_cache.clear()
+        with self.assertNumQueries(1):
+            ExampleConfig.current()
+
+    def test_request_memo(self):
+        RequestCache().process_request(object())
+        self.addCleanup(RequestCache.clear_request_cache)
+
+        current = ExampleConfig.current()
+        with patch('config_models.models.cache') as mock_cache:
+            self.assertIs(ExampleConfig.current(), current)
+            self.assertFalse(mock_cache.get.called)
+
+        ExampleConfig(string_field='second').save()
+        self.assertEquals(ExampleConfig.current().string_field, 'second')
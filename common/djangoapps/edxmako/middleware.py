@@ -14,20 +14,26 @@
 
 import threading
 from django.template import RequestContext
+from django.utils.translation import get_language
 from util.request import safe_get_host
 
 REQUEST_CONTEXT = threading.local()
 
+# The collapsed template context of the current request.
+_CONTEXT_DICT_CACHE = threading.local()
+
 
 class MakoMiddleware(object):
 
     def process_request(self, request):
         """ Process the middleware request. """
         REQUEST_CONTEXT.request = request
+        _CONTEXT_DICT_CACHE.value = None
 
     def process_response(self, __, response):
         """ Process the middleware response. """
         REQUEST_CONTEXT.request = None
+        _CONTEXT_DICT_CACHE.value = None
         return response
 
 
@@ -43,3 +49,31 @@ def get_template_request_context():
     context['is_secure'] = request.is_secure()
     context['site'] = safe_get_host(request)
     return context
+
+
+def get_template_request_context_dict():
+    """
+    Returns the template processing context of the current request, collapsed
+    to a single dictionary, or returns None if there is not a current request.
+
+    The context processors are only run once per request, unless the user
+    logs in or out or the active language changes during the request.  The
+    returned dictionary is shared and must not be modified.
+    """
+    request = getattr(REQUEST_CONTEXT, "request", None)
+    if not request:
+        return None
+
+    user = getattr(request, 'user', None)
+    language = get_language()
+    cached = getattr(_CONTEXT_DICT_CACHE, 'value', None)
+    if cached is not None:
+        cached_request, cached_user, cached_language, context_dict = cached
+        if cached_request is request and cached_user is user and cached_language == language:
+            return context_dict
+
+    context_dict = {}
+    for item in get_template_request_context():
+        context_dict.update(item)
+    _CONTEXT_DICT_CACHE.value = (request, user, language, context_dict)
+    return context_dict
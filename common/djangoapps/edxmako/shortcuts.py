@@ -12,14 +12,13 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from django.template import Context
 from django.http import HttpResponse
 import logging
 
 from microsite_configuration import microsite
 
 from edxmako import lookup_template
-from edxmako.middleware import get_template_request_context
+from edxmako.middleware import get_template_request_context_dict
 from django.conf import settings
 from django.core.urlresolvers import reverse
 log = logging.getLogger(__name__)
@@ -104,22 +103,16 @@ def render_to_string(template_name, dictionary, context=None, namespace='main'):
     # see if there is an override template defined in the microsite
     template_name = microsite.get_template_path(template_name)
 
-    context_instance = Context(dictionary)
-    # add dictionary to context_instance
-    context_instance.update(dictionary or {})
-    # collapse context_instance to a single dictionary for mako
+    # collapse the request context, dictionary and context to a single dictionary for mako
     context_dictionary = {}
-    context_instance['settings'] = settings
-    context_instance['EDX_ROOT_URL'] = settings.EDX_ROOT_URL
-    context_instance['marketing_link'] = marketing_link
-
     # In various testing contexts, there might not be a current request context.
-    request_context = get_template_request_context()
+    request_context = get_template_request_context_dict()
     if request_context:
-        for item in request_context:
-            context_dictionary.update(item)
-    for item in context_instance:
-        context_dictionary.update(item)
+        context_dictionary.update(request_context)
+    context_dictionary.update(dictionary or {})
+    context_dictionary['settings'] = settings
+    context_dictionary['EDX_ROOT_URL'] = settings.EDX_ROOT_URL
+    context_dictionary['marketing_link'] = marketing_link
     if context:
         context_dictionary.update(context)
 
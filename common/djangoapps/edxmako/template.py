@@ -15,7 +15,7 @@
 import edxmako
 
 from django.conf import settings
-from edxmako.middleware import get_template_request_context
+from edxmako.middleware import get_template_request_context_dict
 from edxmako.shortcuts import marketing_link
 from mako.template import Template as MakoTemplate
 
@@ -48,10 +48,9 @@ class Template(MakoTemplate):
         context_dictionary = {}
 
         # In various testing contexts, there might not be a current request context.
-        request_context = get_template_request_context()
+        request_context = get_template_request_context_dict()
         if request_context:
-            for item in request_context:
-                context_dictionary.update(item)
+            context_dictionary.update(request_context)
         for item in context_instance:
             context_dictionary.update(item)
         context_dictionary['settings'] = settings
@@ -8,16 +8,17 @@ from django.http import HttpResponse
 from django.test import TestCase
 from django.test.utils import override_settings
 from django.test.client import RequestFactory
+from django.template import RequestContext
 from django.core.urlresolvers import reverse
 import edxmako.middleware
-from edxmako.middleware import get_template_request_context
+from edxmako.middleware import get_template_request_context, get_template_request_context_dict
 from edxmako import add_lookup, LOOKUP
 from edxmako.shortcuts import (
     marketing_link,
     render_to_string,
     open_source_footer_context_processor
 )
-from student.tests.factories import UserFactory
+from student.tests.factories import AnonymousUserFactory, UserFactory
 from util.testing import UrlResetMixin
 
 
@@ -91,6 +92,20 @@ class MakoMiddlewareTest(TestCase):
         # requestcontext should be None.
         self.assertIsNone(get_template_request_context())
 
+    def test_request_context_computed_once(self):
+        self.middleware.process_request(self.request)
+        self.addCleanup(self.middleware.process_response, self.request, self.response)
+
+        with patch('edxmako.middleware.RequestContext', wraps=RequestContext) as mock_request_context:
+            context_dict = get_template_request_context_dict()
+            self.assertIs(get_template_request_context_dict(), context_dict)
+            self.assertEqual(mock_request_context.call_count, 1)
+
+            # The context is recomputed when the user changes
+            self.request.user = AnonymousUserFactory.create()
+            self.assertIsNot(get_template_request_context_dict(), context_dict)
+            self.assertEqual(mock_request_context.call_count, 2)
+
     @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
     @patch("edxmako.middleware.REQUEST_CONTEXT")
     def test_render_to_string_when_no_global_context_lms(self, context_mock):
@@ -6,7 +6,6 @@ This API is exposed via the middleware(emabargo/middileware.py) layer but may be
 
 """
 import logging
-import pygeoip
 
 from django.core.cache import cache
 from django.conf import settings
@@ -16,6 +15,7 @@ from ipware.ip import get_ip
 
 from student.auth import has_course_author_access
 from embargo.models import CountryAccessRule, RestrictedCourse
+from geoinfo.api import country_code_by_addr
 
 
 log = logging.getLogger(__name__)
@@ -170,10 +170,7 @@ def _country_code_from_ip(ip_addr):
         str: A 2-letter country code.
 
     """
-    if ip_addr.find(':') >= 0:
-        return pygeoip.GeoIP(settings.GEOIPV6_PATH).country_code_by_addr(ip_addr)
-    else:
-        return pygeoip.GeoIP(settings.GEOIP_PATH).country_code_by_addr(ip_addr)
+    return country_code_by_addr(ip_addr)
 
 
 def get_embargo_response(request, course_id, user):
@@ -27,6 +27,7 @@ from student.roles import (
 from embargo.models import (
     RestrictedCourse, Country, CountryAccessRule,
 )
+from geoinfo.api import clear_databases
 
 from util.testing import UrlResetMixin
 from embargo import api as embargo_api
@@ -228,6 +229,7 @@ class EmbargoCheckAccessApiTests(ModuleStoreTestCase):
 
     @contextmanager
     def _mock_geoip(self, country_code):
+        clear_databases()
         with mock.patch.object(pygeoip.GeoIP, 'country_code_by_addr') as mock_ip:
             mock_ip.return_value = country_code
             yield
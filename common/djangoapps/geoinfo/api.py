@@ -0,0 +1,127 @@
+"""
+Process-wide lookup of the country of IP addresses.
+
+The GeoIP databases are opened once per process and kept in memory, instead
+of being re-opened and parsed on every lookup.  A database is re-opened when
+its file changes on disk.  Recent lookup results are kept in an LRU.
+
+Usage::
+
+    from geoinfo.api import country_code_by_addr
+    country_code = country_code_by_addr('117.79.83.1')
+"""
+import logging
+import os
+import threading
+import time
+
+import pygeoip
+from django.conf import settings
+
+from openedx.core.lib.cache_utils import LRUCache
+
+log = logging.getLogger(__name__)
+
+# Number of IP addresses whose country is kept in memory, per database.
+LOOKUP_CACHE_SIZE = 10000
+
+# Minimum number of seconds between checks for changes to a database file.
+RELOAD_CHECK_INTERVAL = 60
+
+
+class GeoIPDatabase(object):
+    """
+    A GeoIP database loaded in memory, along with the results of its recent
+    lookups.  The database is re-opened when its file is modified.
+    """
+    def __init__(self, path, flags=pygeoip.MEMORY_CACHE, cache_size=LOOKUP_CACHE_SIZE):
+        self.path = path
+        self.flags = flags
+        self.lookups = LRUCache(maxsize=cache_size)
+        self._geoip = None
+        self._mtime = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def _file_mtime(self):
+        """
+        Returns the modification time of the database file, or None if it can't be read.
+        """
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def _get_geoip(self):
+        """
+        Returns the `pygeoip.GeoIP` reading the database, opening it if it
+        is not open yet or its file changed since it was opened.
+        """
+        now = time.time()
+        if self._geoip is not None and now - self._checked_at < RELOAD_CHECK_INTERVAL:
+            return self._geoip
+
+        with self._lock:
+            if self._geoip is None or now - self._checked_at >= RELOAD_CHECK_INTERVAL:
+                mtime = self._file_mtime()
+                if self._geoip is None or mtime != self._mtime:
+                    if self._geoip is not None:
+                        log.info(u"GeoIP database %s changed, reloading it", self.path)
+                    self._geoip = pygeoip.GeoIP(self.path, self.flags)
+                    self._mtime = mtime
+                    self.lookups.clear()
+                self._checked_at = now
+            return self._geoip
+
+    def country_code_by_addr(self, ip_address):
+        """
+        Returns the 2-letter country code of `ip_address`, or '' if it is unknown.
+        """
+        geoip = self._get_geoip()
+        country_code = self.lookups.get(ip_address)
+        if country_code is None:
+            country_code = geoip.country_code_by_addr(ip_address)
+            self.lookups.set(ip_address, country_code)
+        return country_code
+
+
+_DATABASES = {}
+_DATABASES_LOCK = threading.Lock()
+
+
+def get_database(path):
+    """
+    Returns the process-wide `GeoIPDatabase` of the file at `path`.
+    """
+    database = _DATABASES.get(path)
+    if database is None:
+        with _DATABASES_LOCK:
+            database = _DATABASES.setdefault(path, GeoIPDatabase(path))
+    return database
+
+
+def clear_databases():
+    """
+    Closes every open database and forgets the results of its lookups.
+    """
+    with _DATABASES_LOCK:
+        _DATABASES.clear()
+
+
+def country_code_by_addr(ip_address):
+    """
+    Return the country code associated with an IP address.
+    Handles both IPv4 and IPv6 addresses.
+
+    Args:
+        ip_address (str): The IP address to look up.
+
+    Returns:
+        str: A 2-letter country code.
+
+    """
+    if ip_address.find(':') >= 0:
+        path = settings.GEOIPV6_PATH
+    else:
+        path = settings.GEOIP_PATH
+    return get_database(path).country_code_by_addr(ip_address)
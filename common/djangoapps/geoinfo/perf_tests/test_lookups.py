@@ -0,0 +1,71 @@
+"""
+Performance test of IP address to country lookups, comparing a GeoIP
+database opened for every lookup with the process-wide databases of
+geoinfo.api.
+"""
+import random
+import socket
+import struct
+import unittest
+
+from django.conf import settings
+from nose.plugins.skip import SkipTest
+import pygeoip
+
+from geoinfo.api import clear_databases, country_code_by_addr
+
+# The dependency below needs to be installed manually from the development.txt file, which doesn't
+# get installed during unit tests!
+try:
+    from code_block_timer import CodeBlockTimer
+except ImportError:
+    CodeBlockTimer = None
+
+# Number of lookups timed.
+LOOKUPS = 10000
+
+# Number of distinct IP addresses looked up; fewer means more lookup cache hits.
+DISTINCT_ADDRESSES = 1000
+
+
+def _open_per_lookup(ip_address):
+    """The lookup as done before geoinfo.api, opening the database every time."""
+    return pygeoip.GeoIP(settings.GEOIP_PATH).country_code_by_addr(ip_address)
+
+
+# Eventually, exclude this attribute from regular unittests while running *only* tests
+# with this attribute during regular performance tests.
+# @attr("perf_test")
+@unittest.skip
+class GeoIPLookupPerfTest(unittest.TestCase):
+    """
+    This class exists to time the lookups of random IP addresses.
+    """
+
+    # Use this attr to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super(GeoIPLookupPerfTest, self).setUp()
+        self.addresses = [
+            socket.inet_ntoa(struct.pack('>I', random.randint(0x01000000, 0xdfffffff)))
+            for __ in xrange(DISTINCT_ADDRESSES)
+        ]
+        self.addCleanup(clear_databases)
+
+    def test_lookup_timings(self):
+        """
+        Generate timings of both ways of looking up, which must agree.
+        """
+        if CodeBlockTimer is None:
+            raise SkipTest("CodeBlockTimer undefined.")
+
+        for ip_address in self.addresses:
+            self.assertEqual(_open_per_lookup(ip_address), country_code_by_addr(ip_address))
+        clear_databases()
+
+        lookups = [random.choice(self.addresses) for __ in xrange(LOOKUPS)]
+        for name, lookup in (('open_per_lookup', _open_per_lookup), ('shared_database', country_code_by_addr)):
+            with CodeBlockTimer("GeoIPLookups:{}:{}".format(name, LOOKUPS)):
+                for ip_address in lookups:
+                    lookup(ip_address)
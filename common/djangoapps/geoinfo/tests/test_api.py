@@ -0,0 +1,56 @@
+"""
+Tests for the GeoIP lookup api.
+"""
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.test import TestCase
+from mock import patch
+import pygeoip
+
+from geoinfo import api
+
+
+class GeoIPDatabaseTests(TestCase):
+    """
+    Tests of GeoIPDatabase and country_code_by_addr.
+    """
+    def setUp(self):
+        super(GeoIPDatabaseTests, self).setUp()
+        api.clear_databases()
+        self.addCleanup(api.clear_databases)
+
+    @patch.object(pygeoip.GeoIP, 'country_code_by_addr')
+    def test_lookups_cached(self, mock_lookup):
+        mock_lookup.return_value = 'CN'
+        self.assertEqual(api.country_code_by_addr('117.79.83.1'), 'CN')
+        self.assertEqual(api.country_code_by_addr('117.79.83.1'), 'CN')
+        self.assertEqual(mock_lookup.call_count, 1)
+
+    def test_database_opened_once(self):
+        self.assertIs(api.get_database(settings.GEOIP_PATH), api.get_database(settings.GEOIP_PATH))
+        with patch('pygeoip.GeoIP', wraps=pygeoip.GeoIP) as mock_geoip:
+            api.country_code_by_addr('117.79.83.1')
+            api.country_code_by_addr('4.0.0.0')
+            api.country_code_by_addr('2001:da8:20f:1502:edcf:550b:4a9c:207d')
+        self.assertEqual(
+            [call_args[0][0] for call_args in mock_geoip.call_args_list],
+            [settings.GEOIP_PATH, settings.GEOIPV6_PATH]
+        )
+
+    @patch.object(api, 'RELOAD_CHECK_INTERVAL', 0)
+    def test_reload_on_file_change(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        path = os.path.join(temp_dir, 'GeoIP.dat')
+        shutil.copy(settings.GEOIP_PATH, path)
+
+        database = api.GeoIPDatabase(path)
+        with patch.object(pygeoip.GeoIP, 'country_code_by_addr', return_value='CN'):
+            database.country_code_by_addr('117.79.83.1')
+
+        os.utime(path, (0, 0))
+        with patch.object(pygeoip.GeoIP, 'country_code_by_addr', return_value='US'):
+            self.assertEqual(database.country_code_by_addr('117.79.83.1'), 'US')
@@ -7,6 +7,7 @@ import pygeoip
 from django.contrib.sessions.middleware import SessionMiddleware
 from django.test import TestCase
 from django.test.client import RequestFactory
+from geoinfo.api import clear_databases
 from geoinfo.middleware import CountryMiddleware
 
 from student.tests.factories import UserFactory, AnonymousUserFactory
@@ -23,6 +24,7 @@ class CountryMiddlewareTests(TestCase):
         self.authenticated_user = UserFactory.create()
         self.anonymous_user = AnonymousUserFactory.create()
         self.request_factory = RequestFactory()
+        clear_databases()
         self.patcher = patch.object(pygeoip.GeoIP, 'country_code_by_addr', self.mock_country_code_by_addr)
         self.patcher.start()
         self.addCleanup(self.patcher.stop)
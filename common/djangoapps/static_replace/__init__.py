@@ -10,9 +10,20 @@ from xmodule.modulestore import ModuleStoreEnum
 from xmodule.contentstore.content import StaticContent
 
 from opaque_keys.edx.locator import AssetLocator
+from openedx.core.lib.cache_utils import LRUCache
 
 log = logging.getLogger(__name__)
 
+# Compiled url regexes, keyed by the prefix pattern they match.
+_URL_REGEX_CACHE = LRUCache(maxsize=500)
+
+# Urls that static paths resolve to, keyed by everything the resolution
+# depends on.  Neither the collected static files nor the location of
+# course assets change while a process runs, so this is shared by all
+# requests.  See _get_resolved_url_cache.
+_RESOLVED_URL_CACHE = LRUCache(maxsize=10000)
+_RESOLVED_URL_CACHE_STORAGE = [None]
+
 
 def _url_replace_regex(prefix):
     """
@@ -30,6 +41,38 @@ def _url_replace_regex(prefix):
         """.format(prefix=prefix)
 
 
+def _compiled_url_replace_regex(prefix):
+    """
+    Returns the compiled form of `_url_replace_regex(prefix)`.
+    """
+    regex = _URL_REGEX_CACHE.get(prefix)
+    if regex is None:
+        regex = re.compile(_url_replace_regex(prefix))
+        _URL_REGEX_CACHE.set(prefix, regex)
+    return regex
+
+
+def _static_prefix_regex(data_dir):
+    """
+    Prefix pattern for static urls that don't already point into `data_dir`.
+    """
+    return u'(?:{static_url}|/static/)(?!{data_dir})'.format(
+        static_url=settings.STATIC_URL,
+        data_dir=data_dir
+    )
+
+
+def _get_resolved_url_cache():
+    """
+    Returns the cache of resolved static urls, emptying it first if the
+    staticfiles storage it was filled from has been replaced.
+    """
+    if _RESOLVED_URL_CACHE_STORAGE[0] is not staticfiles_storage:
+        _RESOLVED_URL_CACHE.clear()
+        _RESOLVED_URL_CACHE_STORAGE[0] = staticfiles_storage
+    return _RESOLVED_URL_CACHE
+
+
 def try_staticfiles_lookup(path):
     """
     Try to lookup a path in staticfiles_storage.  If it fails, return
@@ -71,7 +114,7 @@ def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):
         rest = match.group('rest')
         return "".join([quote, jump_to_id_base_url + rest, quote])
 
-    return re.sub(_url_replace_regex('/jump_to_id/'), replace_jump_to_id_url, text)
+    return _compiled_url_replace_regex('/jump_to_id/').sub(replace_jump_to_id_url, text)
 
 
 def replace_course_urls(text, course_key):
@@ -91,7 +134,7 @@ def replace_course_urls(text, course_key):
         rest = match.group('rest')
         return "".join([quote, '/courses/' + course_id + '/', rest, quote])
 
-    return re.sub(_url_replace_regex('/course/'), replace_course_url, text)
+    return _compiled_url_replace_regex('/course/').sub(replace_course_url, text)
 
 
 def process_static_urls(text, replacement_function, data_dir=None):
@@ -110,14 +153,7 @@ def process_static_urls(text, replacement_function, data_dir=None):
         rest = match.group('rest')
         return replacement_function(original, prefix, quote, rest)
 
-    return re.sub(
-        _url_replace_regex(u'(?:{static_url}|/static/)(?!{data_dir})'.format(
-            static_url=settings.STATIC_URL,
-            data_dir=data_dir
-        )),
-        wrap_part_extraction,
-        text
-    )
+    return _compiled_url_replace_regex(_static_prefix_regex(data_dir)).sub(wrap_part_extraction, text)
 
 
 def make_static_urls_absolute(request, html):
@@ -137,18 +173,59 @@ def make_static_urls_absolute(request, html):
     )
 
 
-def replace_static_urls(text, data_directory=None, course_id=None, static_asset_path=''):
+def _resolve_static_url(prefix, rest, data_directory, course_id, static_asset_path, is_mongo_course):
     """
-    Replace /static/$stuff urls either with their correct url as generated by collectstatic,
-    (/static/$md5_hashed_stuff) or by the course-specific content static url
-    /static/$course_data_dir/$stuff, or, if course_namespace is not None, by the
-    correct url in the contentstore (/c4x/.. or /asset-loc:..)
+    Returns the url that the static path `rest` should be replaced with.
+    See replace_static_urls.
+    """
+    # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
+    if (not static_asset_path) and course_id and is_mongo_course:
+        # first look in the static file pipeline and see if we are trying to reference
+        # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
+
+        exists_in_staticfiles_storage = False
+        try:
+            exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
+        except Exception as err:
+            log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
+                rest, str(err)))
+
+        if exists_in_staticfiles_storage:
+            url = staticfiles_storage.url(rest)
+        else:
+            # if not, then assume it's courseware specific content and then look in the
+            # Mongo-backed database
+            url = StaticContent.convert_legacy_static_url_with_course_id(rest, course_id)
 
-    text: The source text to do the substitution in
-    data_directory: The directory in which course data is stored
-    course_id: The course identifier used to distinguish static content for this course in studio
-    static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
+            if AssetLocator.CANONICAL_NAMESPACE in url:
+                url = url.replace('block@', 'block/', 1)
+
+    # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
+    else:
+        course_path = "/".join((static_asset_path or data_directory, rest))
+
+        try:
+            if staticfiles_storage.exists(rest):
+                url = staticfiles_storage.url(rest)
+            else:
+                url = staticfiles_storage.url(course_path)
+        # And if that fails, assume that it's course content, and add manually data directory
+        except Exception as err:
+            log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
+                rest, str(err)))
+            url = "".join([prefix, course_path])
+
+    return url
+
+
+def _static_url_replacer(data_directory, course_id, static_asset_path):
+    """
+    Returns a function that replaces a single static url matched by
+    `process_static_urls`.  Resolved urls are memoized across calls.
     """
+    resolved_urls = _get_resolved_url_cache()
+    # Whether the course is Mongo-backed is only looked up if a url needs it.
+    is_mongo_course = []
 
     def replace_static_url(original, prefix, quote, rest):
         """
@@ -161,45 +238,72 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
         # In debug mode, if we can find the url as is,
         if settings.DEBUG and finders.find(rest, True):
             return original
-        # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
-        elif (not static_asset_path) \
-                and course_id \
-                and modulestore().get_modulestore_type(course_id) != ModuleStoreEnum.Type.xml:
-            # first look in the static file pipeline and see if we are trying to reference
-            # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
-
-            exists_in_staticfiles_storage = False
-            try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
-            except Exception as err:
-                log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
-                    rest, str(err)))
-
-            if exists_in_staticfiles_storage:
-                url = staticfiles_storage.url(rest)
-            else:
-                # if not, then assume it's courseware specific content and then look in the
-                # Mongo-backed database
-                url = StaticContent.convert_legacy_static_url_with_course_id(rest, course_id)
 
-                if AssetLocator.CANONICAL_NAMESPACE in url:
-                    url = url.replace('block@', 'block/', 1)
-
-        # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
-        else:
-            course_path = "/".join((static_asset_path or data_directory, rest))
-
-            try:
-                if staticfiles_storage.exists(rest):
-                    url = staticfiles_storage.url(rest)
-                else:
-                    url = staticfiles_storage.url(course_path)
-            # And if that fails, assume that it's course content, and add manually data directory
-            except Exception as err:
-                log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
-                    rest, str(err)))
-                url = "".join([prefix, course_path])
+        if not is_mongo_course:
+            is_mongo_course.append(
+                bool(course_id) and modulestore().get_modulestore_type(course_id) != ModuleStoreEnum.Type.xml
+            )
+        cache_key = (course_id, data_directory, static_asset_path, is_mongo_course[0], prefix, rest)
+        url = resolved_urls.get(cache_key)
+        if url is None:
+            url = _resolve_static_url(prefix, rest, data_directory, course_id, static_asset_path, is_mongo_course[0])
+            resolved_urls.set(cache_key, url)
 
         return "".join([quote, url, quote])
 
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+    return replace_static_url
+
+
+def replace_static_urls(text, data_directory=None, course_id=None, static_asset_path=''):
+    """
+    Replace /static/$stuff urls either with their correct url as generated by collectstatic,
+    (/static/$md5_hashed_stuff) or by the course-specific content static url
+    /static/$course_data_dir/$stuff, or, if course_namespace is not None, by the
+    correct url in the contentstore (/c4x/.. or /asset-loc:..)
+
+    text: The source text to do the substitution in
+    data_directory: The directory in which course data is stored
+    course_id: The course identifier used to distinguish static content for this course in studio
+    static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
+    """
+    return process_static_urls(
+        text,
+        _static_url_replacer(data_directory, course_id, static_asset_path),
+        data_dir=static_asset_path or data_directory
+    )
+
+
+def replace_urls(text, course_id, data_directory=None, static_asset_path='', jump_to_id_base_url=None):
+    """
+    Apply replace_static_urls, replace_course_urls and, if
+    `jump_to_id_base_url` is given, replace_jump_to_id_urls to `text`
+    in a single scan.
+
+    The arguments have the same meaning as for those functions.
+    """
+    data_dir = static_asset_path or data_directory
+    alternatives = [
+        u'(?P<static_prefix>{})'.format(_static_prefix_regex(data_dir)),
+        u'(?P<course_prefix>/course/)',
+    ]
+    if jump_to_id_base_url is not None:
+        alternatives.append(u'(?P<jump_to_id_prefix>/jump_to_id/)')
+    regex = _compiled_url_replace_regex(u'(?:{})'.format(u'|'.join(alternatives)))
+
+    replace_static_url = _static_url_replacer(data_directory, course_id, static_asset_path)
+    course_url_base = '/courses/' + course_id.to_deprecated_string() + '/'
+
+    def replace_url(match):
+        """
+        Replace a single matched url, according to the prefix that matched.
+        """
+        quote = match.group('quote')
+        rest = match.group('rest')
+        if match.group('static_prefix') is not None:
+            return replace_static_url(match.group(0), match.group('prefix'), quote, rest)
+        elif match.group('course_prefix') is not None:
+            return "".join([quote, course_url_base, rest, quote])
+        else:
+            return "".join([quote, jump_to_id_base_url + rest, quote])
+
+    return regex.sub(replace_url, text)
@@ -0,0 +1,77 @@
+"""
+Performance test of the static url rewriting applied to rendered modules,
+comparing the three separate passes with the single-pass replace_urls.
+"""
+import os
+import unittest
+
+from django.conf import settings
+from nose.plugins.skip import SkipTest
+
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from static_replace import replace_course_urls, replace_jump_to_id_urls, replace_static_urls, replace_urls
+
+# The dependency below needs to be installed manually from the development.txt file, which doesn't
+# get installed during unit tests!
+try:
+    from code_block_timer import CodeBlockTimer
+except ImportError:
+    CodeBlockTimer = None
+
+COURSE_KEY = SlashSeparatedCourseKey('edX', 'perf_test', 'run')
+DATA_DIRECTORY = 'perf_test'
+JUMP_TO_ID_BASE_URL = '/courses/edX/perf_test/run/jump_to_id/'
+
+# Number of passes over every html file of the test data.
+ITERATIONS = 20
+
+
+def _separate_passes(text):
+    """The rewriting as applied by three separate wrappers."""
+    text = replace_static_urls(text, DATA_DIRECTORY, course_id=COURSE_KEY)
+    text = replace_course_urls(text, COURSE_KEY)
+    return replace_jump_to_id_urls(text, COURSE_KEY, JUMP_TO_ID_BASE_URL)
+
+
+def _single_pass(text):
+    """The rewriting as applied by replace_urls."""
+    return replace_urls(text, COURSE_KEY, DATA_DIRECTORY, jump_to_id_base_url=JUMP_TO_ID_BASE_URL)
+
+
+# Eventually, exclude this attribute from regular unittests while running *only* tests
+# with this attribute during regular performance tests.
+# @attr("perf_test")
+@unittest.skip
+class ReplaceUrlsPerfTest(unittest.TestCase):
+    """
+    This class exists to time the rewriting of every .html file under
+    common/test/data.
+    """
+
+    # Use this attr to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super(ReplaceUrlsPerfTest, self).setUp()
+        self.documents = []
+        for dirpath, __, filenames in os.walk(os.path.join(settings.COMMON_ROOT, 'test', 'data')):
+            for filename in filenames:
+                if filename.endswith('.html'):
+                    with open(os.path.join(dirpath, filename)) as html_file:
+                        self.documents.append(html_file.read().decode('utf-8'))
+
+    def test_replace_urls_timings(self):
+        """
+        Generate timings of both ways of rewriting, which must agree.
+        """
+        if CodeBlockTimer is None:
+            raise SkipTest("CodeBlockTimer undefined.")
+
+        for name, rewrite in (('separate_passes', _separate_passes), ('single_pass', _single_pass)):
+            with CodeBlockTimer("ReplaceUrls:{}:{}".format(name, len(self.documents))):
+                for __ in xrange(ITERATIONS):
+                    for text in self.documents:
+                        rewrite(text)
+
+        for text in self.documents:
+            self.assertEqual(_separate_passes(text), _single_pass(text))
@@ -4,6 +4,8 @@ from nose.tools import assert_equals, assert_true, assert_false  # pylint: disab
 from static_replace import (
     replace_static_urls,
     replace_course_urls,
+    replace_jump_to_id_urls,
+    replace_urls,
     _url_replace_regex,
     process_static_urls,
     make_static_urls_absolute
@@ -143,6 +145,41 @@ def test_static_url_with_query(mock_modulestore, mock_storage):
     assert_equals(post_text, replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY))
 
 
+@patch('static_replace.staticfiles_storage')
+def test_resolved_urls_are_memoized(mock_storage):
+    mock_storage.exists.return_value = True
+    mock_storage.url.return_value = '/static/file.png'
+
+    replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY)
+    replace_static_urls(STATIC_SOURCE + STATIC_SOURCE, DATA_DIRECTORY)
+    assert_equals(mock_storage.exists.call_count, 1)
+    assert_equals(mock_storage.url.call_count, 1)
+
+
+@patch('static_replace.staticfiles_storage')
+@patch('static_replace.modulestore')
+def test_replace_urls_single_pass(mock_modulestore, mock_storage):
+    mock_storage.exists.return_value = False
+    mock_modulestore.return_value = Mock(MongoModuleStore)
+    jump_to_id_base_url = '/courses/org/course/run/jump_to_id/'
+    text = (
+        '<img src="/static/file.png"/> <a href=\'/course/info\'>info</a> '
+        '<a href="/jump_to_id/abc">jump</a> <a href="/static/raw.txt?raw">raw</a>'
+    )
+
+    expected = replace_jump_to_id_urls(
+        replace_course_urls(replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY), COURSE_KEY),
+        COURSE_KEY,
+        jump_to_id_base_url
+    )
+    assert_equals(
+        expected,
+        replace_urls(text, COURSE_KEY, DATA_DIRECTORY, jump_to_id_base_url=jump_to_id_base_url)
+    )
+    assert_true('/courses/org/course/run/info' in expected)
+    assert_true('/courses/org/course/run/jump_to_id/abc' in expected)
+
+
 def test_regex():
     yes = ('"/static/foo.png"',
            '"/static/foo.png"',
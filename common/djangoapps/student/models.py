@@ -50,6 +50,7 @@ from certificates.models import GeneratedCertificate
 from course_modes.models import CourseMode
 import lms.lib.comment_client as cc
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from openedx.core.lib.cache_utils import invalidate_after_commit, reset_version_stamp
 from util.model_utils import emit_field_changed_events, get_changed_fields_dict
 from util.query import use_read_replica_if_available
 
@@ -1512,6 +1513,30 @@ class CourseAccessRole(models.Model):
     def __unicode__(self):
         return "[CourseAccessRole] user: {}   role: {}   org: {}   course: {}".format(self.user.username, self.role, self.org, self.course_id)
 
+    @staticmethod
+    def role_cache_version_stamp_name(user_id):
+        """
+        Name of the version stamp of the roles of a user cached by student.roles.RoleCache.
+        """
+        return u'student.course_access_role.{}'.format(user_id)
+
+
+@receiver(models.signals.post_save, sender=CourseAccessRole)
+@receiver(models.signals.post_delete, sender=CourseAccessRole)
+def invalidate_role_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Discards the cached roles of the user of a CourseAccessRole which changed."""
+    invalidate_after_commit(reset_version_stamp, CourseAccessRole.role_cache_version_stamp_name(instance.user_id))
+
+
+@receiver(post_save, sender=User)
+def invalidate_new_user_role_cache(sender, instance, created, **kwargs):  # pylint: disable=unused-argument
+    """
+    Discards any roles cached for the id of a new user, which may have been
+    reused from a deleted user.
+    """
+    if created:
+        invalidate_after_commit(reset_version_stamp, CourseAccessRole.role_cache_version_stamp_name(instance.id))
+
 
 #### Helper methods for use from python manage.py shell and other classes.
 
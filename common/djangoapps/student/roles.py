@@ -6,8 +6,10 @@ adding users, removing users, and listing members
 from abc import ABCMeta, abstractmethod
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 import logging
 
+from openedx.core.lib.cache_utils import get_version_stamp
 from student.models import CourseAccessRole
 from xmodule_django.models import CourseKeyField
 
@@ -17,6 +19,11 @@ log = logging.getLogger(__name__)
 # A list of registered access roles.
 REGISTERED_ACCESS_ROLES = {}
 
+# The roles of a user are kept in the default cache, under a key including a
+# version stamp of the user, which is reset whenever one of the user's
+# CourseAccessRoles is saved or deleted.
+ROLE_CACHE_TIMEOUT = 60 * 60  # 1 hour
+
 
 def register_access_role(cls):
     """
@@ -34,25 +41,33 @@ def register_access_role(cls):
     return cls
 
 
+def _role_cache_key(user_id):
+    """Cache key of the roles of a user."""
+    stamp = get_version_stamp(CourseAccessRole.role_cache_version_stamp_name(user_id))
+    return u'student.roles.{}.{}'.format(user_id, stamp)
+
+
 class RoleCache(object):
     """
-    A cache of the CourseAccessRoles held by a particular user
+    A cache of the CourseAccessRoles held by a particular user, as a set of
+    (role, course_id, org) tuples, shared between requests.
     """
     def __init__(self, user):
-        self._roles = set(
-            CourseAccessRole.objects.filter(user=user).all()
-        )
+        cache_key = _role_cache_key(user.id)
+        roles = cache.get(cache_key)
+        if roles is None:
+            roles = frozenset(
+                (access_role.role, access_role.course_id, access_role.org)
+                for access_role in CourseAccessRole.objects.filter(user=user)
+            )
+            cache.set(cache_key, roles, ROLE_CACHE_TIMEOUT)
+        self._roles = roles
 
     def has_role(self, role, course_id, org):
         """
         Return whether this RoleCache contains a role with the specified role, course_id, and org
         """
-        return any(
-            access_role.role == role and
-            access_role.course_id == course_id and
-            access_role.org == org
-            for access_role in self._roles
-        )
+        return (role, course_id, org) in self._roles
 
 
 class AccessRole(object):
@@ -89,6 +104,12 @@ class AccessRole(object):
         """
         return User.objects.none()
 
+    def user_ids_with_role(self, user_ids):
+        """
+        Return the set of the ids among `user_ids` of the users who have this role.
+        """
+        return set(user.id for user in User.objects.filter(id__in=user_ids) if self.has_user(user))
+
 
 class GlobalStaff(AccessRole):
     """
@@ -112,6 +133,9 @@ class GlobalStaff(AccessRole):
     def users_with_role(self):
         raise Exception("This operation is un-indexed, and shouldn't be used")
 
+    def user_ids_with_role(self, user_ids):
+        return set(User.objects.filter(id__in=user_ids, is_staff=True).values_list('id', flat=True))
+
 
 class RoleBase(AccessRole):
     """
@@ -185,6 +209,22 @@ class RoleBase(AccessRole):
         )
         return entries
 
+    def user_ids_with_role(self, user_ids):
+        """
+        Return the set of the ids among `user_ids` of the users who have this role, with a single query.
+
+        Like has_user, only active users are considered to have the role.
+        """
+        return set(
+            CourseAccessRole.objects.filter(
+                user_id__in=user_ids,
+                user__is_active=True,
+                role=self._role_name,
+                org=self.org,
+                course_id=self.course_key,
+            ).values_list('user_id', flat=True)
+        )
+
 
 class CourseRole(RoleBase):
     """
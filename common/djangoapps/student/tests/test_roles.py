@@ -2,14 +2,19 @@
 Tests of student.roles
 """
 import ddt
+from django.contrib.auth.models import User
+from django.core.cache import cache as default_cache
+from django.core.signals import request_finished
 from django.test import TestCase
 
+from courseware.access import has_access
 from courseware.tests.factories import UserFactory, StaffFactory, InstructorFactory
+from student.models import CourseAccessRole
 from student.tests.factories import AnonymousUserFactory
 
 from student.roles import (
     GlobalStaff, CourseRole, CourseStaffRole, CourseInstructorRole,
-    OrgStaffRole, OrgInstructorRole, RoleCache, CourseBetaTesterRole
+    OrgStaffRole, OrgInstructorRole, RoleCache, CourseBetaTesterRole, _role_cache_key
 )
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
@@ -193,3 +198,82 @@ class RoleCacheTestCase(TestCase):
     def test_empty_cache(self, role, target):
         cache = RoleCache(self.user)
         self.assertFalse(cache.has_role(*target))
+
+    def test_shared_between_requests(self):
+        CourseStaffRole(self.IN_KEY).add_users(self.user)
+        RoleCache(self.user)
+        with self.assertNumQueries(0):
+            self.assertTrue(RoleCache(self.user).has_role('staff', self.IN_KEY, 'edX'))
+
+    def test_invalidated_on_change(self):
+        role = CourseStaffRole(self.IN_KEY)
+        self.assertFalse(RoleCache(self.user).has_role('staff', self.IN_KEY, 'edX'))
+        role.add_users(self.user)
+        self.assertTrue(RoleCache(self.user).has_role('staff', self.IN_KEY, 'edX'))
+        role.remove_users(self.user)
+        self.assertFalse(RoleCache(self.user).has_role('staff', self.IN_KEY, 'edX'))
+
+    def test_revoked_role_denies_access(self):
+        role = CourseStaffRole(self.IN_KEY)
+        role.add_users(self.user)
+        # Fetch the user again for each check, as each request does.
+        self.assertTrue(has_access(User.objects.get(id=self.user.id), 'staff', self.IN_KEY))
+        role.remove_users(self.user)
+        self.assertFalse(has_access(User.objects.get(id=self.user.id), 'staff', self.IN_KEY))
+
+    def test_invalidated_again_after_commit(self):
+        role = CourseStaffRole(self.IN_KEY)
+        role.add_users(self.user)
+        role.remove_users(self.user)
+        # Another process reads the roles before the removal is committed.
+        default_cache.set(_role_cache_key(self.user.id), frozenset([('staff', self.IN_KEY, 'edX')]))
+        self.assertTrue(RoleCache(self.user).has_role('staff', self.IN_KEY, 'edX'))
+
+        # The roles are discarded again once the request is finished.
+        request_finished.send(sender=None)
+        self.assertFalse(RoleCache(self.user).has_role('staff', self.IN_KEY, 'edX'))
+
+
+class UserIdsWithRoleTestCase(TestCase):
+    """
+    Tests of the bulk lookup of the users who have a role.
+    """
+    COURSE_KEY = SlashSeparatedCourseKey('edX', 'toy', '2012_Fall')
+
+    def setUp(self):
+        super(UserIdsWithRoleTestCase, self).setUp()
+        self.student = UserFactory()
+        self.inactive_staff = UserFactory(is_active=False)
+        self.global_staff = UserFactory(is_staff=True)
+        self.course_staff = StaffFactory(course_key=self.COURSE_KEY)
+        self.org_staff = UserFactory()
+        OrgStaffRole(self.COURSE_KEY.org).add_users(self.org_staff)
+        # add_users ignores inactive users
+        CourseAccessRole.objects.create(
+            user=self.inactive_staff, role=CourseStaffRole.ROLE, org=self.COURSE_KEY.org, course_id=self.COURSE_KEY
+        )
+        self.user_ids = [
+            user.id for user in (self.student, self.inactive_staff, self.global_staff, self.course_staff, self.org_staff)
+        ]
+
+    def test_course_role(self):
+        with self.assertNumQueries(1):
+            user_ids = CourseStaffRole(self.COURSE_KEY).user_ids_with_role(self.user_ids)
+        self.assertEqual(user_ids, {self.course_staff.id})
+
+    def test_org_role(self):
+        with self.assertNumQueries(1):
+            user_ids = OrgStaffRole(self.COURSE_KEY.org).user_ids_with_role(self.user_ids)
+        self.assertEqual(user_ids, {self.org_staff.id})
+
+    def test_global_staff(self):
+        with self.assertNumQueries(1):
+            user_ids = GlobalStaff().user_ids_with_role(self.user_ids)
+        self.assertEqual(user_ids, {self.global_staff.id})
+
+    def test_agrees_with_has_user(self):
+        for role in (CourseStaffRole(self.COURSE_KEY), OrgStaffRole(self.COURSE_KEY.org), GlobalStaff()):
+            self.assertEqual(
+                role.user_ids_with_role(self.user_ids),
+                set(user_id for user_id in self.user_ids if role.has_user(User.objects.get(id=user_id)))
+            )
@@ -26,3 +26,13 @@ class BaseBackend(object):
     def send(self, event):
         """Send event to tracker."""
         pass
+
+    def send_many(self, events):
+        """
+        Send a batch of events to tracker.
+
+        Backends that can write several events at once should override
+        this; by default the events are sent one by one.
+        """
+        for event in events:
+            self.send(event)
@@ -0,0 +1,161 @@
+"""
+Event tracker backend that sends events to another backend from a
+background thread, so that requests do not wait for the event sink.
+
+Example configuration::
+
+  TRACKING_BACKENDS = {
+      'mongo': {
+          'ENGINE': 'track.backends.buffered.BufferedBackend',
+          'OPTIONS': {
+              'backend': {
+                  'ENGINE': 'track.backends.mongodb.MongoBackend',
+                  'OPTIONS': {
+                      'database': 'track',
+                  }
+              },
+              'max_queue_size': 10000,
+              'batch_size': 100,
+              'flush_interval': 1.0,
+              'overflow': 'drop',
+          }
+      }
+  }
+
+"""
+
+from __future__ import absolute_import
+
+import logging
+import os
+import Queue
+import threading
+
+from dogapi import dog_stats_api
+
+from track.backends import BaseBackend
+
+
+log = logging.getLogger(__name__)
+
+# What to do with a new event when the queue is full.
+OVERFLOW_DROP = 'drop'  # drop the event immediately
+OVERFLOW_BLOCK = 'block'  # wait up to `block_timeout` seconds for room, then drop it
+OVERFLOW_POLICIES = (OVERFLOW_DROP, OVERFLOW_BLOCK)
+
+
+class BufferedBackend(BaseBackend):
+    """
+    Event tracker backend that queues events in memory and hands them to
+    a wrapped backend in batches, from a background thread.
+
+    Events still in the queue when the process exits are lost.
+
+    """
+
+    def __init__(self, backend, max_queue_size=10000, batch_size=100, flush_interval=1.0,
+                 overflow=OVERFLOW_DROP, block_timeout=0.1, **kwargs):
+        """
+        :Parameters:
+          - `backend`: configuration of the wrapped backend, a dictionary
+            with the same `ENGINE` and `OPTIONS` keys as TRACKING_BACKENDS
+            entries
+          - `max_queue_size`: maximum number of events waiting to be sent
+          - `batch_size`: maximum number of events sent to the wrapped
+            backend at once
+          - `flush_interval`: seconds the background thread waits for
+            new events before checking again
+          - `overflow`: 'drop' or 'block', what to do when the queue is full
+          - `block_timeout`: seconds to wait for room in the queue with
+            the 'block' policy
+
+        """
+        super(BufferedBackend, self).__init__(**kwargs)
+
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError('Invalid overflow policy for buffered event track backend: %s' % overflow)
+
+        # Imported here to avoid a circular import, since the tracker
+        # instantiates this backend while it is being imported.
+        from track.tracker import _instantiate_backend_from_name  # pylint: disable=protected-access
+        self.backend = _instantiate_backend_from_name(backend['ENGINE'], backend.get('OPTIONS', {}))
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+
+        self.queue = Queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._worker = None
+        self._worker_pid = None
+
+    def send(self, event):
+        """Queue the event to be sent by the background thread."""
+        self._ensure_worker()
+        try:
+            if self.overflow == OVERFLOW_BLOCK:
+                self.queue.put(event, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(event)
+        except Queue.Full:
+            dog_stats_api.increment('track.buffered.dropped')
+            log.debug('Event tracker queue is full, dropping event')
+
+    def flush(self):
+        """Block until every queued event has been handed to the wrapped backend."""
+        self._ensure_worker()
+        self.queue.join()
+
+    def _ensure_worker(self):
+        """
+        Start the background thread if it is not running in this process.
+
+        Threads do not survive a fork, so the pid is checked as well.
+        """
+        if self._worker_pid == os.getpid() and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker_pid == os.getpid() and self._worker.is_alive():
+                return
+            worker = threading.Thread(target=self._run, name='track-buffered-backend')
+            worker.daemon = True
+            worker.start()
+            self._worker = worker
+            self._worker_pid = os.getpid()
+
+    def _run(self):
+        """Main loop of the background thread."""
+        while True:
+            batch = self._next_batch()
+            if batch:
+                self._send_batch(batch)
+
+    def _next_batch(self):
+        """
+        Wait up to `flush_interval` for an event, then take whatever else
+        is already queued, up to `batch_size` events.
+        """
+        try:
+            batch = [self.queue.get(timeout=self.flush_interval)]
+        except Queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except Queue.Empty:
+                break
+        return batch
+
+    def _send_batch(self, batch):
+        """Send a batch of events to the wrapped backend."""
+        dog_stats_api.gauge('track.buffered.queue_depth', self.queue.qsize())
+        try:
+            with dog_stats_api.timer('track.buffered.send_batch'):
+                self.backend.send_many(batch)
+        except Exception:  # pylint: disable=broad-except
+            # Never let an error kill the background thread.
+            log.exception('Error sending events from buffered event tracker backend')
+        finally:
+            for _ in batch:
+                self.queue.task_done()
@@ -97,3 +97,14 @@ class MongoBackend(BaseBackend):
             # during the next event.
             msg = 'Error inserting to MongoDB event tracker backend'
             log.exception(msg)
+
+    def send_many(self, events):
+        """Insert a batch of events in to the Mongo collection"""
+        if not events:
+            return
+        try:
+            self.collection.insert(events, manipulate=False)
+        except (PyMongoError, BSONError):
+            # As for send(), the events are lost on error.
+            msg = 'Error inserting batch to MongoDB event tracker backend'
+            log.exception(msg)
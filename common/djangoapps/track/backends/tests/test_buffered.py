@@ -0,0 +1,71 @@
+from __future__ import absolute_import
+
+import threading
+
+from django.test import TestCase
+
+from track.backends import BaseBackend
+from track.backends.buffered import BufferedBackend
+
+
+class InMemoryBackend(BaseBackend):
+    """Records the batches it receives."""
+    def __init__(self, **kwargs):
+        super(InMemoryBackend, self).__init__(**kwargs)
+        self.batches = []
+
+    def send(self, event):
+        self.batches.append([event])
+
+    def send_many(self, events):
+        self.batches.append(list(events))
+
+
+class BlockingBackend(InMemoryBackend):
+    """Sets `sending`, then waits for `release` to be set before accepting events."""
+    def __init__(self, **kwargs):
+        super(BlockingBackend, self).__init__(**kwargs)
+        self.sending = threading.Event()
+        self.release = threading.Event()
+
+    def send_many(self, events):
+        self.sending.set()
+        self.release.wait()
+        super(BlockingBackend, self).send_many(events)
+
+
+def backend_config(cls):
+    """Configuration for wrapping `cls`."""
+    return {'ENGINE': 'track.backends.tests.test_buffered.{}'.format(cls.__name__)}
+
+
+class TestBufferedBackend(TestCase):
+    def test_events_are_sent_in_batches(self):
+        backend = BufferedBackend(backend=backend_config(InMemoryBackend), batch_size=2, flush_interval=0.01)
+        events = [{'test': i} for i in range(5)]
+        for event in events:
+            backend.send(event)
+        backend.flush()
+
+        batches = backend.backend.batches
+        self.assertEqual([event for batch in batches for event in batch], events)
+        self.assertTrue(all(len(batch) <= 2 for batch in batches))
+
+    def test_full_queue_drops_events(self):
+        backend = BufferedBackend(
+            backend=backend_config(BlockingBackend), max_queue_size=1, batch_size=1, flush_interval=0.01
+        )
+        # Wait until the worker is stuck sending the first event, so
+        # that the second one fills the queue.
+        backend.send({'test': 0})
+        self.assertTrue(backend.backend.sending.wait(5))
+        backend.send({'test': 1})
+        backend.send({'test': 2})
+
+        backend.backend.release.set()
+        backend.flush()
+        self.assertEqual(backend.backend.batches, [[{'test': 0}], [{'test': 1}]])
+
+    def test_invalid_overflow_policy(self):
+        with self.assertRaises(ValueError):
+            BufferedBackend(backend=backend_config(InMemoryBackend), overflow='bogus')
@@ -13,13 +13,16 @@ Main module which shows problems (of "capa" type).
 This is used by capa_module.
 """
 
+from collections import namedtuple
 from copy import deepcopy
 from datetime import datetime
+import hashlib
 import logging
 import os.path
 import re
 
 from lxml import etree
+from lru_cache import LRUCache
 from pytz import UTC
 from xml.sax.saxutils import unescape
 
@@ -58,6 +61,29 @@ html_problem_semantics = [
 
 log = logging.getLogger(__name__)
 
+# The parsed XML of a problem, before the seed-dependent preprocessing, along
+# with the code of its scripts and the Python path needed to run it.
+ProblemTemplate = namedtuple('ProblemTemplate', ['key', 'tree', 'script_code', 'python_path'])
+
+# Templates of recently constructed problems, keyed by the hash of the problem
+# xml and the root of the filestore.  Problems with <include> tags read files
+# from the filestore, which may change, and are not cached.
+PROBLEM_TEMPLATE_CACHE_SIZE = 500
+PROBLEM_TEMPLATE_CACHE = LRUCache(PROBLEM_TEMPLATE_CACHE_SIZE)
+
+# Contexts produced by the scripts of cached templates, keyed by the template
+# and the seed.
+PROBLEM_CONTEXT_CACHE_SIZE = 2000
+PROBLEM_CONTEXT_CACHE = LRUCache(PROBLEM_CONTEXT_CACHE_SIZE)
+
+
+def clear_problem_caches():
+    """
+    Empties the caches of problem templates and script contexts.
+    """
+    PROBLEM_TEMPLATE_CACHE.clear()
+    PROBLEM_CONTEXT_CACHE.clear()
+
 #-----------------------------------------------------------------------------
 # main class for this module
 
@@ -161,16 +187,13 @@ class LoncapaProblem(object):
         problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
         self.problem_text = problem_text
 
-        # parse problem XML file into an element tree
-        self.tree = etree.XML(problem_text)
-
-        self.make_xml_compatible(self.tree)
-
-        # handle any <include file="foo"> tags
-        self._process_includes()
+        # parse problem XML file into an element tree, or copy the tree
+        # parsed by a previous instance of this problem
+        template = self._get_template(problem_text)
+        self.tree = deepcopy(template.tree)
 
         # construct script processor context (eg for customresponse problems)
-        self.context = self._extract_context(self.tree)
+        self.context = self._extract_context(template)
 
         # Pre-parse the XML tree: modifies it to add ID's and perform some in-place
         # transformations.  This also creates the dict (self.responders) of Response
@@ -585,12 +608,48 @@ class LoncapaProblem(object):
 
     # ======= Private Methods Below ========
 
-    def _process_includes(self):
+    def _get_template(self, problem_text):
+        """
+        Returns the ProblemTemplate of `problem_text`, parsing it unless a
+        problem with the same xml was constructed recently.
+
+        The tree of the template is shared, and must be copied before being
+        modified.
+        """
+        root_path = getattr(self.capa_system.filestore, 'root_path', None)
+        if not isinstance(root_path, basestring):
+            root_path = None
+        encoded_text = problem_text.encode('utf-8') if isinstance(problem_text, unicode) else problem_text
+        key = (hashlib.sha1(encoded_text).hexdigest(), root_path)
+
+        template = PROBLEM_TEMPLATE_CACHE.get(key)
+        if template is not None:
+            return template
+
+        tree = etree.XML(problem_text)
+        self.make_xml_compatible(tree)
+
+        # handle any <include file="foo"> tags
+        has_includes = tree.find('.//include') is not None
+        self._process_includes(tree)
+
+        script_code, python_path = self._extract_scripts(tree)
+        template = ProblemTemplate(
+            key=None if has_includes else key,
+            tree=tree,
+            script_code=script_code,
+            python_path=tuple(python_path),
+        )
+        if template.key is not None:
+            PROBLEM_TEMPLATE_CACHE.set(key, template)
+        return template
+
+    def _process_includes(self, tree):
         """
         Handle any <include file="foo"> tags by reading in the specified file and inserting it
         into our XML tree.  Fail gracefully if debugging.
         """
-        includes = self.tree.findall('.//include')
+        includes = tree.findall('.//include')
         for inc in includes:
             filename = inc.get('file')
             if filename is not None:
@@ -669,17 +728,13 @@ class LoncapaProblem(object):
 
         return path
 
-    def _extract_context(self, tree):
+    def _extract_scripts(self, tree):
         """
-        Extract content of <script>...</script> from the problem.xml file, and exec it in the
-        context of this problem.  Provides ability to randomize problems, and also set
-        variables for problem answer checking.
+        Extract content of <script>...</script> from the problem.xml file, along
+        with the Python path needed to run it.
 
-        Problem XML goes to Python execution context. Runs everything in script tags.
+        Returns a tuple (code, python_path).
         """
-        context = {}
-        context['seed'] = self.seed
-        context['anonymous_student_id'] = self.capa_system.anonymous_student_id
         all_code = ''
 
         python_path = []
@@ -702,6 +757,26 @@ class LoncapaProblem(object):
             code = unescape(script.text, XMLESC)
             all_code += code
 
+        return all_code, python_path
+
+    def _extract_context(self, template):
+        """
+        Exec the scripts of the problem template in the context of this problem.
+        Provides ability to randomize problems, and also set variables for
+        problem answer checking.
+
+        Problem XML goes to Python execution context. Runs everything in script tags.
+
+        The context of a cached template is reused by the problems with the
+        same seed, unless the scripts import code from python_lib.zip.
+        """
+        context = {}
+        context['seed'] = self.seed
+        context['anonymous_student_id'] = self.capa_system.anonymous_student_id
+        all_code = template.script_code
+
+        python_path = list(template.python_path)
+
         extra_files = []
         if all_code:
             # An asset named python_lib.zip can be imported by Python code.
@@ -710,6 +785,18 @@ class LoncapaProblem(object):
                 extra_files.append(("python_lib.zip", zip_lib))
                 python_path.append("python_lib.zip")
 
+            unsafely = self.capa_system.can_execute_unsafe_code()
+            context_key = None
+            if template.key is not None and not extra_files:
+                context_key = (template.key, self.seed, unsafely)
+                if 'anonymous_student_id' in all_code:
+                    context_key += (self.capa_system.anonymous_student_id,)
+                cached_context = PROBLEM_CONTEXT_CACHE.get(context_key)
+                if cached_context is not None:
+                    context = deepcopy(cached_context)
+                    context['anonymous_student_id'] = self.capa_system.anonymous_student_id
+                    return context
+
             try:
                 safe_exec(
                     all_code,
@@ -719,7 +806,7 @@ class LoncapaProblem(object):
                     extra_files=extra_files,
                     cache=self.capa_system.cache,
                     slug=self.problem_id,
-                    unsafely=self.capa_system.can_execute_unsafe_code(),
+                    unsafely=unsafely,
                 )
             except Exception as err:
                 log.exception("Error while execing script code: " + all_code)
@@ -730,6 +817,9 @@ class LoncapaProblem(object):
         context['script_code'] = all_code
         context['python_path'] = python_path
         context['extra_files'] = extra_files or None
+
+        if all_code and context_key is not None:
+            PROBLEM_CONTEXT_CACHE.set(context_key, deepcopy(context))
         return context
 
     def _extract_html(self, problemtree):  # private
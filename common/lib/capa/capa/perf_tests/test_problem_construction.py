@@ -0,0 +1,91 @@
+"""
+Performance test of LoncapaProblem construction, with the caches of problem
+templates and script contexts emptied before every construction, and with
+the caches kept across constructions.
+"""
+import os
+import unittest
+
+import fs.osfs
+from nose.plugins.skip import SkipTest
+
+from capa.capa_problem import LoncapaProblem, clear_problem_caches
+from capa.tests import mock_capa_module, test_capa_system
+
+# The dependency below needs to be installed manually from the development.txt file, which doesn't
+# get installed during unit tests!
+try:
+    from code_block_timer import CodeBlockTimer
+except ImportError:
+    CodeBlockTimer = None
+
+# The courses whose problems are constructed.
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'test', 'data')
+
+# Number of passes over every problem.
+ITERATIONS = 10
+
+# Seeds every problem is constructed with.
+SEEDS = range(5)
+
+
+def _build_problem(problem, seed):
+    """
+    Constructs the LoncapaProblem of `problem`, a (course_dir, xml) tuple.
+    """
+    course_dir, xml = problem
+    capa_system = test_capa_system()
+    capa_system.filestore = fs.osfs.OSFS(course_dir)
+    capa_system.seed = seed
+    return LoncapaProblem(xml, id='perf_test', capa_system=capa_system, capa_module=mock_capa_module(), seed=seed)
+
+
+# Eventually, exclude this attribute from regular unittests while running *only* tests
+# with this attribute during regular performance tests.
+# @attr("perf_test")
+@unittest.skip
+class ProblemConstructionPerfTest(unittest.TestCase):
+    """
+    This class exists to time the construction of every problem of the test courses.
+    """
+
+    # Use this attr to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super(ProblemConstructionPerfTest, self).setUp()
+        self.problems = []
+        for dirpath, __, filenames in os.walk(TEST_DATA_DIR):
+            if os.path.basename(dirpath) != 'problem':
+                continue
+            course_dir = os.path.dirname(dirpath)
+            for filename in sorted(filenames):
+                if not filename.endswith('.xml'):
+                    continue
+                with open(os.path.join(dirpath, filename)) as problem_file:
+                    problem = (course_dir, problem_file.read().decode('utf-8'))
+                try:
+                    _build_problem(problem, 0)
+                except Exception:  # pylint: disable=broad-except
+                    # Some test courses hold deliberately broken problems.
+                    continue
+                self.problems.append(problem)
+        self.addCleanup(clear_problem_caches)
+
+    def test_construction_timings(self):
+        """
+        Generate timings of constructing the problems with and without the caches.
+        """
+        if CodeBlockTimer is None:
+            raise SkipTest("CodeBlockTimer undefined.")
+
+        constructions = ITERATIONS * len(SEEDS) * len(self.problems)
+        for name, clear_caches in (('uncached', True), ('cached', False)):
+            clear_problem_caches()
+            with CodeBlockTimer("ProblemConstruction:{}:{}".format(name, constructions)):
+                for __ in xrange(ITERATIONS):
+                    for problem in self.problems:
+                        for seed in SEEDS:
+                            if clear_caches:
+                                clear_problem_caches()
+                            _build_problem(problem, seed)
@@ -0,0 +1,95 @@
+"""
+Tests of the caching of parsed problems by LoncapaProblem.
+"""
+import textwrap
+import unittest
+
+from mock import patch
+
+from . import new_loncapa_problem, test_capa_system
+from capa.capa_problem import (
+    PROBLEM_CONTEXT_CACHE,
+    PROBLEM_TEMPLATE_CACHE,
+    LoncapaProblem,
+    clear_problem_caches,
+)
+
+
+class ProblemCacheTest(unittest.TestCase):
+    """
+    Tests that problems built from the same xml share their parsed template,
+    and the problems with the same seed the context of their scripts.
+    """
+    xml = textwrap.dedent("""
+        <problem>
+            <script type="loncapa/python">
+        import random
+        num = random.randint(0, 1e9)
+        who = anonymous_student_id
+            </script>
+            <customresponse cfn="check_func">
+                <textline/>
+            </customresponse>
+        </problem>
+    """)
+
+    def setUp(self):
+        super(ProblemCacheTest, self).setUp()
+        clear_problem_caches()
+        self.addCleanup(clear_problem_caches)
+
+    def test_template_reused(self):
+        first = new_loncapa_problem(self.xml)
+        with patch.object(LoncapaProblem, 'make_xml_compatible') as mock_compatible:
+            second = new_loncapa_problem(self.xml)
+        self.assertFalse(mock_compatible.called)
+        self.assertEqual(len(PROBLEM_TEMPLATE_CACHE), 1)
+
+        # Each problem preprocesses its own copy of the tree.
+        self.assertIsNot(first.tree, second.tree)
+        self.assertEqual(first.get_html(), second.get_html())
+        self.assertEqual(first.responders.keys()[0].get('id'), '1_2')
+        self.assertEqual(second.responders.keys()[0].get('id'), '1_2')
+
+    def test_context_per_seed(self):
+        first = new_loncapa_problem(self.xml, seed=1)
+        with patch('capa.capa_problem.safe_exec') as mock_exec:
+            second = new_loncapa_problem(self.xml, seed=1)
+        self.assertFalse(mock_exec.called)
+        self.assertEqual(first.context, second.context)
+
+        # Problems don't share the dict of their context.
+        second.context['num'] = None
+        self.assertIsNotNone(first.context['num'])
+
+        third = new_loncapa_problem(self.xml, seed=2)
+        self.assertNotEqual(first.context['num'], third.context['num'])
+        self.assertEqual(len(PROBLEM_CONTEXT_CACHE), 2)
+
+    def test_context_per_student(self):
+        # The scripts use anonymous_student_id, so the context isn't shared
+        # between students.
+        capa_system = test_capa_system()
+        capa_system.anonymous_student_id = 'other_student'
+        first = new_loncapa_problem(self.xml)
+        second = new_loncapa_problem(self.xml, capa_system=capa_system)
+        self.assertEqual(first.context['who'], 'student')
+        self.assertEqual(second.context['who'], 'other_student')
+
+    def test_python_lib_zip_not_cached(self):
+        capa_system = test_capa_system()
+        capa_system.get_python_lib_zip = lambda: 'not really a zip'
+        with patch('capa.capa_problem.safe_exec') as mock_exec:
+            new_loncapa_problem(self.xml, capa_system=capa_system)
+            new_loncapa_problem(self.xml, capa_system=capa_system)
+        self.assertEqual(mock_exec.call_count, 2)
+        self.assertEqual(len(PROBLEM_CONTEXT_CACHE), 0)
+
+    def test_includes_not_cached(self):
+        xml = textwrap.dedent("""
+            <problem>
+                <include file="missing_file.xml"/>
+            </problem>
+        """)
+        new_loncapa_problem(xml)
+        self.assertEqual(len(PROBLEM_TEMPLATE_CACHE), 0)
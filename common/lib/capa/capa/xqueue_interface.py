@@ -4,7 +4,9 @@
 import hashlib
 import json
 import logging
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 import dogstats_wrapper as dog_stats_api
 
 
@@ -67,11 +69,20 @@ class XQueueInterface(object):
     Interface to the external grading system
     """
 
-    def __init__(self, url, django_auth, requests_auth=None):
+    def __init__(self, url, django_auth, requests_auth=None, pool_size=None):
         self.url = unicode(url)
         self.auth = django_auth
         self.session = requests.Session()
         self.session.auth = requests_auth
+        if pool_size is not None:
+            # Keep a connection open for each of up to `pool_size` threads
+            # sending at the same time.
+            self.session.mount(self.url, HTTPAdapter(pool_maxsize=pool_size))
+
+        # The session, and its login cookie, are shared by every thread using
+        # this interface: when the login expires, only one of them logs in again.
+        self._login_lock = threading.Lock()
+        self._login_count = 0
 
     def send_to_queue(self, header, body, files_to_upload=None):
         """
@@ -96,11 +107,12 @@ class XQueueInterface(object):
         ])
 
         # Attempt to send to queue
+        login_count = self._login_count
         (error, msg) = self._send_to_queue(header, body, files_to_upload)
 
         # Log in, then try again
         if error and (msg == 'login_required'):
-            (error, content) = self._login()
+            (error, content) = self._login_once(login_count)
             if error != 0:
                 # when the login fails
                 log.debug("Failed to login to queue: %s", content)
@@ -113,6 +125,19 @@ class XQueueInterface(object):
 
         return (error, msg)
 
+    def _login_once(self, login_count):
+        """
+        Logs in, unless another thread did since `self._login_count` was
+        `login_count`.
+        """
+        with self._login_lock:
+            if self._login_count != login_count:
+                return (0, '')
+            (error, content) = self._login()
+            if error == 0:
+                self._login_count += 1
+            return (error, content)
+
     def _login(self):
         payload = {
             'username': self.auth['username'],
@@ -0,0 +1,54 @@
+"""
+An in-process least recently used cache, shared by the common libraries and
+the Django apps.
+"""
+from collections import OrderedDict
+import threading
+
+
+class LRUCache(object):
+    """
+    A thread-safe, in-process mapping that holds at most `maxsize` entries,
+    evicting the least recently used entry when full.
+    """
+    def __init__(self, maxsize=1000):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """
+        Returns the value cached for `key`, or `default` if there is none.
+        """
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            # Re-insert to mark the entry as the most recently used.
+            self._data[key] = value
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """
+        Caches `value` for `key`, evicting the least recently used entry if needed.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """
+        Empties the cache.
+        """
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
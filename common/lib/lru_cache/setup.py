@@ -0,0 +1,11 @@
+"""
+Setup.py for lru_cache.
+"""
+
+from setuptools import setup
+
+setup(
+    name="lru_cache",
+    version="0.1",
+    packages=["lru_cache"],
+)
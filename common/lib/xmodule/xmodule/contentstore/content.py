@@ -235,6 +235,12 @@ class ContentStore(object):
         '''
         raise NotImplementedError
 
+    def get_asset_names(self, course_key):
+        """
+        Returns the set of the names of the assets (not the thumbnails) of the course
+        """
+        raise NotImplementedError
+
     def delete_all_course_assets(self, course_key):
         """
         Delete all of the assets which use this course_key as an identifier
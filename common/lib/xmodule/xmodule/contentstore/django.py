@@ -2,6 +2,7 @@ from __future__ import absolute_import
 from importlib import import_module
 
 from django.conf import settings
+from django.core.cache import get_cache
 
 _CONTENTSTORE = {}
 
@@ -25,6 +26,8 @@ def contentstore(name='default'):
         if 'ADDITIONAL_OPTIONS' in settings.CONTENTSTORE:
             if name in settings.CONTENTSTORE['ADDITIONAL_OPTIONS']:
                 options.update(settings.CONTENTSTORE['ADDITIONAL_OPTIONS'][name])
+        # The index of the assets of each course is shared by the LMS and Studio processes.
+        options.setdefault('asset_index_cache', get_cache('default'))
         _CONTENTSTORE[name] = class_(**options)
 
     return _CONTENTSTORE[name]
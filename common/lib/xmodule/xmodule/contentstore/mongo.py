@@ -17,14 +17,22 @@ from xmodule.modulestore.django import ASSET_IGNORE_REGEX
 from xmodule.util.misc import escape_invalid_characters
 
 
+# The names of the assets of a course are only kept in the cache for a day in case
+# some assets were changed without going through the store.
+ASSET_INDEX_CACHE_TIMEOUT = 60 * 60 * 24
+
+
 class MongoContentStore(ContentStore):
 
     # pylint: disable=unused-argument
-    def __init__(self, host, db, port=27017, user=None, password=None, bucket='fs', collection=None, **kwargs):
+    def __init__(self, host, db, port=27017, user=None, password=None, bucket='fs', collection=None,
+                 asset_index_cache=None, **kwargs):
         """
         Establish the connection with the mongo backend and connect to the collections
 
         :param collection: ignores but provided for consistency w/ other doc_store_config patterns
+        :param asset_index_cache: an optional django cache, shared by all the processes using the
+            store, in which the names of the assets of each course are kept (see `get_asset_names`)
         """
         logging.debug('Using MongoDB for static content serving at host={0} port={1} db={2}'.format(host, port, db))
 
@@ -47,6 +55,7 @@ class MongoContentStore(ContentStore):
         self.fs = gridfs.GridFS(_db, bucket)
 
         self.fs_files = _db[bucket + ".files"]  # the underlying collection GridFS uses
+        self.asset_index_cache = asset_index_cache
 
     def close_connections(self):
         """
@@ -59,6 +68,15 @@ class MongoContentStore(ContentStore):
         A destructive operation to drop the underlying database and close all connections.
         Intended to be used by test code for cleanup.
         """
+        if self.asset_index_cache is not None:
+            # Only discard the asset names of this store's courses, the cache being shared.
+            cache_keys = set()
+            for asset in self.fs_files.find(fields=('_id', 'content_son')):
+                asset_son = asset.get('content_son', asset['_id'])
+                if not isinstance(asset_son, dict):
+                    continue
+                cache_keys.add(self._asset_names_cache_key(asset_son['org'], asset_son['course'], asset_son.get('run')))
+            self.asset_index_cache.delete_many(list(cache_keys))
         self.close_connections()
         self.fs_files.database.connection.drop_database(self.fs_files.database)
 
@@ -83,6 +101,7 @@ class MongoContentStore(ContentStore):
             else:
                 fp.write(content.data)
 
+        self._invalidate_asset_names(self._course_asset_names_cache_key(content.location.course_key))
         return content
 
     def delete(self, location_or_id):
@@ -90,6 +109,13 @@ class MongoContentStore(ContentStore):
             location_or_id, _ = self.asset_db_key(location_or_id)
         # Deletes of non-existent files are considered successful
         self.fs.delete(location_or_id)
+        if isinstance(location_or_id, basestring):
+            cache_key = self._course_asset_names_cache_key(AssetKey.from_string(location_or_id).course_key)
+        else:
+            cache_key = self._asset_names_cache_key(
+                location_or_id['org'], location_or_id['course'], location_or_id.get('run')
+            )
+        self._invalidate_asset_names(cache_key)
 
     def find(self, location, throw_on_not_found=True, as_stream=False):
         content_id, __ = self.asset_db_key(location)
@@ -186,6 +212,49 @@ class MongoContentStore(ContentStore):
             course_key, start=start, maxresults=maxresults, get_thumbnails=False, sort=sort, filter_params=filter_params
         )
 
+    def get_asset_names(self, course_key):
+        """
+        See :meth:`.ContentStore.get_asset_names`
+
+        The names are read with a single query, and kept in `asset_index_cache` until
+        an asset of the course is saved or deleted.
+        """
+        cache_key = self._course_asset_names_cache_key(course_key)
+        if self.asset_index_cache is not None:
+            asset_names = self.asset_index_cache.get(cache_key)
+            if asset_names is not None:
+                return asset_names
+
+        asset_names = frozenset(
+            asset.get('content_son', asset['_id'])['name']
+            for asset in self.fs_files.find(query_for_course(course_key, 'asset'), fields=('_id', 'content_son'))
+        )
+        if self.asset_index_cache is not None:
+            self.asset_index_cache.set(cache_key, asset_names, ASSET_INDEX_CACHE_TIMEOUT)
+        return asset_names
+
+    def _asset_names_cache_key(self, org, course, run):
+        """
+        Returns the key of the names of the assets of a course in `asset_index_cache`. `run`
+        is None for the courses with deprecated keys, whose assets don't store their run.
+        """
+        return u'contentstore.asset_names.{}.{}.{}.{}'.format(self.fs_files.full_name, org, course, run or '')
+
+    def _course_asset_names_cache_key(self, course_key):
+        """
+        Returns the key of the names of the assets of `course_key` in `asset_index_cache`.
+        """
+        return self._asset_names_cache_key(
+            course_key.org, course_key.course, None if getattr(course_key, 'deprecated', False) else course_key.run
+        )
+
+    def _invalidate_asset_names(self, cache_key):
+        """
+        Discards the names of the assets of a course kept in `asset_index_cache` under `cache_key`.
+        """
+        if self.asset_index_cache is not None:
+            self.asset_index_cache.delete(cache_key)
+
     def remove_redundant_content_for_courses(self):
         """
         Finds and removes all redundant files (Mac OS metadata files with filename ".DS_Store"
@@ -202,6 +271,10 @@ class MongoContentStore(ContentStore):
             assets_to_delete = assets_to_delete + items.count()
             for asset in items:
                 self.fs.delete(asset[prefix])
+                asset_son = asset.get('content_son', asset['_id'])
+                self._invalidate_asset_names(
+                    self._asset_names_cache_key(asset_son['org'], asset_son['course'], asset_son.get('run'))
+                )
 
             self.fs_files.remove(query)
         return assets_to_delete
@@ -342,6 +415,7 @@ class MongoContentStore(ContentStore):
                 # getattr b/c caching may mean some pickled instances don't have attr
                 locked=asset.get('locked', False)
             )
+        self._invalidate_asset_names(self._course_asset_names_cache_key(dest_course_key))
 
     def delete_all_course_assets(self, course_key):
         """
@@ -354,6 +428,7 @@ class MongoContentStore(ContentStore):
         for asset in matching_assets:
             asset_key = self.make_id_son(asset)
             self.fs.delete(asset_key)
+        self._invalidate_asset_names(self._course_asset_names_cache_key(course_key))
 
     # codifying the original order which pymongo used for the dicts coming out of location_to_dict
     # stability of order is more important than sanity of order as any changes to order make things
@@ -16,6 +16,7 @@ import pymongo
 import sys
 import logging
 import copy
+import itertools
 import re
 from uuid import uuid4
 
@@ -77,6 +78,10 @@ _OSFS_INSTANCE = {}
 
 _DETACHED_CATEGORIES = [name for name, __ in XBlock.load_tagged_classes("detached")]
 
+# The number of blocks whose definition data is fetched together, when the
+# descendants of an item were loaded without it (see MongoModuleStore._cache_children)
+DEFINITION_DATA_CHUNK_SIZE = 100
+
 
 class MongoRevisionKey(object):
     """
@@ -100,15 +105,35 @@ class MongoKeyValueStore(InheritanceKeyValueStore):
     A KeyValueStore that maps keyed data access to one of the 3 data areas
     known to the MongoModuleStore (data, children, and metadata)
     """
-    def __init__(self, data, parent, children, metadata):
+    def __init__(self, data, parent, children, metadata, data_loader=None):
+        """
+        If `data_loader` is given, `data` is ignored and the function is called
+        to get the data the first time a content field is accessed.
+        """
         super(MongoKeyValueStore, self).__init__()
+        self._data_loader = data_loader
+        if data_loader is None:
+            self._set_data(data)
+        self._parent = parent
+        self._children = children
+        self._metadata = metadata
+
+    def _set_data(self, data):
+        """
+        Sets the values of the content fields.
+        """
         if not isinstance(data, dict):
             self._data = {'data': data}
         else:
             self._data = data
-        self._parent = parent
-        self._children = children
-        self._metadata = metadata
+
+    def _load_data(self):
+        """
+        Loads the values of the content fields, if they were not loaded with the block.
+        """
+        if self._data_loader is not None:
+            self._set_data(self._data_loader())
+            self._data_loader = None
 
     def get(self, key):
         if key.scope == Scope.children:
@@ -118,6 +143,7 @@ class MongoKeyValueStore(InheritanceKeyValueStore):
         elif key.scope == Scope.settings:
             return self._metadata[key.field_name]
         elif key.scope == Scope.content:
+            self._load_data()
             return self._data[key.field_name]
         else:
             raise InvalidScopeError(
@@ -131,6 +157,7 @@ class MongoKeyValueStore(InheritanceKeyValueStore):
         elif key.scope == Scope.settings:
             self._metadata[key.field_name] = value
         elif key.scope == Scope.content:
+            self._load_data()
             self._data[key.field_name] = value
         else:
             raise InvalidScopeError(
@@ -145,6 +172,7 @@ class MongoKeyValueStore(InheritanceKeyValueStore):
             if key.field_name in self._metadata:
                 del self._metadata[key.field_name]
         elif key.scope == Scope.content:
+            self._load_data()
             if key.field_name in self._data:
                 del self._data[key.field_name]
         else:
@@ -159,13 +187,14 @@ class MongoKeyValueStore(InheritanceKeyValueStore):
         elif key.scope == Scope.settings:
             return key.field_name in self._metadata
         elif key.scope == Scope.content:
+            self._load_data()
             return key.field_name in self._data
         else:
             return False
 
     def __repr__(self):
         return "MongoKeyValueStore{!r}<{!r}, {!r}>".format(
-            (self._data, self._parent, self._children, self._metadata),
+            (getattr(self, '_data', None), self._parent, self._children, self._metadata),
             self._fields,
             self.inherited_settings
         )
@@ -275,20 +304,24 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
                         else ModuleStoreEnum.RevisionOption.draft_preferred
                     )
 
-                data = definition.get('data', {})
-                if isinstance(data, basestring):
-                    data = {'data': data}
-
                 mixed_class = self.mixologist.mix(class_)
-                if data:  # empty or None means no work
-                    data = self._convert_reference_fields_to_keys(mixed_class, location.course_key, data)
+
+                def load_data():
+                    """
+                    Returns the content fields of the block.
+                    """
+                    data = self._get_definition_data(location)
+                    if isinstance(data, basestring):
+                        data = {'data': data}
+                    if data:  # empty or None means no work
+                        data = self._convert_reference_fields_to_keys(mixed_class, location.course_key, data)
+                    return data
+
                 metadata = self._convert_reference_fields_to_keys(mixed_class, location.course_key, metadata)
-                kvs = MongoKeyValueStore(
-                    data,
-                    parent,
-                    children,
-                    metadata,
-                )
+                if json_data.get('definition_loaded', True):
+                    kvs = MongoKeyValueStore(load_data(), parent, children, metadata)
+                else:
+                    kvs = MongoKeyValueStore(None, parent, children, metadata, data_loader=load_data)
 
                 field_data = KvsFieldData(kvs)
                 scope_ids = ScopeIds(None, category, location, location)
@@ -328,6 +361,39 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
                     error_msg=exc_info_to_str(sys.exc_info())
                 )
 
+    def _get_definition_data(self, location):
+        """
+        Returns the definition data of the block at `location`.
+
+        If the block was loaded without its definition data, it is fetched
+        along with the data of other blocks of `module_data` missing theirs, in
+        chunks of DEFINITION_DATA_CHUNK_SIZE blocks.
+        """
+        json_data = self.module_data[location]
+        if not json_data.get('definition_loaded', True):
+            pending = [location] + list(itertools.islice(
+                (
+                    other_location for other_location, other_json_data in self.module_data.iteritems()
+                    if other_location != location and not other_json_data.get('definition_loaded', True)
+                ),
+                DEFINITION_DATA_CHUNK_SIZE - 1
+            ))
+            # module_data is keyed by locations without revision, but drafts
+            # must get their own data, so the stored revisions are queried.
+            stored_locations = dict(
+                (
+                    pending_location,
+                    pending_location.replace(revision=self.module_data[pending_location]['location'].get('revision'))
+                )
+                for pending_location in pending
+            )
+            definition_data = self.modulestore._query_definition_data(self.course_id, stored_locations.values())
+            for pending_location, stored_location in stored_locations.iteritems():
+                pending_json_data = self.module_data[pending_location]
+                pending_json_data.setdefault('definition', {})['data'] = definition_data.get(stored_location, {})
+                del pending_json_data['definition_loaded']
+        return json_data.get('definition', {}).get('data', {})
+
     def _convert_reference_to_key(self, ref_string):
         """
         Convert a single serialized UsageKey string in a ReferenceField into a UsageKey.
@@ -706,9 +772,14 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         # is a dictionary relative to that course
         results_by_url = {}
         root = None
+        # the ids of the containers of each child, in all the revisions queried
+        parent_ids = {}
 
         # now go through the results and order them by the location url
         for result in resultset:
+            for child in result.get('definition', {}).get('children', []):
+                parent_ids.setdefault(child, []).append(dict(result['_id']))
+
             # manually pick it apart b/c the db has tag and we want as_published revision regardless
             location = as_published(Location._from_deprecated_son(result['_id'], course_id.run))
 
@@ -758,8 +829,35 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         if root is not None:
             _compute_inherited_metadata(root)
 
+        # Also cache the parents of the children reachable from the course, so that
+        # _get_raw_parent_location does not need to query for them. Like 'parent',
+        # 'parent_ids' is not part of the inherited metadata.
+        include_drafts = self.get_branch_setting() != ModuleStoreEnum.Branch.published_only
+        for child, inherited in metadata_to_inherit.iteritems():
+            inherited['parent_ids'] = self._parent_ids_by_revision_option(parent_ids.get(child, []), include_drafts)
+
         return metadata_to_inherit
 
+    @staticmethod
+    def _parent_ids_by_revision_option(parent_ids, include_drafts):
+        """
+        Returns a dict mapping the revision options `_get_raw_parent_location` accepts
+        to the id of the parent it would find among `parent_ids`, the ids of the
+        containers of a block, or None if it has no parent.
+
+        The revision options whose parent can only be found by looking for orphans
+        are left out, as is draft_preferred if `parent_ids` doesn't include drafts.
+        """
+        published_ids = [parent_id for parent_id in parent_ids if parent_id['revision'] is None]
+        draft_ids = [parent_id for parent_id in parent_ids if parent_id['revision'] is not None]
+
+        parents = {}
+        if len(published_ids) <= 1:
+            parents[ModuleStoreEnum.RevisionOption.published_only] = published_ids[0] if published_ids else None
+            if include_drafts and len(draft_ids) <= 1:
+                parents[ModuleStoreEnum.RevisionOption.draft_preferred] = (draft_ids or published_ids or [None])[0]
+        return parents
+
     def _get_cached_metadata_inheritance_tree(self, course_id, force_refresh=False):
         '''
         Compute the metadata inheritance for the course.
@@ -824,9 +922,11 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         del item['_id']
 
     @autoretry_read()
-    def _query_children_for_cache_children(self, course_key, items):
+    def _query_children_for_cache_children(self, course_key, items, fields=None):
         """
         Generate a pymongo in query for finding the items and return the payloads
+
+        If given, `fields` is the projection of the queried documents.
         """
         # first get non-draft in a round-trip
         query = {
@@ -834,15 +934,37 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
                 course_key.make_usage_key_from_deprecated_string(item).to_deprecated_son() for item in items
             ]}
         }
-        return list(self.collection.find(query))
+        return list(self.collection.find(query, fields))
+
+    @autoretry_read()
+    def _query_definition_data(self, course_key, locations):
+        """
+        Returns a dictionary mapping each of `locations` found in the collection
+        to its definition data, read with a single query.
+
+        The revision of each of `locations` is part of the query, so a draft
+        location gets the data of the draft.
+        """
+        query = {'_id': {'$in': [location.to_deprecated_son() for location in locations]}}
+        return dict(
+            (
+                Location._from_deprecated_son(item['_id'], course_key.run),
+                item.get('definition', {}).get('data', {})
+            )
+            for item in self.collection.find(query, {'definition.data': True})
+        )
 
-    def _cache_children(self, course_key, items, depth=0):
+    def _cache_children(self, course_key, items, depth=0, lazy=False):
         """
         Returns a dictionary mapping Location -> item data, populated with json data
         for all descendents of items up to the specified depth.
         (0 = no descendents, 1 = children, 2 = grandchildren, etc)
         If depth is None, will load all the children.
         This will make a number of queries that is linear in the depth.
+
+        If `lazy`, the descendents are loaded without their definition data,
+        which the runtime fetches in chunks when their content fields are
+        first accessed (see CachingDescriptorSystem._get_definition_data).
         """
 
         data = {}
@@ -869,7 +991,14 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             # for or-query syntax
             to_process = []
             if children:
-                to_process = self._query_children_for_cache_children(course_key, children)
+                if lazy:
+                    to_process = self._query_children_for_cache_children(
+                        course_key, children, fields={'definition.data': False}
+                    )
+                    for child in to_process:
+                        child['definition_loaded'] = False
+                else:
+                    to_process = self._query_children_for_cache_children(course_key, children)
 
             # If depth is None, then we just recurse until we hit all the descendents
             if depth is not None:
@@ -947,13 +1076,14 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
 
         return system.load_item(location, for_parent=for_parent)
 
-    def _load_items(self, course_key, items, depth=0, using_descriptor_system=None, for_parent=None):
+    def _load_items(self, course_key, items, depth=0, using_descriptor_system=None, for_parent=None, lazy=False):
         """
         Load a list of xmodules from the data in items, with children cached up
-        to specified depth
+        to specified depth. If `lazy`, the definition data of the children is
+        only fetched when it is used.
         """
         course_key = self.fill_in_run(course_key)
-        data_cache = self._cache_children(course_key, items, depth)
+        data_cache = self._cache_children(course_key, items, depth, lazy=lazy)
 
         # if we are loading a course object, if we're not prefetching children (depth != 0) then don't
         # bother with the metadata inheritance
@@ -1036,12 +1166,15 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
     def get_course(self, course_key, depth=0, **kwargs):
         """
         Get the course with the given courseid (org/course/run)
+
+        Pass `lazy=True` to only fetch the definition data of the descendants of
+        the course when it is used (see `get_item`).
         """
         assert isinstance(course_key, CourseKey)
         course_key = self.fill_in_run(course_key)
         location = course_key.make_usage_key('course', course_key.run)
         try:
-            return self.get_item(location, depth=depth)
+            return self.get_item(location, depth=depth, lazy=kwargs.get('lazy', False))
         except ItemNotFoundError:
             return None
 
@@ -1099,6 +1232,9 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
                 calls to get_children() to cache. None indicates to cache all descendents.
             using_descriptor_system (CachingDescriptorSystem): The existing CachingDescriptorSystem
                 to add data to, and to load the XBlocks from.
+            lazy (bool): If True, the descendents are prefetched without their definition
+                data (e.g. the html of html blocks, the xml of problems), which is fetched
+                in chunks when it is first used. Defaults to False.
         """
         item = self._find_one(usage_key)
         module = self._load_items(
@@ -1107,6 +1243,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             depth,
             using_descriptor_system=using_descriptor_system,
             for_parent=for_parent,
+            lazy=kwargs.get('lazy', False),
         )[0]
         return module
 
@@ -1557,6 +1694,22 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         if parent_cache.has(unicode(location)):
             return parent_cache.get(unicode(location))
 
+        def cache_and_return(parent_loc):  # pylint:disable=missing-docstring
+            parent_cache.set(unicode(location), parent_loc)
+            return parent_loc
+
+        # look in the parents cached with the metadata inheritance tree, unless the tree
+        # is not cached at all, or is not kept current because of a bulk operation
+        if (self.request_cache is not None or self.metadata_inheritance_cache_subsystem is not None) and \
+                not self._is_in_bulk_operation(location.course_key):
+            tree = self._get_cached_metadata_inheritance_tree(location.course_key)
+            parent_ids = tree.get(unicode(location), {}).get('parent_ids', {})
+            if revision in parent_ids:
+                parent_id = parent_ids[revision]
+                return cache_and_return(
+                    None if parent_id is None else Location._from_deprecated_son(parent_id, location.course_key.run)
+                )
+
         # create a query with tag, org, course, and the children field set to the given location
         query = self._course_key_to_son(location.course_key)
         query['definition.children'] = unicode(location)
@@ -1565,10 +1718,6 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         if revision == ModuleStoreEnum.RevisionOption.published_only:
             query['_id.revision'] = MongoRevisionKey.published
 
-        def cache_and_return(parent_loc):  # pylint:disable=missing-docstring
-            parent_cache.set(unicode(location), parent_loc)
-            return parent_loc
-
         # query the collection, sorting by DRAFT first
         parents = list(
             self.collection.find(query, {'_id': True}, sort=[SORT_REVISION_FAVOR_DRAFT])
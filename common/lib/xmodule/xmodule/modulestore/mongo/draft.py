@@ -83,13 +83,13 @@ class DraftModuleStore(MongoModuleStore):
         def get_published():
             return wrap_draft(super(DraftModuleStore, self).get_item(
                 usage_key, depth=depth, using_descriptor_system=using_descriptor_system,
-                for_parent=kwargs.get('for_parent'),
+                for_parent=kwargs.get('for_parent'), lazy=kwargs.get('lazy', False),
             ))
 
         def get_draft():
             return wrap_draft(super(DraftModuleStore, self).get_item(
                 as_draft(usage_key), depth=depth, using_descriptor_system=using_descriptor_system,
-                for_parent=kwargs.get('for_parent')
+                for_parent=kwargs.get('for_parent'), lazy=kwargs.get('lazy', False),
             ))
 
         # return the published version if ModuleStoreEnum.RevisionOption.published_only is requested
@@ -805,9 +805,11 @@ class DraftModuleStore(MongoModuleStore):
 
         delete_draft_only(location)
 
-    def _query_children_for_cache_children(self, course_key, items):
+    def _query_children_for_cache_children(self, course_key, items, fields=None):
         # first get non-draft in a round-trip
-        to_process_non_drafts = super(DraftModuleStore, self)._query_children_for_cache_children(course_key, items)
+        to_process_non_drafts = super(DraftModuleStore, self)._query_children_for_cache_children(
+            course_key, items, fields
+        )
 
         to_process_dict = {}
         for non_draft in to_process_non_drafts:
@@ -822,7 +824,7 @@ class DraftModuleStore(MongoModuleStore):
                     query.append(as_draft(item_usage_key).to_deprecated_son())
             if query:
                 query = {'_id': {'$in': query}}
-                to_process_drafts = list(self.collection.find(query))
+                to_process_drafts = list(self.collection.find(query, fields))
 
                 # now we have to go through all drafts and replace the non-draft
                 # with the draft. This is because the semantics of the DraftStore is to
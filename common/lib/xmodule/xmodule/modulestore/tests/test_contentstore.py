@@ -26,6 +26,21 @@ PORT = MONGO_PORT_NUM
 DB = 'test_mongo_%s' % uuid4().hex[:5]
 
 
+class DictCache(dict):
+    """
+    The part of the django cache API used by MongoContentStore, over a dict.
+    """
+    def set(self, key, value, timeout=None):  # pylint: disable=unused-argument
+        self[key] = value
+
+    def delete(self, key):
+        self.pop(key, None)
+
+    def delete_many(self, keys):
+        for key in keys:
+            self.delete(key)
+
+
 @ddt.ddt
 class TestContentstore(unittest.TestCase):
     """
@@ -51,13 +66,13 @@ class TestContentstore(unittest.TestCase):
             delattr(CourseLocator, 'deprecated')
         return super(TestContentstore, cls).tearDownClass()
 
-    def set_up_assets(self, deprecated):
+    def set_up_assets(self, deprecated, asset_index_cache=None):
         """
         Setup contentstore w/ proper overriding of deprecated.
         """
         # since MongoModuleStore and MongoContentStore are basically assumed to be together, create this class
         # as well
-        self.contentstore = MongoContentStore(HOST, DB, port=PORT)
+        self.contentstore = MongoContentStore(HOST, DB, port=PORT, asset_index_cache=asset_index_cache)
         self.addCleanup(self.contentstore._drop_database)  # pylint: disable=protected-access
 
         setattr(AssetLocator, 'deprecated', deprecated)
@@ -209,3 +224,18 @@ class TestContentstore(unittest.TestCase):
         # ensure it didn't remove any from other course
         __, count = self.contentstore.get_all_content_for_course(self.course2_key)
         self.assertEqual(count, len(self.course2_files))
+
+    @ddt.data(True, False)
+    def test_drop_database_keeps_other_cache_entries(self, deprecated):
+        """
+        Test that dropping the database only discards the asset names of its courses
+        from the shared cache.
+        """
+        cache = DictCache(unrelated='value')
+        self.set_up_assets(deprecated, asset_index_cache=cache)
+        self.assertEqual(self.contentstore.get_asset_names(self.course1_key), frozenset(self.course1_files))
+        self.assertEqual(self.contentstore.get_asset_names(self.course2_key), frozenset(self.course2_files))
+        self.assertEqual(len(cache), 3)
+
+        self.contentstore._drop_database()  # pylint: disable=protected-access
+        self.assertEqual(cache, {'unrelated': 'value'})
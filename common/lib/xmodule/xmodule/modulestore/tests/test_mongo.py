@@ -16,7 +16,7 @@ from uuid import uuid4
 from datetime import datetime
 from pytz import UTC
 import unittest
-from mock import patch
+from mock import Mock, patch
 from xblock.core import XBlock
 
 from xblock.fields import Scope, Reference, ReferenceList, ReferenceValueDict
@@ -349,6 +349,100 @@ class TestMongoModuleStore(TestMongoModuleStoreBase):
             self.draft_store.get_item(Location('edX', 'test_unicode', '2012_Fall', 'chapter', 'Overview')),
         )
 
+    def test_lazy_definition_data(self):
+        """
+        Test that courses loaded with lazy=True fetch the definition data of
+        their descendants in chunks, when it is used.
+        """
+        course_key = SlashSeparatedCourseKey('edX', 'toy', '2012_Fall')
+
+        def get_blocks(lazy):
+            """
+            Returns the blocks of the toy course, by location.
+            """
+            blocks = {}
+            to_process = [self.draft_store.get_course(course_key, depth=None, lazy=lazy)]
+            while to_process:
+                block = to_process.pop()
+                blocks[block.location] = block
+                to_process.extend(block.get_children())
+            return blocks
+
+        eager_blocks = get_blocks(lazy=False)
+        query_definition_data = self.draft_store._query_definition_data  # pylint: disable=protected-access
+        with patch.object(self.draft_store, '_query_definition_data', wraps=query_definition_data) as mock_query:
+            lazy_blocks = get_blocks(lazy=True)
+            assert_equals(set(lazy_blocks), set(eager_blocks))
+            for location, block in lazy_blocks.iteritems():
+                if location.category == 'html':
+                    assert_equals(block.data, eager_blocks[location].data)
+
+        # The toy course is small enough for the data of all its blocks to be
+        # fetched with a single query.
+        assert_equals(mock_query.call_count, 1)
+
+    def test_lazy_definition_data_of_drafts(self):
+        """
+        Test that courses loaded with lazy=True fetch the definition data of
+        the revision of their descendants that was loaded.
+        """
+        course = self.draft_store.create_course('edX', 'lazy_drafts', 'run', self.dummy_user)
+        self.addCleanup(self.draft_store.delete_course, course.id, self.dummy_user)
+        parent_location = course.location
+        for category in ('chapter', 'sequential', 'vertical'):
+            parent_location = self.draft_store.create_child(
+                self.dummy_user, parent_location, category, block_id=category
+            ).location
+        html = self.draft_store.create_child(
+            self.dummy_user, parent_location, 'html', block_id='html', fields={'data': u'<p>published</p>'}
+        )
+        self.draft_store.publish(parent_location, self.dummy_user)
+        html = self.draft_store.get_item(html.location)
+        html.data = u'<p>draft</p>'
+        self.draft_store.update_item(html, self.dummy_user)
+
+        def get_html_data():
+            """
+            Returns the data of the html block of the course, loaded with lazy=True.
+            """
+            block = self.draft_store.get_course(course.id, depth=None, lazy=True)
+            while block.get_children():
+                block = block.get_children()[0]
+            assert_equals(block.location.category, 'html')
+            return block.data
+
+        assert_equals(get_html_data(), u'<p>draft</p>')
+        with self.draft_store.branch_setting(ModuleStoreEnum.Branch.published_only, course.id):
+            assert_equals(get_html_data(), u'<p>published</p>')
+
+    def test_parent_location_from_inheritance_tree(self):
+        """
+        Test that the parents of the blocks of a course are found in the cached
+        metadata inheritance tree, and agree with the ones found by querying.
+        """
+        course_key = SlashSeparatedCourseKey('edX', 'toy', '2012_Fall')
+        revisions = (ModuleStoreEnum.RevisionOption.published_only, ModuleStoreEnum.RevisionOption.draft_preferred)
+        locations = []
+        to_process = [self.draft_store.get_course(course_key, depth=None)]
+        while to_process:
+            children = to_process.pop().get_children()
+            locations.extend(child.location for child in children)
+            to_process.extend(children)
+
+        # without any cache, the parents are queried
+        queried_parents = {
+            (location, revision): self.draft_store.get_parent_location(location, revision)
+            for location in locations for revision in revisions
+        }
+        assert_not_none(queried_parents[(locations[0], revisions[0])])
+
+        with patch.object(self.draft_store, 'request_cache', Mock(data={})):
+            self.draft_store._get_cached_metadata_inheritance_tree(course_key)  # pylint: disable=protected-access
+            with patch.object(self.draft_store.collection, 'find') as mock_find:
+                for (location, revision), parent_location in queried_parents.iteritems():
+                    assert_equals(self.draft_store.get_parent_location(location, revision), parent_location)
+            assert_false(mock_find.called)
+
     def test_find_one(self):
         assert_not_none(
             self.draft_store._find_one(Location('edX', 'toy', '2012_Fall', 'course', '2012_Fall')),
@@ -822,6 +916,16 @@ class TestMongoKeyValueStore(unittest.TestCase):
         self.kvs = MongoKeyValueStore('xml_data', self.parent, self.children, self.metadata)
         assert_equals('xml_data', self.kvs.get(KeyValueStore.Key(Scope.content, None, None, 'data')))
 
+    def test_read_lazy_data(self):
+        data_loader = Mock(return_value=self.data)
+        self.kvs = MongoKeyValueStore(None, self.parent, self.children, self.metadata, data_loader=data_loader)
+        assert_equals(self.metadata['meta'], self.kvs.get(KeyValueStore.Key(Scope.settings, None, None, 'meta')))
+        assert_false(data_loader.called)
+
+        assert_equals(self.data['foo'], self.kvs.get(KeyValueStore.Key(Scope.content, None, None, 'foo')))
+        assert_true(self.kvs.has(KeyValueStore.Key(Scope.content, None, None, 'foo')))
+        data_loader.assert_called_once_with()
+
     def _check_write(self, key, value):
         self.kvs.set(key, value)
         assert_equals(value, self.kvs.get(key))
@@ -4,6 +4,7 @@ Utility functions for transcripts.
 """
 import os
 import copy
+import hashlib
 import json
 import requests
 import logging
@@ -11,6 +12,8 @@ from pysrt import SubRipTime, SubRipItem, SubRipFile
 from lxml import etree
 from HTMLParser import HTMLParser
 
+from django.core.cache import cache
+
 from xmodule.exceptions import NotFoundError
 from xmodule.contentstore.content import StaticContent
 from xmodule.contentstore.django import contentstore
@@ -20,6 +23,12 @@ from .bumper_utils import get_bumper_settings
 
 log = logging.getLogger(__name__)
 
+TRANSCRIPT_CONVERSION_CACHE_TIMEOUT = 60 * 60 * 24  # 1 day
+
+# Converted transcripts longer than this are not cached, memcached refusing
+# values over 1MB.
+TRANSCRIPT_CONVERSION_CACHE_MAX_LENGTH = 256 * 1024
+
 
 class TranscriptException(Exception):  # pylint: disable=missing-docstring
     pass
@@ -248,19 +257,17 @@ def generate_subs_from_source(speed_subs, subs_type, subs_filedata, item, langua
     return subs
 
 
-def generate_srt_from_sjson(sjson_subs, speed):
-    """Generate transcripts with speed = 1.0 from sjson to SubRip (*.srt).
+def iter_srt_from_sjson(sjson_subs, speed):
+    """Generate transcripts with speed = 1.0 from sjson to SubRip (*.srt),
+    one subtitle at a time.
 
     :param sjson_subs: "sjson" subs.
     :param speed: speed of `sjson_subs`.
-    :returns: "srt" subs.
+    :returns: an iterator over the "srt" subs, as unicode strings.
     """
-
-    output = ''
-
     equal_len = len(sjson_subs['start']) == len(sjson_subs['end']) == len(sjson_subs['text'])
     if not equal_len:
-        return output
+        return
 
     sjson_speed_1 = generate_subs(speed, 1, sjson_subs)
 
@@ -271,9 +278,17 @@ def generate_srt_from_sjson(sjson_subs, speed):
             end=SubRipTime(milliseconds=sjson_speed_1['end'][i]),
             text=sjson_speed_1['text'][i]
         )
-        output += (unicode(item))
-        output += '\n'
-    return output
+        yield unicode(item) + u'\n'
+
+
+def generate_srt_from_sjson(sjson_subs, speed):
+    """Generate transcripts with speed = 1.0 from sjson to SubRip (*.srt).
+
+    :param sjson_subs: "sjson" subs.
+    :param speed: speed of `sjson_subs`.
+    :returns: "srt" subs.
+    """
+    return u''.join(iter_srt_from_sjson(sjson_subs, speed))
 
 
 def copy_or_rename_transcript(new_name, old_name, item, delete_old=False, user=None):
@@ -483,6 +498,10 @@ class Transcript(object):
 
         Accepted input formats: sjson, srt.
         Accepted output format: srt, txt.
+
+        Converted transcripts are kept in the cache, keyed by the hash of
+        `content`, so that the same transcript is not converted for every
+        download.
         """
         assert input_format in ('srt', 'sjson')
         assert output_format in ('txt', 'srt', 'sjson')
@@ -490,6 +509,20 @@ class Transcript(object):
         if input_format == output_format:
             return content
 
+        content_hash = hashlib.md5(content.encode('utf8') if isinstance(content, unicode) else content).hexdigest()
+        cache_key = u'transcripts.converted.{}.{}.{}'.format(content_hash, input_format, output_format)
+        converted = cache.get(cache_key)
+        if converted is None:
+            converted = Transcript._convert(content, input_format, output_format)
+            if converted is not None and len(converted) <= TRANSCRIPT_CONVERSION_CACHE_MAX_LENGTH:
+                cache.set(cache_key, converted, TRANSCRIPT_CONVERSION_CACHE_TIMEOUT)
+        return converted
+
+    @staticmethod
+    def _convert(content, input_format, output_format):
+        """
+        Convert transcript `content` from `input_format` to another `output_format`.
+        """
         if input_format == 'srt':
 
             if output_format == 'txt':
@@ -578,26 +611,23 @@ class VideoTranscriptsMixin(object):
             return set(translations)
 
         # If we've gotten this far, we're going to verify that the transcripts
-        # being referenced are actually in the contentstore.
+        # being referenced are actually in the contentstore, using the index of
+        # the assets of the course rather than looking up every transcript.
+        asset_names = contentstore().get_asset_names(self.location.course_key)
+
+        def asset_exists(filename):
+            """
+            Returns whether the course has an asset named `filename`.
+            """
+            return Transcript.asset_location(self.location, filename).name in asset_names
+
         if sub:  # check if sjson exists for 'en'.
-            try:
-                Transcript.asset(self.location, sub, 'en')
-            except NotFoundError:
-                try:
-                    Transcript.asset(self.location, None, None, sub)
-                except NotFoundError:
-                    pass
-                else:
-                    translations = ['en']
-            else:
+            if asset_exists(subs_filename(sub, 'en')) or asset_exists(sub):
                 translations = ['en']
 
         for lang in other_lang:
-            try:
-                Transcript.asset(self.location, None, None, other_lang[lang])
-            except NotFoundError:
-                continue
-            translations.append(lang)
+            if asset_exists(other_lang[lang]):
+                translations.append(lang)
 
         return translations
 
@@ -12,6 +12,8 @@ file and check it in at the same time as your model changes. To do that,
 
 """
 import logging
+import re
+import string
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import models, transaction
@@ -150,6 +152,9 @@ class Optout(models.Model):
 # the location where the email message body is to be inserted.
 COURSE_EMAIL_MESSAGE_BODY_TAG = '{{message_body}}'
 
+# Keys of the email context whose values differ between the recipients of an email.
+RECIPIENT_CONTEXT_KEYS = ('name', 'email', 'user_id')
+
 
 class CourseEmailTemplate(models.Model):
     """
@@ -228,6 +233,89 @@ class CourseEmailTemplate(models.Model):
         """
         return CourseEmailTemplate._render(self.html_template, htmltext, context)
 
+    def prepare_plaintext(self, plaintext, context):
+        """
+        Returns a `PreparedEmailMessage` rendering `render_plaintext(plaintext, ...)`
+        for each recipient, with the shared parts of `context` rendered once.
+        """
+        return PreparedEmailMessage(self.plain_template, plaintext, context)
+
+    def prepare_htmltext(self, htmltext, context):
+        """
+        Returns a `PreparedEmailMessage` rendering `render_htmltext(htmltext, ...)`
+        for each recipient, with the shared parts of `context` rendered once.
+        """
+        return PreparedEmailMessage(self.html_template, htmltext, context)
+
+
+class PreparedEmailMessage(object):
+    """
+    An email template and message body, rendered with the context values
+    shared by all the recipients of an email.
+
+    `render(context)` returns the same message as `CourseEmailTemplate._render`,
+    but only formats the template fields in RECIPIENT_CONTEXT_KEYS, substitutes
+    the %%-encoded keywords of the body if it has any, and wraps the lines
+    that differ from those of previous recipients.
+    """
+    def __init__(self, format_string, message_body, context):
+        self._formatter = string.Formatter()
+        self._join = format_string[:0].join
+        self._message_body = message_body
+        self._body_has_keywords = '%%' in message_body
+        self._wrapped_lines = {}
+
+        # The template, as a list of the shared text and the (field_name,
+        # format_spec, conversion) of the fields to format for each recipient.
+        self._parts = []
+        for literal_text, field_name, format_spec, conversion in self._formatter.parse(format_string):
+            if literal_text:
+                self._parts.append(literal_text)
+            if field_name is None:
+                continue
+            field = (field_name, format_spec, conversion)
+            if re.split(r'[.[]', field_name)[0] in RECIPIENT_CONTEXT_KEYS:
+                self._parts.append(field)
+            else:
+                self._parts.append(self._format_field(field, context))
+
+    def _format_field(self, field, context):
+        """
+        Formats one template field with `context`, as `format_string.format(**context)` would.
+        """
+        field_name, format_spec, conversion = field
+        value, __ = self._formatter.get_field(field_name, (), context)
+        value = self._formatter.convert_field(value, conversion)
+        return format(value, self._formatter.vformat(format_spec, (), context))
+
+    def _wrap(self, message):
+        """
+        Returns `wrap_message(message)`, reusing the lines wrapped for previous recipients.
+        """
+        wrapped_lines = []
+        for line in message.split('\n'):
+            wrapped_line = self._wrapped_lines.get(line)
+            if wrapped_line is None:
+                wrapped_line = self._wrapped_lines[line] = wrap_message(line)
+            wrapped_lines.append(wrapped_line)
+        return '\n'.join(wrapped_lines)
+
+    def render(self, context):
+        """
+        Returns the message of the recipient whose values are in `context`.
+        """
+        message_body = self._message_body
+        if self._body_has_keywords and 'user_id' in context and 'course_id' in context:
+            message_body = substitute_keywords_with_data(message_body, context)
+
+        result = self._join(
+            part if isinstance(part, basestring) else self._format_field(part, context)
+            for part in self._parts
+        )
+        message_body_tag = COURSE_EMAIL_MESSAGE_BODY_TAG.format()
+        result = result.replace(message_body_tag, message_body, 1)
+        return self._wrap(result)
+
 
 class CourseAuthorization(models.Model):
     """
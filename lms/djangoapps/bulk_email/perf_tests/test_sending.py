@@ -0,0 +1,188 @@
+"""
+Performance test of bulk email sending to a local fake SMTP server, comparing
+rendering every message and sending it over one connection with the prepared
+templates and concurrent connections used by the bulk email subtasks.
+
+The fake server waits before accepting each message, standing in for the
+round trip to the real SMTP server or SES.
+"""
+import SocketServer
+import threading
+import time
+import unittest
+
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.management import call_command
+from django.test import TestCase
+from nose.plugins.skip import SkipTest
+
+from bulk_email.models import CourseEmailTemplate
+from bulk_email.sending import ConcurrentEmailSender, EmailConnectionPool, SendRateLimiter
+
+# The dependency below needs to be installed manually from the development.txt file, which doesn't
+# get installed during unit tests!
+try:
+    from code_block_timer import CodeBlockTimer
+except ImportError:
+    CodeBlockTimer = None
+
+# Number of messages rendered and sent.
+MESSAGES = 200
+
+# Numbers of concurrent connections to send over.
+CONCURRENCIES = (1, 4)
+
+# Seconds the fake server takes to accept each message.
+SERVER_LATENCY = 0.02
+
+MESSAGE_BODY = u"<p>Dear %%USER_FULLNAME%%,</p><p>" + u"This is a performance test announcement. " * 40 + u"</p>"
+
+CONTEXT = {
+    'course_title': u'Performance Test Course',
+    'course_url': u'https://example.com/course',
+    'course_image_url': u'https://example.com/course/image.png',
+    'course_end_date': u'',
+    'account_settings_url': u'https://example.com/account/settings',
+    'email_settings_url': u'https://example.com/dashboard',
+    'platform_name': u'edX',
+    'course_id': u'edX/PerfTest/2015',
+    'name': u'',
+    'email': u'',
+}
+
+
+class FakeSMTPHandler(SocketServer.StreamRequestHandler):
+    """
+    Accepts every message, after waiting for the latency of the server.
+    """
+    def reply(self, line):
+        """Sends one reply line."""
+        self.wfile.write(line + '\r\n')
+        self.wfile.flush()
+
+    def handle(self):
+        self.reply('220 localhost fake SMTP server')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in ('.\r\n', ''):
+                    pass
+                time.sleep(self.server.latency)
+                self.reply('250 OK')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+
+class FakeSMTPServer(SocketServer.ThreadingMixIn, SocketServer.TCPServer):
+    """
+    A local SMTP server handling each connection in its own thread.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, latency):
+        SocketServer.TCPServer.__init__(self, ('127.0.0.1', 0), FakeSMTPHandler)
+        self.latency = latency
+
+
+# Eventually, exclude this attribute from regular unittests while running *only* tests
+# with this attribute during regular performance tests.
+# @attr("perf_test")
+@unittest.skip
+class BulkEmailSendPerfTest(TestCase):
+    """
+    This class exists to time the rendering and sending of bulk email messages.
+    """
+
+    # Use this attr to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super(BulkEmailSendPerfTest, self).setUp()
+        if CodeBlockTimer is None:
+            raise SkipTest("CodeBlockTimer undefined.")
+
+        # load initial content (since we don't run migrations as part of tests):
+        call_command("loaddata", "course_email_template.json")
+        self.template = CourseEmailTemplate.get_template()
+        self.recipients = [
+            (u'Learner {}'.format(index), u'learner{}@example.com'.format(index))
+            for index in xrange(MESSAGES)
+        ]
+
+        self.server = FakeSMTPServer(SERVER_LATENCY)
+        server_thread = threading.Thread(target=self.server.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+        self.addCleanup(self.server.shutdown)
+
+    def _connection(self):
+        """Returns a connection to the fake server."""
+        return get_connection(
+            'django.core.mail.backends.smtp.EmailBackend',
+            host=self.server.server_address[0],
+            port=self.server.server_address[1],
+            use_tls=False,
+            username='',
+            password='',
+        )
+
+    def _render_per_recipient(self):
+        """Renders each message from scratch, as subtasks used to."""
+        for name, email in self.recipients:
+            recipient_context = dict(CONTEXT, name=name, email=email)
+            yield (
+                self.template.render_plaintext(MESSAGE_BODY, recipient_context),
+                self.template.render_htmltext(MESSAGE_BODY, recipient_context),
+                email,
+            )
+
+    def _render_prepared(self):
+        """Renders each message from the prepared templates."""
+        prepared_plaintext = self.template.prepare_plaintext(MESSAGE_BODY, CONTEXT)
+        prepared_html = self.template.prepare_htmltext(MESSAGE_BODY, CONTEXT)
+        for name, email in self.recipients:
+            recipient_context = dict(CONTEXT, name=name, email=email)
+            yield prepared_plaintext.render(recipient_context), prepared_html.render(recipient_context), email
+
+    def _build_messages(self, rendered_messages):
+        """Returns the email messages of the rendered (plaintext, html, address) triples."""
+        messages = []
+        for plaintext, html, email in rendered_messages:
+            message = EmailMultiAlternatives(u'Performance test', plaintext, 'perftest@example.com', [email])
+            message.attach_alternative(html, 'text/html')
+            messages.append(message)
+        return messages
+
+    def test_rendering_timings(self):
+        """
+        Generate timings of both ways of rendering, which must agree.
+        """
+        self.assertEqual(list(self._render_per_recipient()), list(self._render_prepared()))
+
+        for name, render in (('per_recipient', self._render_per_recipient), ('prepared', self._render_prepared)):
+            with CodeBlockTimer("BulkEmailRender:{}:{}".format(name, MESSAGES)):
+                self._build_messages(render())
+
+    def test_sending_timings(self):
+        """
+        Generate timings of sending over one and several concurrent connections.
+        """
+        messages = self._build_messages(self._render_prepared())
+        for concurrency in CONCURRENCIES:
+            sender = ConcurrentEmailSender(EmailConnectionPool(self._connection, concurrency), SendRateLimiter())
+            errors = []
+            try:
+                with CodeBlockTimer("BulkEmailSend:{}:{}".format(concurrency, MESSAGES)):
+                    for index in xrange(0, len(messages), concurrency):
+                        errors.extend(error for error in sender.send(messages[index:index + concurrency]) if error)
+            finally:
+                sender.close()
+            self.assertEqual(errors, [])
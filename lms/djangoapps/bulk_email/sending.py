@@ -0,0 +1,147 @@
+"""
+Concurrent sending of the messages of a bulk email subtask.
+
+A subtask sends its messages over a small pool of email backend connections,
+each opened on first use and kept open until the end of the subtask, from as
+many threads as there are connections.  A rate limiter spaces out the sends
+of all the threads.
+"""
+import threading
+from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
+from time import sleep, time
+import Queue
+
+import dogstats_wrapper as dog_stats_api
+
+
+class EmailConnectionPool(object):
+    """
+    Up to `size` connections created by `connection_factory`, each used by
+    one thread at a time.
+    """
+    def __init__(self, connection_factory, size):
+        self.connection_factory = connection_factory
+        self.size = size
+        self._idle = Queue.LifoQueue()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        """
+        Returns an idle connection, opening a new one if there is none and
+        the pool is not full yet.
+        """
+        try:
+            return self._idle.get_nowait()
+        except Queue.Empty:
+            pass
+
+        with self._lock:
+            create = len(self._connections) < self.size
+            if create:
+                # Reserve the slot before opening, which may fail or take a while.
+                self._connections.append(None)
+        if not create:
+            return self._idle.get()
+
+        try:
+            connection = self.connection_factory()
+            connection.open()
+        except Exception:
+            with self._lock:
+                self._connections.remove(None)
+            raise
+        with self._lock:
+            self._connections[self._connections.index(None)] = connection
+        return connection
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager lending a connection of the pool.
+        """
+        connection = self._acquire()
+        try:
+            yield connection
+        finally:
+            self._idle.put(connection)
+
+    def close(self):
+        """
+        Closes every connection opened by the pool.
+        """
+        with self._lock:
+            connections = [connection for connection in self._connections if connection is not None]
+            self._connections = []
+        self._idle = Queue.LifoQueue()
+        for connection in connections:
+            connection.close()
+
+
+class SendRateLimiter(object):
+    """
+    Spaces out calls to `wait` by at least `min_interval` seconds, across threads.
+    """
+    def __init__(self, min_interval=0):
+        self.min_interval = min_interval
+        self._next_send = 0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """
+        Sleeps until the next send is allowed.
+        """
+        if not self.min_interval:
+            return
+        with self._lock:
+            now = time()
+            delay = self._next_send - now
+            self._next_send = max(now, self._next_send) + self.min_interval
+        if delay > 0:
+            sleep(delay)
+
+
+class ConcurrentEmailSender(object):
+    """
+    Sends messages over the connections of an `EmailConnectionPool`, from
+    one thread per connection.
+    """
+    def __init__(self, connection_pool, rate_limiter, stats_tags=None):
+        self.connection_pool = connection_pool
+        self.rate_limiter = rate_limiter
+        self.stats_tags = stats_tags
+        self._threads = None
+        if connection_pool.size > 1:
+            self._threads = ThreadPool(connection_pool.size)
+
+    def _send(self, message):
+        """
+        Sends one message, returning the exception it raised, or None.
+        """
+        try:
+            self.rate_limiter.wait()
+            with self.connection_pool.connection() as connection:
+                with dog_stats_api.timer('course_email.single_send.time.overall', tags=self.stats_tags):
+                    connection.send_messages([message])
+        except Exception as exc:  # pylint: disable=broad-except
+            return exc
+        return None
+
+    def send(self, messages):
+        """
+        Sends `messages` concurrently.  Returns, for each message in order,
+        the exception raised when sending it, or None if it was sent.
+        """
+        if self._threads is None:
+            return [self._send(message) for message in messages]
+        return self._threads.map(self._send, messages)
+
+    def close(self):
+        """
+        Stops the threads and closes the connections.
+        """
+        if self._threads is not None:
+            self._threads.close()
+            self._threads.join()
+        self.connection_pool.close()
@@ -6,7 +6,6 @@ to a course.
 import re
 import random
 import json
-from time import sleep
 from collections import Counter
 import logging
 
@@ -39,6 +38,7 @@ from bulk_email.models import (
     SEND_TO_MYSELF, SEND_TO_ALL, TO_OPTIONS,
     SEND_TO_STAFF,
 )
+from bulk_email.sending import ConcurrentEmailSender, EmailConnectionPool, SendRateLimiter
 from courseware.courses import get_course, course_image_url
 from student.roles import CourseStaffRole, CourseInstructorRole
 from instructor_task.models import InstructorTask
@@ -483,51 +483,70 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
 
     # use the CourseEmailTemplate that was associated with the CourseEmail
     course_email_template = course_email.get_template()
+
+    # Throttle if we have gotten the rate limiter.  This is not very high-tech,
+    # but if a task has been retried for rate-limiting reasons, then we wait
+    # for a period of time between all emails within this task.  Choice of
+    # the value depends on the number of workers that might be sending email in
+    # parallel, and what the SES throttle rate is.
+    if subtask_status.retried_nomax > 0:
+        min_send_interval = settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS
+    elif settings.BULK_EMAIL_MAX_SENDS_PER_SECOND:
+        min_send_interval = 1.0 / settings.BULK_EMAIL_MAX_SENDS_PER_SECOND
+    else:
+        min_send_interval = 0
+    sender = None
     try:
-        connection = get_connection()
-        connection.open()
+        # Messages are sent over a few connections at once, opened on first use.
+        concurrency = settings.BULK_EMAIL_SEND_CONCURRENCY
+        sender = ConcurrentEmailSender(
+            EmailConnectionPool(get_connection, concurrency),
+            SendRateLimiter(min_send_interval),
+            stats_tags=[_statsd_tag(course_title)],
+        )
 
         # Define context values to use in all course emails:
         email_context = {'name': '', 'email': ''}
         email_context.update(global_email_context)
+        email_context['course_id'] = course_email.course_id
 
-        while to_list:
-            # Update context with user-specific values from the user at the end of the list.
-            # At the end of processing this user, they will be popped off of the to_list.
-            # That way, the to_list will always contain the recipients remaining to be emailed.
-            # This is convenient for retries, which will need to send to those who haven't
-            # yet been emailed, but not send to those who have already been sent to.
-            recipient_num += 1
-            current_recipient = to_list[-1]
-            email = current_recipient['email']
-            email_context['email'] = email
-            email_context['name'] = current_recipient['profile__name']
-            email_context['user_id'] = current_recipient['pk']
-            email_context['course_id'] = course_email.course_id
-
-            # Construct message content using templates and context:
-            plaintext_msg = course_email_template.render_plaintext(course_email.text_message, email_context)
-            html_msg = course_email_template.render_htmltext(course_email.html_message, email_context)
-
-            # Create email:
-            email_msg = EmailMultiAlternatives(
-                course_email.subject,
-                plaintext_msg,
-                from_addr,
-                [email],
-                connection=connection
-            )
-            email_msg.attach_alternative(html_msg, 'text/html')
+        # Render the parts of the message shared by all recipients once:
+        prepared_plaintext = course_email_template.prepare_plaintext(course_email.text_message, email_context)
+        prepared_html = course_email_template.prepare_htmltext(course_email.html_message, email_context)
 
-            # Throttle if we have gotten the rate limiter.  This is not very high-tech,
-            # but if a task has been retried for rate-limiting reasons, then we sleep
-            # for a period of time between all emails within this task.  Choice of
-            # the value depends on the number of workers that might be sending email in
-            # parallel, and what the SES throttle rate is.
-            if subtask_status.retried_nomax > 0:
-                sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
+        while to_list:
+            # Send to the recipients at the end of the list, last one first.
+            # The recipients who were processed are removed from the to_list
+            # once their messages have been sent.  That way, the to_list will
+            # always contain the recipients remaining to be emailed.  This is
+            # convenient for retries, which will need to send to those who
+            # haven't yet been emailed, but not send to those who have already
+            # been sent to.
+            batch = list(reversed(to_list[-concurrency:]))
+            batch_recipient_nums = []
+            email_messages = []
+            for current_recipient in batch:
+                recipient_num += 1
+                batch_recipient_nums.append(recipient_num)
+                email = current_recipient['email']
+                email_context['email'] = email
+                email_context['name'] = current_recipient['profile__name']
+                email_context['user_id'] = current_recipient['pk']
+
+                # Construct message content using templates and context:
+                plaintext_msg = prepared_plaintext.render(email_context)
+                html_msg = prepared_html.render(email_context)
+
+                # Create email:
+                email_msg = EmailMultiAlternatives(
+                    course_email.subject,
+                    plaintext_msg,
+                    from_addr,
+                    [email],
+                )
+                email_msg.attach_alternative(html_msg, 'text/html')
+                email_messages.append(email_msg)
 
-            try:
                 log.info(
                     "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
                     Recipient name: %s, Email address: %s",
@@ -539,82 +558,98 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
                     current_recipient['profile__name'],
                     email
                 )
-                with dog_stats_api.timer('course_email.single_send.time.overall', tags=[_statsd_tag(course_title)]):
-                    connection.send_messages([email_msg])
-
-            except SMTPDataError as exc:
-                # According to SMTP spec, we'll retry error codes in the 4xx range.  5xx range indicates hard failure.
-                total_recipients_failed += 1
-                log.error(
-                    "BulkEmail ==> Status: Failed(SMTPDataError), Task: %s, SubTask: %s, EmailId: %s, \
-                    Recipient num: %s/%s, Email address: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email
-                )
-                if exc.smtp_code >= 400 and exc.smtp_code < 500:
-                    # This will cause the outer handler to catch the exception and retry the entire task.
-                    raise exc
-                else:
+
+            send_errors = sender.send(email_messages)
+
+            retry_exc = None
+            processed = set()
+            for current_recipient, current_recipient_num, exc in zip(batch, batch_recipient_nums, send_errors):
+                email = current_recipient['email']
+                if exc is None:
+                    total_recipients_successful += 1
+                    log.info(
+                        "BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
+                        Recipient num: %s/%s, Email address: %s,",
+                        parent_task_id,
+                        task_id,
+                        email_id,
+                        current_recipient_num,
+                        total_recipients,
+                        email
+                    )
+                    dog_stats_api.increment('course_email.sent', tags=[_statsd_tag(course_title)])
+                    if settings.BULK_EMAIL_LOG_SENT_EMAILS:
+                        log.info('Email with id %s sent to %s', email_id, email)
+                    else:
+                        log.debug('Email with id %s sent to %s', email_id, email)
+                    subtask_status.increment(succeeded=1)
+
+                elif isinstance(exc, SMTPDataError):
+                    # According to SMTP spec, we'll retry error codes in the 4xx range.  5xx range indicates hard failure.
+                    total_recipients_failed += 1
+                    log.error(
+                        "BulkEmail ==> Status: Failed(SMTPDataError), Task: %s, SubTask: %s, EmailId: %s, \
+                        Recipient num: %s/%s, Email address: %s",
+                        parent_task_id,
+                        task_id,
+                        email_id,
+                        current_recipient_num,
+                        total_recipients,
+                        email
+                    )
+                    if exc.smtp_code >= 400 and exc.smtp_code < 500:
+                        # This will cause the outer handler to catch the exception and retry the entire task.
+                        retry_exc = retry_exc or exc
+                        continue
+                    else:
+                        # This will fall through and not retry the message.
+                        log.warning(
+                            'BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
+                            Email not delivered to %s due to error %s',
+                            parent_task_id,
+                            task_id,
+                            email_id,
+                            current_recipient_num,
+                            total_recipients,
+                            email,
+                            exc.smtp_error
+                        )
+                        dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
+                        subtask_status.increment(failed=1)
+
+                elif isinstance(exc, SINGLE_EMAIL_FAILURE_ERRORS):
                     # This will fall through and not retry the message.
-                    log.warning(
-                        'BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
-                        Email not delivered to %s due to error %s',
+                    total_recipients_failed += 1
+                    log.error(
+                        "BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
+                        EmailId: %s, Recipient num: %s/%s, Email address: %s, Exception: %s",
                         parent_task_id,
                         task_id,
                         email_id,
-                        recipient_num,
+                        current_recipient_num,
                         total_recipients,
                         email,
-                        exc.smtp_error
+                        exc
                     )
                     dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
                     subtask_status.increment(failed=1)
 
-            except SINGLE_EMAIL_FAILURE_ERRORS as exc:
-                # This will fall through and not retry the message.
-                total_recipients_failed += 1
-                log.error(
-                    "BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
-                    EmailId: %s, Recipient num: %s/%s, Email address: %s, Exception: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email,
-                    exc
-                )
-                dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
-                subtask_status.increment(failed=1)
-
-            else:
-                total_recipients_successful += 1
-                log.info(
-                    "BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
-                    Recipient num: %s/%s, Email address: %s,",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email
-                )
-                dog_stats_api.increment('course_email.sent', tags=[_statsd_tag(course_title)])
-                if settings.BULK_EMAIL_LOG_SENT_EMAILS:
-                    log.info('Email with id %s sent to %s', email_id, email)
                 else:
-                    log.debug('Email with id %s sent to %s', email_id, email)
-                subtask_status.increment(succeeded=1)
+                    # This will cause the outer handler to catch the exception and retry the entire task.
+                    retry_exc = retry_exc or exc
+                    continue
 
-            # Pop the user that was emailed off the end of the list only once they have
-            # successfully been processed.  (That way, if there were a failure that
-            # needed to be retried, the user is still on the list.)
-            recipients_info[email] += 1
-            to_list.pop()
+                recipients_info[email] += 1
+                processed.add(id(current_recipient))
+
+            # Remove the users that were emailed from the list only once they have
+            # been processed.  (That way, if there were a failure that needed to be
+            # retried, the user is still on the list.)
+            to_list[-len(batch):] = [
+                recipient for recipient in to_list[-len(batch):] if id(recipient) not in processed
+            ]
+            if retry_exc is not None:
+                raise retry_exc
 
         log.info(
             "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Total Successful Recipients: %s/%s, \
@@ -693,7 +728,8 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         return subtask_status, None
     finally:
         # Clean up at the end.
-        connection.close()
+        if sender is not None:
+            sender.close()
 
 
 def _get_current_task():
@@ -137,6 +137,20 @@ class CourseEmailTemplateTest(TestCase):
         context = self._get_sample_plain_context()
         template.render_plaintext("My new plain text.", context)
 
+    def test_prepared_render(self):
+        template = CourseEmailTemplate.get_template()
+        context = self._get_sample_html_context()
+        context.update({'name': '', 'course_id': 'edX/Test/2015'})
+        message = u"Dear %%USER_FULLNAME%%,\n" + u"A long line of text. " * 20
+        prepared_plaintext = template.prepare_plaintext(message, context)
+        prepared_html = template.prepare_htmltext(message, context)
+        for name, email in ((u"Robot", u"robot@example.com"), (u"Zo\xeb " * 30, u"zoe@example.com")):
+            recipient_context = dict(context, name=name, email=email, user_id=1)
+            self.assertEqual(
+                prepared_plaintext.render(recipient_context), template.render_plaintext(message, recipient_context)
+            )
+            self.assertEqual(prepared_html.render(recipient_context), template.render_htmltext(message, recipient_context))
+
 
 @attr('shard_1')
 class CourseAuthorizationTest(TestCase):
@@ -29,6 +29,7 @@ from celery.states import SUCCESS, FAILURE
 
 from django.conf import settings
 from django.core.management import call_command
+from django.test.utils import override_settings
 
 from xmodule.modulestore.tests.factories import CourseFactory
 
@@ -195,6 +196,37 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
             get_conn.return_value.send_messages.side_effect = cycle([None])
             self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
 
+    @override_settings(BULK_EMAIL_SEND_CONCURRENCY=4)
+    def test_successful_concurrent(self):
+        # Select number of emails to fit into a single subtask.
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        # We also send email to the instructor:
+        self._create_students(num_emails - 1)
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.return_value = None
+            self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+        # Messages are sent over at most 4 connections, kept open for the whole subtask.
+        self.assertLessEqual(get_conn.call_count, 4)
+        self.assertEqual(get_conn.return_value.send_messages.call_count, num_emails)
+
+    @override_settings(BULK_EMAIL_SEND_CONCURRENCY=4)
+    def test_address_failures_concurrent(self):
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        students = self._create_students(num_emails - 1)
+        failing_emails = set(student.email for student in students[::4])
+
+        def send_messages(messages):
+            """Fails to send to the students whose address is in failing_emails."""
+            if messages[0].to[0] in failing_emails:
+                raise SMTPDataError(554, "Email address is blacklisted")
+
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.side_effect = send_messages
+            self._test_run_with_task(
+                send_bulk_course_email, 'emailed', num_emails,
+                num_emails - len(failing_emails), failed=len(failing_emails)
+            )
+
     def test_successful_twice(self):
         # Select number of emails to fit into a single subtask.
         num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
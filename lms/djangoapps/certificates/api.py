@@ -121,6 +121,44 @@ def generate_user_certificates(student, course_key, course=None, insecure=False,
     return status
 
 
+def generate_certificates_for_students(students, course_key, course=None, insecure=False, generation_mode='batch'):
+    """
+    Add the add-cert requests of several students of a course into the
+    xqueue, as `generate_user_certificates` does for one student, fetching
+    the data needed per student in bulk.
+
+    Args:
+        students (list of User)
+        course_key (CourseKey)
+
+    Keyword Arguments:
+        course (Course): Optionally provide the course object; if not provided
+            it will be loaded.
+        insecure - (Boolean)
+        generation_mode - who has requested certificate generation.
+
+    Returns a dict mapping the id of each student to their certificate status.
+    """
+    if course is None:
+        course = modulestore().get_course(course_key, depth=0)
+    xqueue = XQueueCertInterface()
+    if insecure:
+        xqueue.use_https = False
+    generate_pdf = not has_html_certificates_enabled(course_key, course)
+    statuses = {}
+    for student, status, cert in xqueue.add_certs(students, course_key, course, generate_pdf=generate_pdf):
+        statuses[student.id] = status
+        if status in [CertificateStatuses.generating, CertificateStatuses.downloadable]:
+            emit_certificate_event('created', student, course_key, course, {
+                'user_id': student.id,
+                'course_id': unicode(course_key),
+                'certificate_id': cert.verify_uuid,
+                'enrollment_mode': cert.mode,
+                'generation_mode': generation_mode
+            })
+    return statuses
+
+
 def regenerate_user_certificates(student, course_key, course=None,
                                  forced_grade=None, template_file=None, insecure=False):
     """
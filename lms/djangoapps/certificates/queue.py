@@ -4,6 +4,7 @@ import random
 import logging
 import lxml.html
 from lxml.etree import XMLSyntaxError, ParserError  # pylint:disable=no-name-in-module
+from multiprocessing.pool import ThreadPool
 from uuid import uuid4
 
 from django.test.client import RequestFactory
@@ -29,6 +30,9 @@ from certificates.models import (
 
 LOGGER = logging.getLogger(__name__)
 
+# Number of certificate tasks sent to the XQueue at once by `add_certs`.
+XQUEUE_SUBMISSION_THREADS = 8
+
 
 class XQueueAddToQueueError(Exception):
     """An error occurred when adding a certificate task to the queue. """
@@ -96,10 +100,12 @@ class XQueueCertInterface(object):
         else:
             self.request = request
 
+        # Keep a connection open for every thread sending tasks in `add_certs`
         self.xqueue_interface = XQueueInterface(
             settings.XQUEUE_INTERFACE['url'],
             settings.XQUEUE_INTERFACE['django_auth'],
             requests_auth,
+            pool_size=XQUEUE_SUBMISSION_THREADS,
         )
         self.whitelist = CertificateWhitelist.objects.all()
         self.restricted = UserProfile.objects.filter(allow_certificate=False)
@@ -181,7 +187,6 @@ class XQueueCertInterface(object):
 
         raise NotImplementedError
 
-    # pylint: disable=too-many-statements
     def add_cert(self, student, course_id, course=None, forced_grade=None, template_file=None,
                  title='None', generate_pdf=True):
         """
@@ -212,7 +217,135 @@ class XQueueCertInterface(object):
 
         Returns the student's status and newly created certificate instance
         """
+        cert_status = certificate_status_for_student(student, course_id)['status']
+        if not self._can_add_cert(student, course_id, cert_status):
+            return cert_status, None
+
+        # grade the student
+
+        # re-use the course passed in optionally so we don't have to re-fetch everything
+        # for every student
+        if course is None:
+            course = modulestore().get_course(course_id, depth=0)
+        profile = UserProfile.objects.get(user=student)
+
+        # Needed
+        self.request.user = student
+        self.request.session = {}
+
+        is_whitelisted = self.whitelist.filter(user=student, course_id=course_id, whitelist=True).exists()
+        grade = grades.grade(student, self.request, course)
+        enrollment_mode, __ = CourseEnrollment.enrollment_mode_for_user(student, course_id)
+        user_is_verified = SoftwareSecurePhotoVerification.user_is_verified(student)
+
+        new_status, cert, submission = self._create_cert(
+            student, course_id, course, grade, profile.name, is_whitelisted, enrollment_mode, user_is_verified,
+            lambda: self.restricted.filter(user=student).exists(),
+            forced_grade=forced_grade, template_file=template_file, generate_pdf=generate_pdf
+        )
+        if submission is not None:
+            try:
+                self._send_to_xqueue(*submission)
+            except XQueueAddToQueueError as exc:
+                new_status = self._set_submission_error(cert, exc)
+            else:
+                self._log_submission(cert)
+
+        return new_status, cert
+
+    def add_certs(self, students, course_id, course, generate_pdf=True):
+        """
+        Request new certificates for several students of a course, as
+        `add_cert` does for one student.
+
+        The profiles, whitelist entries, enrollment modes, verification status
+        and certificate status of the students are fetched with one query each,
+        and the students are graded one after the other.  Certificate tasks
+        are sent to the XQueue concurrently, while the following students are
+        being graded.
+
+        Arguments:
+          students  - list of User.object
+          course_id - courseenrollment.course_id (CourseKey)
+          course    - the course descriptor
+
+        Returns a list of (student, status, certificate instance) tuples, in
+        which the certificate is None if it could not be created.
+        """
+        user_ids = [student.id for student in students]
+        cert_statuses = dict(
+            GeneratedCertificate.objects.filter(user_id__in=user_ids, course_id=course_id).values_list('user_id', 'status')
+        )
+        profiles = {
+            user_id: (name, allow_certificate)
+            for user_id, name, allow_certificate in UserProfile.objects.filter(
+                user_id__in=user_ids
+            ).values_list('user_id', 'name', 'allow_certificate')
+        }
+        whitelisted_user_ids = set(self.whitelist.filter(
+            user_id__in=user_ids, course_id=course_id, whitelist=True
+        ).values_list('user_id', flat=True))
+        enrollment_modes = dict(
+            CourseEnrollment.objects.filter(user_id__in=user_ids, course_id=course_id).values_list('user_id', 'mode')
+        )
+        verified_mode_user_ids = [
+            user_id for user_id, mode in enrollment_modes.iteritems() if mode == GeneratedCertificate.MODES.verified
+        ]
+        verified_user_ids = (
+            SoftwareSecurePhotoVerification.verified_user_ids(verified_mode_user_ids)
+            if verified_mode_user_ids else set()
+        )
 
+        results = []
+        students_to_grade = []
+        for student in students:
+            cert_status = cert_statuses.get(student.id, status.unavailable)
+            if self._can_add_cert(student, course_id, cert_status):
+                students_to_grade.append(student)
+            else:
+                results.append((student, cert_status, None))
+
+        pending_submissions = []
+        pool = ThreadPool(XQUEUE_SUBMISSION_THREADS)
+        try:
+            for student, grade, err_msg in grades.iterate_grades_for(course, students_to_grade):
+                if err_msg:
+                    results.append((student, cert_statuses.get(student.id, status.unavailable), None))
+                    continue
+
+                profile_name, allow_certificate = profiles.get(student.id, (u'', True))
+                new_status, cert, submission = self._create_cert(
+                    student, course_id, course, grade, profile_name,
+                    student.id in whitelisted_user_ids,
+                    enrollment_modes.get(student.id),
+                    student.id in verified_user_ids,
+                    lambda allow_certificate=allow_certificate: not allow_certificate,
+                    generate_pdf=generate_pdf
+                )
+                if submission is not None:
+                    pending_submissions.append(
+                        (len(results), pool.apply_async(self._try_send_to_xqueue, submission))
+                    )
+                results.append((student, new_status, cert))
+        finally:
+            pool.close()
+            pool.join()
+
+        for index, pending_submission in pending_submissions:
+            student, new_status, cert = results[index]
+            exc = pending_submission.get()
+            if exc is not None:
+                results[index] = (student, self._set_submission_error(cert, exc), cert)
+            else:
+                self._log_submission(cert)
+
+        return results
+
+    def _can_add_cert(self, student, course_id, cert_status):
+        """
+        Returns whether a certificate can be requested for a student whose
+        certificate status is `cert_status`, logging a warning if not.
+        """
         valid_statuses = [
             status.generating,
             status.unavailable,
@@ -222,10 +355,6 @@ class XQueueCertInterface(object):
             status.downloadable
         ]
 
-        cert_status = certificate_status_for_student(student, course_id)['status']
-        new_status = cert_status
-        cert = None
-
         if cert_status not in valid_statuses:
             LOGGER.warning(
                 (
@@ -238,164 +367,173 @@ class XQueueCertInterface(object):
                 cert_status,
                 unicode(valid_statuses)
             )
+            return False
+        return True
+
+    # pylint: disable=too-many-statements
+    def _create_cert(self, student, course_id, course, grade, profile_name, is_whitelisted, enrollment_mode,
+                     user_is_verified, is_restricted, forced_grade=None, template_file=None, generate_pdf=True):
+        """
+        Creates or updates the certificate of a graded student, as described
+        in `add_cert`.
+
+        `is_restricted` is a function returning whether the student is on the
+        embargoed country restricted list, which is only called for students
+        who can get a certificate.
+
+        Returns the student's new status, the certificate instance and, if a
+        task must be sent to the XQueue to generate the certificate, the
+        (contents, key) arguments of `_send_to_xqueue`, else None.
+        """
+        new_status = None
+        submission = None
+        course_name = course.display_name or unicode(course_id)
+        mode_is_verified = (enrollment_mode == GeneratedCertificate.MODES.verified)
+        cert_mode = enrollment_mode
+        if mode_is_verified and user_is_verified:
+            template_pdf = "certificate-template-{id.org}-{id.course}-verified.pdf".format(id=course_id)
+        elif mode_is_verified and not user_is_verified:
+            template_pdf = "certificate-template-{id.org}-{id.course}.pdf".format(id=course_id)
+            cert_mode = GeneratedCertificate.MODES.honor
         else:
-            # grade the student
-
-            # re-use the course passed in optionally so we don't have to re-fetch everything
-            # for every student
-            if course is None:
-                course = modulestore().get_course(course_id, depth=0)
-            profile = UserProfile.objects.get(user=student)
-            profile_name = profile.name
-
-            # Needed
-            self.request.user = student
-            self.request.session = {}
-
-            course_name = course.display_name or unicode(course_id)
-            is_whitelisted = self.whitelist.filter(user=student, course_id=course_id, whitelist=True).exists()
-            grade = grades.grade(student, self.request, course)
-            enrollment_mode, __ = CourseEnrollment.enrollment_mode_for_user(student, course_id)
-            mode_is_verified = (enrollment_mode == GeneratedCertificate.MODES.verified)
-            user_is_verified = SoftwareSecurePhotoVerification.user_is_verified(student)
-            cert_mode = enrollment_mode
-            if mode_is_verified and user_is_verified:
-                template_pdf = "certificate-template-{id.org}-{id.course}-verified.pdf".format(id=course_id)
-            elif mode_is_verified and not user_is_verified:
-                template_pdf = "certificate-template-{id.org}-{id.course}.pdf".format(id=course_id)
-                cert_mode = GeneratedCertificate.MODES.honor
-            else:
-                # honor code and audit students
-                template_pdf = "certificate-template-{id.org}-{id.course}.pdf".format(id=course_id)
-            if forced_grade:
-                grade['grade'] = forced_grade
-
-            cert, __ = GeneratedCertificate.objects.get_or_create(user=student, course_id=course_id)
-
-            cert.mode = cert_mode
-            cert.user = student
-            cert.grade = grade['percent']
-            cert.course_id = course_id
-            cert.name = profile_name
-            cert.download_url = ''
-            # Strip HTML from grade range label
-            grade_contents = grade.get('grade', None)
-            try:
-                grade_contents = lxml.html.fromstring(grade_contents).text_content()
-            except (TypeError, XMLSyntaxError, ParserError) as exc:
+            # honor code and audit students
+            template_pdf = "certificate-template-{id.org}-{id.course}.pdf".format(id=course_id)
+        if forced_grade:
+            grade['grade'] = forced_grade
+
+        cert, __ = GeneratedCertificate.objects.get_or_create(user=student, course_id=course_id)
+
+        cert.mode = cert_mode
+        cert.user = student
+        cert.grade = grade['percent']
+        cert.course_id = course_id
+        cert.name = profile_name
+        cert.download_url = ''
+        # Strip HTML from grade range label
+        grade_contents = grade.get('grade', None)
+        try:
+            grade_contents = lxml.html.fromstring(grade_contents).text_content()
+        except (TypeError, XMLSyntaxError, ParserError) as exc:
+            LOGGER.info(
+                (
+                    u"Could not retrieve grade for student %s "
+                    u"in the course '%s' "
+                    u"because an exception occurred while parsing the "
+                    u"grade contents '%s' as HTML. "
+                    u"The exception was: '%s'"
+                ),
+                student.id,
+                unicode(course_id),
+                grade_contents,
+                unicode(exc)
+            )
+
+            #   Despite blowing up the xml parser, bad values here are fine
+            grade_contents = None
+
+        if is_whitelisted or grade_contents is not None:
+
+            if is_whitelisted:
                 LOGGER.info(
-                    (
-                        u"Could not retrieve grade for student %s "
-                        u"in the course '%s' "
-                        u"because an exception occurred while parsing the "
-                        u"grade contents '%s' as HTML. "
-                        u"The exception was: '%s'"
-                    ),
+                    u"Student %s is whitelisted in '%s'",
                     student.id,
-                    unicode(course_id),
-                    grade_contents,
-                    unicode(exc)
+                    unicode(course_id)
                 )
 
-                #   Despite blowing up the xml parser, bad values here are fine
-                grade_contents = None
-
-            if is_whitelisted or grade_contents is not None:
+            # check to see whether the student is on the
+            # the embargoed country restricted list
+            # otherwise, put a new certificate request
+            # on the queue
 
-                if is_whitelisted:
-                    LOGGER.info(
-                        u"Student %s is whitelisted in '%s'",
-                        student.id,
-                        unicode(course_id)
-                    )
-
-                # check to see whether the student is on the
-                # the embargoed country restricted list
-                # otherwise, put a new certificate request
-                # on the queue
-
-                if self.restricted.filter(user=student).exists():
-                    new_status = status.restricted
-                    cert.status = new_status
-                    cert.save()
-
-                    LOGGER.info(
-                        (
-                            u"Student %s is in the embargoed country restricted "
-                            u"list, so their certificate status has been set to '%s' "
-                            u"for the course '%s'. "
-                            u"No certificate generation task was sent to the XQueue."
-                        ),
-                        student.id,
-                        new_status,
-                        unicode(course_id)
-                    )
-                else:
-                    key = make_hashkey(random.random())
-                    cert.key = key
-                    contents = {
-                        'action': 'create',
-                        'username': student.username,
-                        'course_id': unicode(course_id),
-                        'course_name': course_name,
-                        'name': profile_name,
-                        'grade': grade_contents,
-                        'template_pdf': template_pdf,
-                    }
-                    if template_file:
-                        contents['template_pdf'] = template_file
-                    if generate_pdf:
-                        new_status = status.generating
-                    else:
-                        new_status = status.downloadable
-                        cert.verify_uuid = uuid4().hex
-
-                    cert.status = new_status
-                    cert.save()
-
-                    if generate_pdf:
-                        try:
-                            self._send_to_xqueue(contents, key)
-                        except XQueueAddToQueueError as exc:
-                            new_status = ExampleCertificate.STATUS_ERROR
-                            cert.status = new_status
-                            cert.error_reason = unicode(exc)
-                            cert.save()
-                            LOGGER.critical(
-                                (
-                                    u"Could not add certificate task to XQueue.  "
-                                    u"The course was '%s' and the student was '%s'."
-                                    u"The certificate task status has been marked as 'error' "
-                                    u"and can be re-submitted with a management command."
-                                ), course_id, student.id
-                            )
-                        else:
-                            LOGGER.info(
-                                (
-                                    u"The certificate status has been set to '%s'.  "
-                                    u"Sent a certificate grading task to the XQueue "
-                                    u"with the key '%s'. "
-                                ),
-                                new_status,
-                                key
-                            )
-            else:
-                new_status = status.notpassing
+            if is_restricted():
+                new_status = status.restricted
                 cert.status = new_status
                 cert.save()
 
                 LOGGER.info(
                     (
-                        u"Student %s does not have a grade for '%s', "
-                        u"so their certificate status has been set to '%s'. "
+                        u"Student %s is in the embargoed country restricted "
+                        u"list, so their certificate status has been set to '%s' "
+                        u"for the course '%s'. "
                         u"No certificate generation task was sent to the XQueue."
                     ),
                     student.id,
-                    unicode(course_id),
-                    new_status
+                    new_status,
+                    unicode(course_id)
                 )
+            else:
+                key = make_hashkey(random.random())
+                cert.key = key
+                contents = {
+                    'action': 'create',
+                    'username': student.username,
+                    'course_id': unicode(course_id),
+                    'course_name': course_name,
+                    'name': profile_name,
+                    'grade': grade_contents,
+                    'template_pdf': template_pdf,
+                }
+                if template_file:
+                    contents['template_pdf'] = template_file
+                if generate_pdf:
+                    new_status = status.generating
+                    submission = (contents, key)
+                else:
+                    new_status = status.downloadable
+                    cert.verify_uuid = uuid4().hex
 
-        return new_status, cert
+                cert.status = new_status
+                cert.save()
+        else:
+            new_status = status.notpassing
+            cert.status = new_status
+            cert.save()
+
+            LOGGER.info(
+                (
+                    u"Student %s does not have a grade for '%s', "
+                    u"so their certificate status has been set to '%s'. "
+                    u"No certificate generation task was sent to the XQueue."
+                ),
+                student.id,
+                unicode(course_id),
+                new_status
+            )
+
+        return new_status, cert, submission
+
+    def _set_submission_error(self, cert, exc):
+        """
+        Marks a certificate whose generation task could not be sent to the
+        XQueue as in error, and returns its new status.
+        """
+        new_status = ExampleCertificate.STATUS_ERROR
+        cert.status = new_status
+        cert.error_reason = unicode(exc)
+        cert.save()
+        LOGGER.critical(
+            (
+                u"Could not add certificate task to XQueue.  "
+                u"The course was '%s' and the student was '%s'."
+                u"The certificate task status has been marked as 'error' "
+                u"and can be re-submitted with a management command."
+            ), cert.course_id, cert.user.id
+        )
+        return new_status
+
+    def _log_submission(self, cert):
+        """
+        Logs that the generation task of a certificate was sent to the XQueue.
+        """
+        LOGGER.info(
+            (
+                u"The certificate status has been set to '%s'.  "
+                u"Sent a certificate grading task to the XQueue "
+                u"with the key '%s'. "
+            ),
+            cert.status,
+            cert.key
+        )
 
     def add_example_cert(self, example_cert):
         """Add a task to create an example certificate.
@@ -508,3 +646,15 @@ class XQueueCertInterface(object):
             exc = XQueueAddToQueueError(error, msg)
             LOGGER.critical(unicode(exc))
             raise exc
+
+    def _try_send_to_xqueue(self, contents, key):
+        """
+        Create a new task on the XQueue as `_send_to_xqueue` does, but return
+        the XQueueAddToQueueError instead of raising it, or None if the task was
+        created.  This is safe to call from several threads at once.
+        """
+        try:
+            self._send_to_xqueue(contents, key)
+        except XQueueAddToQueueError as exc:
+            return exc
+        return None
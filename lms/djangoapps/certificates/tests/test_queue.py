@@ -73,6 +73,26 @@ class XQueueCertInterfaceAddCertificateTest(ModuleStoreTestCase):
         self.assertEqual(certificate.status, CertificateStatuses.downloadable)
         self.assertIsNotNone(certificate.verify_uuid)
 
+    def test_add_certs(self):
+        """
+        Tests certificates are requested for several students at once, with
+        the same results as requesting them one by one.
+        """
+        other_user = UserFactory.create()
+        CourseEnrollmentFactory(user=other_user, course_id=self.course.id, is_active=True, mode="honor")
+        with patch('courseware.grades.grade', Mock(return_value={'grade': 'Pass', 'percent': 0.75})):
+            with patch.object(XQueueInterface, 'send_to_queue') as mock_send:
+                mock_send.return_value = (0, None)
+                results = self.xqueue.add_certs([self.user, other_user], self.course.id, self.course)
+
+        self.assertEqual(mock_send.call_count, 2)
+        self.assertEqual(
+            [(student, status) for student, status, __ in results],
+            [(self.user, CertificateStatuses.generating), (other_user, CertificateStatuses.generating)]
+        )
+        for student, __, certificate in results:
+            self.assertEqual(certificate, GeneratedCertificate.objects.get(user=student, course_id=self.course.id))
+
 
 @attr('shard_1')
 @override_settings(CERT_QUEUE='certificates')
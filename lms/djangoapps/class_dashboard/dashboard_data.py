@@ -1,11 +1,14 @@
 """
 Computes the data to display on the Instructor Dashboard
+
+The grade and subsection open distributions are read from the rollups
+maintained by `class_dashboard.rollups`.
 """
 from util.json_request import JsonResponse
 import json
 
 from courseware import models
-from django.db.models import Count
+from class_dashboard.models import ProblemGradeRollup, SequentialOpenRollup
 from django.utils.translation import ugettext as _
 
 from xmodule.modulestore.django import modulestore
@@ -32,12 +35,11 @@ def get_problem_grade_distribution(course_id):
         attempting the problem
     """
 
-    # Aggregate query on studentmodule table for grade data for all problems in course
-    db_query = models.StudentModule.objects.filter(
+    # Grade counts of all problems in course, from the rollups
+    db_query = ProblemGradeRollup.objects.filter(
         course_id__exact=course_id,
-        grade__isnull=False,
-        module_type__exact="problem",
-    ).values('module_state_key', 'grade', 'max_grade').annotate(count_grade=Count('grade'))
+        count__gt=0,
+    ).values('module_state_key', 'grade', 'max_grade', 'count')
 
     prob_grade_distrib = {}
     total_student_count = {}
@@ -48,7 +50,7 @@ def get_problem_grade_distribution(course_id):
 
         # Build set of grade distributions for each problem that has student responses
         if curr_problem in prob_grade_distrib:
-            prob_grade_distrib[curr_problem]['grade_distrib'].append((row['grade'], row['count_grade']))
+            prob_grade_distrib[curr_problem]['grade_distrib'].append((row['grade'], row['count']))
 
             if (prob_grade_distrib[curr_problem]['max_grade'] != row['max_grade']) and \
                     (prob_grade_distrib[curr_problem]['max_grade'] < row['max_grade']):
@@ -57,11 +59,11 @@ def get_problem_grade_distribution(course_id):
         else:
             prob_grade_distrib[curr_problem] = {
                 'max_grade': row['max_grade'],
-                'grade_distrib': [(row['grade'], row['count_grade'])]
+                'grade_distrib': [(row['grade'], row['count'])]
             }
 
         # Build set of total students attempting each problem
-        total_student_count[curr_problem] = total_student_count.get(curr_problem, 0) + row['count_grade']
+        total_student_count[curr_problem] = total_student_count.get(curr_problem, 0) + row['count']
 
     return prob_grade_distrib, total_student_count
 
@@ -75,17 +77,17 @@ def get_sequential_open_distrib(course_id):
     Outputs a dict mapping the 'module_id' to the number of students that have opened that subsection/sequential.
     """
 
-    # Aggregate query on studentmodule table for "opening a subsection" data
-    db_query = models.StudentModule.objects.filter(
+    # "Opening a subsection" counts, from the rollups
+    db_query = SequentialOpenRollup.objects.filter(
         course_id__exact=course_id,
-        module_type__exact="sequential",
-    ).values('module_state_key').annotate(count_sequential=Count('module_state_key'))
+        count__gt=0,
+    ).values('module_state_key', 'count')
 
     # Build set of "opened" data for each subsection that has "opened" data
     sequential_open_distrib = {}
     for row in db_query:
         row_loc = course_id.make_usage_key_from_deprecated_string(row['module_state_key'])
-        sequential_open_distrib[row_loc] = row['count_sequential']
+        sequential_open_distrib[row_loc] = row['count']
 
     return sequential_open_distrib
 
@@ -98,24 +100,24 @@ def get_problem_set_grade_distrib(course_id, problem_set):
 
     `problem_set` an array of UsageKeys representing problem module_id's.
 
-    Requests from the database the a count of each grade for each problem in the `problem_set`.
+    Requests from the rollups the count of each grade for each problem in the `problem_set`.
 
     Returns a dict, where the key is the problem 'module_id' and the value is a dict with two parts:
       'max_grade' - the maximum grade possible for the course
       'grade_distrib' - array of tuples (`grade`,`count`) ordered by `grade`
     """
 
-    # Aggregate query on studentmodule table for grade data for set of problems in course
-    db_query = models.StudentModule.objects.filter(
+    # Grade counts of the set of problems in course, from the rollups
+    db_query = ProblemGradeRollup.objects.filter(
         course_id__exact=course_id,
-        grade__isnull=False,
-        module_type__exact="problem",
         module_state_key__in=problem_set,
+        count__gt=0,
     ).values(
         'module_state_key',
         'grade',
         'max_grade',
-    ).annotate(count_grade=Count('grade')).order_by('module_state_key', 'grade')
+        'count',
+    ).order_by('module_state_key', 'grade')
 
     prob_grade_distrib = {}
 
@@ -129,7 +131,7 @@ def get_problem_set_grade_distrib(course_id, problem_set):
             }
 
         curr_grade_distrib = prob_grade_distrib[row_loc]
-        curr_grade_distrib['grade_distrib'].append((row['grade'], row['count_grade']))
+        curr_grade_distrib['grade_distrib'].append((row['grade'], row['count']))
 
         if curr_grade_distrib['max_grade'] < row['max_grade']:
             curr_grade_distrib['max_grade'] = row['max_grade']
@@ -152,7 +154,7 @@ def get_d3_problem_grade_distrib(course_id):
     d3_data = []
 
     # Retrieve course object down to problems
-    course = modulestore().get_course(course_id, depth=4)
+    course = modulestore().get_course(course_id, depth=4, lazy=True)
 
     # Iterate through sections, subsections, units, problems
     for section in course.get_children():
@@ -244,7 +246,7 @@ def get_d3_sequential_open_distrib(course_id):
     d3_data = []
 
     # Retrieve course object down to subsection
-    course = modulestore().get_course(course_id, depth=2)
+    course = modulestore().get_course(course_id, depth=2, lazy=True)
 
     # Iterate through sections, subsections
     for section in course.get_children():
@@ -314,7 +316,7 @@ def get_d3_section_grade_distrib(course_id, section):
     """
 
     # Retrieve course object down to problems
-    course = modulestore().get_course(course_id, depth=4)
+    course = modulestore().get_course(course_id, depth=4, lazy=True)
 
     problem_set = []
     problem_info = {}
@@ -385,7 +387,7 @@ def get_section_display_name(course_id):
     The ith string in the array is the display name of the ith section in the course.
     """
 
-    course = modulestore().get_course(course_id, depth=4)
+    course = modulestore().get_course(course_id, depth=4, lazy=True)
 
     section_display_name = [""] * len(course.get_children())
     i = 0
@@ -405,7 +407,7 @@ def get_array_section_has_problem(course_id):
     The ith value in the array is true if the ith section in the course contains problems and false otherwise.
     """
 
-    course = modulestore().get_course(course_id, depth=4)
+    course = modulestore().get_course(course_id, depth=4, lazy=True)
 
     b_section_has_problem = [False] * len(course.get_children())
     i = 0
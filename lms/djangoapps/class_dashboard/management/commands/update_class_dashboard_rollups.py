@@ -0,0 +1,69 @@
+"""Management command for updating the rollups read by the Metrics tab of the
+Instructor Dashboard.
+
+Meant to be run periodically, so that the dashboard has little to catch up
+on when it is viewed.
+
+Example usage:
+
+    # Update the rollups of *all* courses
+    $ ./manage.py lms update_class_dashboard_rollups
+
+    # Recount everything for particular courses
+    $ ./manage.py lms update_class_dashboard_rollups -c edX/DemoX/Fall_2015 --rebuild
+
+"""
+import logging
+from optparse import make_option
+from django.core.management.base import BaseCommand, CommandError
+
+from xmodule.modulestore.django import modulestore
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+from class_dashboard.rollups import update_course_rollups
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Update the class dashboard rollups. """
+
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '-c', '--course',
+            metavar='COURSE_KEY',
+            dest='course_key_list',
+            action='append',
+            default=[],
+            help='Only update the rollups of these courses.'
+        ),
+        make_option(
+            '--rebuild',
+            action='store_true',
+            dest='rebuild',
+            default=False,
+            help='Recount every problem and subsection instead of only the modified ones.'
+        ),
+    )
+
+    def handle(self, *args, **options):
+        course_keys = []
+        for course_key_str in options.get('course_key_list', []):
+            try:
+                course_keys.append(CourseKey.from_string(course_key_str))
+            except InvalidKeyError:
+                raise CommandError(
+                    '"{course_key_str}" is not a valid course key.'.format(
+                        course_key_str=course_key_str
+                    )
+                )
+
+        if not course_keys:
+            course_keys = [course.id for course in modulestore().get_courses()]
+
+        for course_key in course_keys:
+            try:
+                update_course_rollups(course_key, rebuild=options['rebuild'])
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception(u"Could not update the class dashboard rollups of course %s", course_key)
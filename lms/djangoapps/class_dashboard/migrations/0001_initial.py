@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        # Adding model 'ProblemGradeRollup'
+        db.create_table('class_dashboard_problemgraderollup', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('course_id', self.gf('xmodule_django.models.CourseKeyField')(max_length=255, db_index=True)),
+            ('module_state_key', self.gf('xmodule_django.models.LocationKeyField')(max_length=255, db_column='module_id', db_index=True)),
+            ('grade', self.gf('django.db.models.fields.FloatField')()),
+            ('max_grade', self.gf('django.db.models.fields.FloatField')(null=True, blank=True)),
+            ('count', self.gf('django.db.models.fields.IntegerField')(default=0)),
+        ))
+        db.send_create_signal('class_dashboard', ['ProblemGradeRollup'])
+
+        # Adding model 'SequentialOpenRollup'
+        db.create_table('class_dashboard_sequentialopenrollup', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('course_id', self.gf('xmodule_django.models.CourseKeyField')(max_length=255, db_index=True)),
+            ('module_state_key', self.gf('xmodule_django.models.LocationKeyField')(max_length=255, db_column='module_id', db_index=True)),
+            ('count', self.gf('django.db.models.fields.IntegerField')(default=0)),
+        ))
+        db.send_create_signal('class_dashboard', ['SequentialOpenRollup'])
+
+        # Adding unique constraint on 'SequentialOpenRollup', fields ['course_id', 'module_state_key']
+        db.create_unique('class_dashboard_sequentialopenrollup', ['course_id', 'module_id'])
+
+        # Adding model 'CourseRollupStatus'
+        db.create_table('class_dashboard_courserollupstatus', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('course_id', self.gf('xmodule_django.models.CourseKeyField')(unique=True, max_length=255)),
+            ('updated_through', self.gf('django.db.models.fields.DateTimeField')(null=True, blank=True)),
+            ('modified', self.gf('django.db.models.fields.DateTimeField')(auto_now=True, blank=True)),
+        ))
+        db.send_create_signal('class_dashboard', ['CourseRollupStatus'])
+
+
+    def backwards(self, orm):
+        # Removing unique constraint on 'SequentialOpenRollup', fields ['course_id', 'module_state_key']
+        db.delete_unique('class_dashboard_sequentialopenrollup', ['course_id', 'module_id'])
+
+        # Deleting model 'ProblemGradeRollup'
+        db.delete_table('class_dashboard_problemgraderollup')
+
+        # Deleting model 'SequentialOpenRollup'
+        db.delete_table('class_dashboard_sequentialopenrollup')
+
+        # Deleting model 'CourseRollupStatus'
+        db.delete_table('class_dashboard_courserollupstatus')
+
+
+    models = {
+        'class_dashboard.courserollupstatus': {
+            'Meta': {'object_name': 'CourseRollupStatus'},
+            'course_id': ('xmodule_django.models.CourseKeyField', [], {'unique': 'True', 'max_length': '255'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'updated_through': ('django.db.models.fields.DateTimeField', [], {'null': 'True', 'blank': 'True'})
+        },
+        'class_dashboard.problemgraderollup': {
+            'Meta': {'object_name': 'ProblemGradeRollup'},
+            'count': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'course_id': ('xmodule_django.models.CourseKeyField', [], {'max_length': '255', 'db_index': 'True'}),
+            'grade': ('django.db.models.fields.FloatField', [], {}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'max_grade': ('django.db.models.fields.FloatField', [], {'null': 'True', 'blank': 'True'}),
+            'module_state_key': ('xmodule_django.models.LocationKeyField', [], {'max_length': '255', 'db_column': "'module_id'", 'db_index': 'True'})
+        },
+        'class_dashboard.sequentialopenrollup': {
+            'Meta': {'unique_together': "(('course_id', 'module_state_key'),)", 'object_name': 'SequentialOpenRollup'},
+            'count': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'course_id': ('xmodule_django.models.CourseKeyField', [], {'max_length': '255', 'db_index': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'module_state_key': ('xmodule_django.models.LocationKeyField', [], {'max_length': '255', 'db_column': "'module_id'", 'db_index': 'True'})
+        }
+    }
+
+    complete_apps = ['class_dashboard']
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        # Adding unique constraint on 'ProblemGradeRollup', fields ['course_id', 'module_state_key', 'grade', 'max_grade']
+        db.create_unique('class_dashboard_problemgraderollup', ['course_id', 'module_id', 'grade', 'max_grade'])
+
+
+    def backwards(self, orm):
+        # Removing unique constraint on 'ProblemGradeRollup', fields ['course_id', 'module_state_key', 'grade', 'max_grade']
+        db.delete_unique('class_dashboard_problemgraderollup', ['course_id', 'module_id', 'grade', 'max_grade'])
+
+
+    models = {
+        'class_dashboard.courserollupstatus': {
+            'Meta': {'object_name': 'CourseRollupStatus'},
+            'course_id': ('xmodule_django.models.CourseKeyField', [], {'unique': 'True', 'max_length': '255'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'updated_through': ('django.db.models.fields.DateTimeField', [], {'null': 'True', 'blank': 'True'})
+        },
+        'class_dashboard.problemgraderollup': {
+            'Meta': {'unique_together': "(('course_id', 'module_state_key', 'grade', 'max_grade'),)", 'object_name': 'ProblemGradeRollup'},
+            'count': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'course_id': ('xmodule_django.models.CourseKeyField', [], {'max_length': '255', 'db_index': 'True'}),
+            'grade': ('django.db.models.fields.FloatField', [], {}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'max_grade': ('django.db.models.fields.FloatField', [], {'null': 'True', 'blank': 'True'}),
+            'module_state_key': ('xmodule_django.models.LocationKeyField', [], {'max_length': '255', 'db_column': "'module_id'", 'db_index': 'True'})
+        },
+        'class_dashboard.sequentialopenrollup': {
+            'Meta': {'unique_together': "(('course_id', 'module_state_key'),)", 'object_name': 'SequentialOpenRollup'},
+            'count': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'course_id': ('xmodule_django.models.CourseKeyField', [], {'max_length': '255', 'db_index': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'module_state_key': ('xmodule_django.models.LocationKeyField', [], {'max_length': '255', 'db_column': "'module_id'", 'db_index': 'True'})
+        }
+    }
+
+    complete_apps = ['class_dashboard']
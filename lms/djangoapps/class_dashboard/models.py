@@ -0,0 +1,86 @@
+"""
+Rollups of the student data displayed on the Metrics tab of the Instructor
+Dashboard.
+
+The dashboard reads these tables instead of aggregating `StudentModule` on
+every page load.  They are brought up to date by `class_dashboard.rollups`.
+
+WE'RE USING MIGRATIONS!
+
+If you make changes to this model, be sure to create an appropriate migration
+file and check it in at the same time as your model changes. To do that,
+
+1. Go to the edx-platform dir
+2. ./manage.py schemamigration class_dashboard --auto description_of_your_change
+3. Add the migration file created in edx-platform/lms/djangoapps/class_dashboard/migrations/
+"""
+from django.db import models
+from django.db.models import F
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from courseware.models import StudentModule
+from xmodule_django.models import CourseKeyField, LocationKeyField
+
+
+class ProblemGradeRollup(models.Model):
+    """
+    Number of students of a course with a given grade on a problem.
+    """
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    module_state_key = LocationKeyField(max_length=255, db_index=True, db_column='module_id')
+    grade = models.FloatField()
+    max_grade = models.FloatField(null=True, blank=True)
+    count = models.IntegerField(default=0)
+
+    class Meta(object):  # pylint: disable=missing-docstring
+        unique_together = (('course_id', 'module_state_key', 'grade', 'max_grade'),)
+
+
+class SequentialOpenRollup(models.Model):
+    """
+    Number of students of a course who opened a subsection.
+    """
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    module_state_key = LocationKeyField(max_length=255, db_index=True, db_column='module_id')
+    count = models.IntegerField(default=0)
+
+    class Meta(object):  # pylint: disable=missing-docstring
+        unique_together = (('course_id', 'module_state_key'),)
+
+
+class CourseRollupStatus(models.Model):
+    """
+    How far the rollups of a course have been brought up to date.
+    """
+    course_id = CourseKeyField(max_length=255, unique=True)
+
+    # The rollups include every change to the course's StudentModules
+    # modified before this time.  None if they were never computed.
+    updated_through = models.DateTimeField(null=True, blank=True)
+
+    modified = models.DateTimeField(auto_now=True)
+
+
+@receiver(post_delete, sender=StudentModule)
+def remove_deleted_module_from_rollups(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Removes the deleted StudentModule from the counts of the rollups.
+
+    Deleted rows never show up among the modified StudentModules that the
+    rollup updates look for, so they are subtracted here.
+    """
+    if instance.module_type == 'problem' and instance.grade is not None:
+        ProblemGradeRollup.objects.filter(
+            course_id=instance.course_id,
+            module_state_key=instance.module_state_key,
+            grade=instance.grade,
+            max_grade=instance.max_grade,
+            count__gt=0,
+        ).update(count=F('count') - 1)
+    elif instance.module_type == 'sequential':
+        SequentialOpenRollup.objects.filter(
+            course_id=instance.course_id,
+            module_state_key=instance.module_state_key,
+            count__gt=0,
+        ).update(count=F('count') - 1)
@@ -0,0 +1,127 @@
+"""
+Maintains the rollups read by the Metrics tab of the Instructor Dashboard.
+
+Rollups are updated incrementally: each update only recounts the problems
+and subsections whose `StudentModule`s were modified since the previous
+update of the course, which the `modified` index makes cheap to find.
+Deleted StudentModules are subtracted from the rollups as they are deleted
+(see `class_dashboard.models`).
+
+Updates run in the `class_dashboard.tasks.update_course_rollups` celery
+task, which the dashboard schedules when the rollups of a course are older
+than ROLLUP_MAX_AGE, and in the `update_class_dashboard_rollups` management
+command, which can backfill the rollups of every course.  The first view of
+the dashboard of a course whose rollups were never computed builds them
+before reading them.
+"""
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from courseware.models import StudentModule, chunks
+from class_dashboard.models import ProblemGradeRollup, SequentialOpenRollup, CourseRollupStatus
+
+log = logging.getLogger(__name__)
+
+# Age after which viewing the dashboard schedules an update of the rollups.
+ROLLUP_MAX_AGE = timedelta(minutes=5)
+
+# StudentModules modified this long before the previous update are looked at
+# again, so that rows committed by transactions still open during the
+# previous update are not missed.  Recounting a module is idempotent.
+ROLLUP_UPDATE_OVERLAP = timedelta(minutes=5)
+
+# Number of modules recounted per query.
+ROLLUP_UPDATE_CHUNK_SIZE = 500
+
+
+def update_course_rollups(course_key, rebuild=False):
+    """
+    Brings the rollups of the course up to date with its StudentModules.
+
+    If `rebuild` is True, or the rollups of the course were never computed,
+    every problem and subsection of the course is recounted.
+    """
+    status, __ = CourseRollupStatus.objects.get_or_create(course_id=course_key)
+    start_time = timezone.now()
+
+    modified_modules = StudentModule.objects.filter(
+        course_id=course_key,
+        module_type__in=['problem', 'sequential'],
+    )
+    if status.updated_through is not None and not rebuild:
+        modified_modules = modified_modules.filter(modified__gte=status.updated_through - ROLLUP_UPDATE_OVERLAP)
+
+    problem_keys = set()
+    sequential_keys = set()
+    for module_type, module_id in modified_modules.values_list('module_type', 'module_state_key').distinct():
+        module_state_key = course_key.make_usage_key_from_deprecated_string(module_id)
+        if module_type == 'problem':
+            problem_keys.add(module_state_key)
+        else:
+            sequential_keys.add(module_state_key)
+
+    with transaction.commit_on_success():
+        if rebuild:
+            ProblemGradeRollup.objects.filter(course_id=course_key).delete()
+            SequentialOpenRollup.objects.filter(course_id=course_key).delete()
+        for problem_keys_chunk in chunks(problem_keys, ROLLUP_UPDATE_CHUNK_SIZE):
+            _recount_problem_grades(course_key, problem_keys_chunk)
+        for sequential_keys_chunk in chunks(sequential_keys, ROLLUP_UPDATE_CHUNK_SIZE):
+            _recount_sequential_opens(course_key, sequential_keys_chunk)
+
+        status.updated_through = start_time
+        status.save()
+
+    log.info(
+        u"Updated class dashboard rollups of %d problems and %d subsections of course %s",
+        len(problem_keys), len(sequential_keys), course_key
+    )
+
+
+def _recount_problem_grades(course_key, problem_keys):
+    """
+    Replaces the grade rollups of the given problems by a fresh count.
+    """
+    rows = StudentModule.objects.filter(
+        course_id=course_key,
+        module_type='problem',
+        module_state_key__in=problem_keys,
+        grade__isnull=False,
+    ).values('module_state_key', 'grade', 'max_grade').annotate(count_grade=Count('grade'))
+
+    ProblemGradeRollup.objects.filter(course_id=course_key, module_state_key__in=problem_keys).delete()
+    ProblemGradeRollup.objects.bulk_create([
+        ProblemGradeRollup(
+            course_id=course_key,
+            module_state_key=course_key.make_usage_key_from_deprecated_string(row['module_state_key']),
+            grade=row['grade'],
+            max_grade=row['max_grade'],
+            count=row['count_grade'],
+        )
+        for row in rows
+    ])
+
+
+def _recount_sequential_opens(course_key, sequential_keys):
+    """
+    Replaces the open rollups of the given subsections by a fresh count.
+    """
+    rows = StudentModule.objects.filter(
+        course_id=course_key,
+        module_type='sequential',
+        module_state_key__in=sequential_keys,
+    ).values('module_state_key').annotate(count_sequential=Count('module_state_key'))
+
+    SequentialOpenRollup.objects.filter(course_id=course_key, module_state_key__in=sequential_keys).delete()
+    SequentialOpenRollup.objects.bulk_create([
+        SequentialOpenRollup(
+            course_id=course_key,
+            module_state_key=course_key.make_usage_key_from_deprecated_string(row['module_state_key']),
+            count=row['count_sequential'],
+        )
+        for row in rows
+    ])
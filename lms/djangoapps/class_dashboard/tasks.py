@@ -0,0 +1,44 @@
+"""
+Asynchronous updates of the class dashboard rollups.
+"""
+from celery.task import task
+from django.core.cache import cache
+from django.utils import timezone
+from opaque_keys.edx.keys import CourseKey
+
+from class_dashboard import rollups
+from class_dashboard.models import CourseRollupStatus
+
+
+@task()
+def update_course_rollups(course_id):
+    """
+    Brings the class dashboard rollups of the course up to date.
+    """
+    rollups.update_course_rollups(CourseKey.from_string(course_id))
+
+
+def schedule_rollup_update(course_key):
+    """
+    Schedules an update of the rollups of the course if they are older than
+    `rollups.ROLLUP_MAX_AGE`, unless one was scheduled within that time
+    already.
+
+    The rollups of a course which were never computed, such as the courses
+    which existed before the rollups, are built right away instead, so that
+    the dashboard doesn't show them empty.
+    """
+    updated_through = CourseRollupStatus.objects.filter(
+        course_id=course_key
+    ).values_list('updated_through', flat=True)[:1]
+    first_build = not updated_through or updated_through[0] is None
+    if not first_build and timezone.now() - updated_through[0] < rollups.ROLLUP_MAX_AGE:
+        return
+
+    scheduled_key = u"class_dashboard.rollup_update_scheduled.{}".format(course_key)
+    if cache.add(scheduled_key, True, int(rollups.ROLLUP_MAX_AGE.total_seconds())):
+        if first_build:
+            rollups.update_course_rollups(course_key)
+            cache.delete(scheduled_key)
+        else:
+            update_course_rollups.delay(unicode(course_key))
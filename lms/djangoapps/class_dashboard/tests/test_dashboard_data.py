@@ -22,6 +22,7 @@ from class_dashboard.dashboard_data import (
     get_section_display_name, get_array_section_has_problem,
     get_students_opened_subsection, get_students_problem_grades,
 )
+from class_dashboard.rollups import update_course_rollups
 from class_dashboard.views import has_instructor_access_for_class
 
 USER_COUNT = 11
@@ -99,6 +100,8 @@ class TestGetProblemGradeDistribution(SharedModuleStoreTestCase):
                     module_state_key=item.location,
                 )
 
+        update_course_rollups(self.course.id)
+
     def test_get_problem_grade_distribution(self):
 
         prob_grade_distrib, total_student_count = get_problem_grade_distribution(self.course.id)
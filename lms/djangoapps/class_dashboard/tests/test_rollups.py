@@ -0,0 +1,124 @@
+"""
+Tests for the class dashboard rollups.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from mock import patch
+from nose.plugins.attrib import attr
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
+
+from courseware.models import StudentModule
+from courseware.tests.factories import StudentModuleFactory
+
+from class_dashboard.dashboard_data import get_problem_grade_distribution, get_sequential_open_distrib
+from class_dashboard.models import CourseRollupStatus
+from class_dashboard.rollups import update_course_rollups
+from class_dashboard.tasks import schedule_rollup_update
+
+
+@attr('shard_1')
+class TestRollups(TestCase):
+    """
+    Tests of the incremental updates of the rollups.
+    """
+    def setUp(self):
+        super(TestRollups, self).setUp()
+        self.course_key = SlashSeparatedCourseKey('edX', 'rollups', '2015')
+        self.problem = self.course_key.make_usage_key('problem', 'p1')
+        self.sequential = self.course_key.make_usage_key('sequential', 's1')
+
+    def _create_problem_module(self, grade):
+        """
+        Creates the StudentModule of a student with `grade` on the problem.
+        """
+        return StudentModuleFactory.create(
+            course_id=self.course_key,
+            module_state_key=self.problem,
+            grade=grade,
+            max_grade=1,
+        )
+
+    def _grade_distrib(self):
+        """
+        Returns the grade distribution of the problem, sorted.
+        """
+        prob_grade_distrib, __ = get_problem_grade_distribution(self.course_key)
+        return sorted(prob_grade_distrib.get(self.problem, {}).get('grade_distrib', []))
+
+    def test_rollups_read_only_after_update(self):
+        self._create_problem_module(1)
+        self.assertEqual(self._grade_distrib(), [])
+
+        update_course_rollups(self.course_key)
+        self.assertEqual(self._grade_distrib(), [(1, 1)])
+
+    def test_update_recounts_modified_modules(self):
+        self._create_problem_module(1)
+        module = self._create_problem_module(0)
+        update_course_rollups(self.course_key)
+
+        module.grade = 1
+        module.save()
+        update_course_rollups(self.course_key)
+        self.assertEqual(self._grade_distrib(), [(1, 2)])
+
+    def test_update_skips_unmodified_modules(self):
+        module = self._create_problem_module(1)
+        update_course_rollups(self.course_key)
+
+        # Change the grade without touching `modified`, far in the past
+        past = timezone.now() - timedelta(days=1)
+        StudentModule.objects.filter(id=module.id).update(grade=0, modified=past)
+        update_course_rollups(self.course_key)
+        self.assertEqual(self._grade_distrib(), [(1, 1)])
+
+        update_course_rollups(self.course_key, rebuild=True)
+        self.assertEqual(self._grade_distrib(), [(0, 1)])
+
+    def test_deleted_modules_are_subtracted(self):
+        module = self._create_problem_module(1)
+        self._create_problem_module(1)
+        opened = StudentModuleFactory.create(
+            course_id=self.course_key,
+            module_type='sequential',
+            module_state_key=self.sequential,
+        )
+        update_course_rollups(self.course_key)
+        self.assertEqual(get_sequential_open_distrib(self.course_key), {self.sequential: 1})
+
+        module.delete()
+        opened.delete()
+        self.assertEqual(self._grade_distrib(), [(1, 1)])
+        self.assertEqual(get_sequential_open_distrib(self.course_key), {})
+
+    @patch('class_dashboard.tasks.update_course_rollups.delay')
+    def test_schedule_rollup_update(self, mock_delay):
+        cache.clear()
+        CourseRollupStatus.objects.create(
+            course_id=self.course_key, updated_through=timezone.now() - timedelta(hours=1)
+        )
+        schedule_rollup_update(self.course_key)
+        self.assertEqual(mock_delay.call_count, 1)
+
+        # Not scheduled twice while the first update is pending
+        schedule_rollup_update(self.course_key)
+        self.assertEqual(mock_delay.call_count, 1)
+
+        # Not scheduled while the rollups are recent
+        cache.clear()
+        CourseRollupStatus.objects.filter(course_id=self.course_key).update(updated_through=timezone.now())
+        schedule_rollup_update(self.course_key)
+        self.assertEqual(mock_delay.call_count, 1)
+
+    @patch('class_dashboard.tasks.update_course_rollups.delay')
+    def test_first_rollup_build(self, mock_delay):
+        cache.clear()
+        self._create_problem_module(1)
+        # The rollups of a course which existed before them are built right away
+        schedule_rollup_update(self.course_key)
+        self.assertFalse(mock_delay.called)
+        self.assertEqual(self._grade_distrib(), [(1, 1)])
+        self.assertIsNotNone(CourseRollupStatus.objects.get(course_id=self.course_key).updated_through)
@@ -11,6 +11,7 @@ from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from courseware.courses import get_course_with_access
 from courseware.access import has_access
 from class_dashboard import dashboard_data
+from class_dashboard.tasks import schedule_rollup_update
 
 
 log = logging.getLogger(__name__)
@@ -42,6 +43,7 @@ def all_sequential_open_distrib(request, course_id):
     course_key = SlashSeparatedCourseKey.from_deprecated_string(course_id)
     if has_instructor_access_for_class(request.user, course_key):
         try:
+            schedule_rollup_update(course_key)
             data = dashboard_data.get_d3_sequential_open_distrib(course_key)
         except Exception as ex:  # pylint: disable=broad-except
             log.error('Generating metrics failed with exception: %s', ex)
@@ -68,6 +70,7 @@ def all_problem_grade_distribution(request, course_id):
     course_key = SlashSeparatedCourseKey.from_deprecated_string(course_id)
     if has_instructor_access_for_class(request.user, course_key):
         try:
+            schedule_rollup_update(course_key)
             data = dashboard_data.get_d3_problem_grade_distrib(course_key)
         except Exception as ex:  # pylint: disable=broad-except
             log.error('Generating metrics failed with exception: %s', ex)
@@ -99,6 +102,7 @@ def section_problem_grade_distrib(request, course_id, section):
     course_key = SlashSeparatedCourseKey.from_deprecated_string(course_id)
     if has_instructor_access_for_class(request.user, course_key):
         try:
+            schedule_rollup_update(course_key)
             data = dashboard_data.get_d3_section_grade_distrib(course_key, section)
         except Exception as ex:  # pylint: disable=broad-except
             log.error('Generating metrics failed with exception: %s', ex)
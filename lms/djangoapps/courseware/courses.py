@@ -19,6 +19,7 @@ from xmodule.x_module import STUDENT_VIEW
 from microsite_configuration import microsite
 
 from courseware.access import has_access
+from courseware.fragment_cache import cache_fragment_html, fragment_cache_key, get_cached_fragment_html
 from courseware.model_data import FieldDataCache
 from courseware.module_render import get_module
 from lms.djangoapps.courseware.courseware_access_exception import CoursewareAccessException
@@ -285,6 +286,15 @@ def get_course_info_section(request, course, section_key):
     - updates
     - guest_updates
     """
+    usage_key = course.id.make_usage_key('course_info', section_key)
+    try:
+        cache_key = fragment_cache_key(request.user, course, modulestore().get_item(usage_key))
+    except ItemNotFoundError:
+        cache_key = None
+    html = get_cached_fragment_html(request, cache_key)
+    if html is not None:
+        return html
+
     info_module = get_course_info_section_module(request, course, section_key)
 
     html = ''
@@ -297,6 +307,8 @@ def get_course_info_section(request, course, section_key):
                 u"Error rendering course=%s, section_key=%s",
                 course, section_key
             )
+        else:
+            cache_fragment_html(request, cache_key, html)
 
     return html
 
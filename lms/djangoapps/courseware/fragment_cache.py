@@ -0,0 +1,93 @@
+"""
+A cache for the rendered html of course content whose output does not
+depend on the user viewing it, such as static tabs and course info sections.
+
+Cached html is keyed by the block's usage key and edit time, the edit
+version of its course, a version stamp of the course reset whenever it is
+published, and the language and static asset path used to render it.  The
+edit time of the block matters since static tabs and course info sections
+are not part of the course tree, whose edit version ignores them.
+
+Html is never cached or served from the cache for users with staff access,
+since they get extra debug markup, nor for blocks that personalize their
+content with %%USER_ID%%.  The request token of the xblock wrapper is
+replaced by the token of the request the html is served to.
+"""
+import hashlib
+
+from django.core.cache import cache
+from django.dispatch.dispatcher import receiver
+from django.utils.translation import get_language
+
+from courseware.access import has_access
+from openedx.core.lib.cache_utils import course_edit_version, course_publish_version, reset_course_publish_version
+from openedx.core.lib.xblock_utils import request_token
+from xmodule.modulestore.django import SignalHandler
+
+
+FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24  # 1 day
+
+USER_ID_PLACEHOLDER = '%%USER_ID%%'
+
+# Stands for the request token in cached html.
+REQUEST_TOKEN_PLACEHOLDER = u'%%FRAGMENT_CACHE_REQUEST_TOKEN%%'
+
+
+def fragment_cache_key(user, course, block):
+    """
+    Cache key of the html of `block` in `course`, or None if the html can't
+    be cached for `user`.
+    """
+    if USER_ID_PLACEHOLDER in (getattr(block, 'data', None) or '') or has_access(user, 'staff', course):
+        return None
+    edited_on = getattr(block, 'edited_on', None)
+    signature = u'{}|{}|{}|{}|{}|{}'.format(
+        block.location,
+        edited_on.isoformat() if edited_on else u'',
+        get_language(),
+        course.static_asset_path,
+        course_edit_version(course),
+        course_publish_version(course.id),
+    )
+    return u'courseware.fragment_cache.{}.{}'.format(
+        course.id, hashlib.md5(signature.encode('utf-8')).hexdigest()
+    )
+
+
+def invalidate_course_fragments(course_key):
+    """
+    Discards every cached fragment of the course.
+    """
+    reset_course_publish_version(course_key)
+
+
+def get_cached_fragment_html(request, cache_key):
+    """
+    Returns the html cached under `cache_key` for `request`, or None if there
+    is none or `cache_key` is None.
+    """
+    if cache_key is None:
+        return None
+    html = cache.get(cache_key)
+    if html is not None:
+        html = html.replace(REQUEST_TOKEN_PLACEHOLDER, request_token(request))
+    return html
+
+
+def cache_fragment_html(request, cache_key, html):
+    """
+    Caches the html rendered for `request` under `cache_key`, unless it is None.
+    """
+    if cache_key is None:
+        return
+    html = html.replace(request_token(request), REQUEST_TOKEN_PLACEHOLDER)
+    cache.set(cache_key, html, FRAGMENT_CACHE_TIMEOUT)
+
+
+@receiver(SignalHandler.course_published)
+def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Discards the cached fragments of a course when it is published by this
+    process; Studio's own publishes are handled by contentstore.signals.
+    """
+    invalidate_course_fragments(course_key)
@@ -15,6 +15,8 @@ from django.core.cache import cache
 import dogstats_wrapper as dog_stats_api
 
 from courseware import courses
+from courseware.access import CourseAccessEvaluator
+from courseware.grading_context import get_grading_context, section_descriptor_loader
 from courseware.model_data import FieldDataCache, ScoresClient
 from student.models import anonymous_id_for_user
 from util.module_utils import yield_dynamic_descriptor_descendants
@@ -145,7 +147,7 @@ def field_data_cache_for_grading(course, user):
 
     This will generate a FieldDataCache that only loads state for those things
     that might possibly affect the grading process, and will ignore things like
-    Videos.
+    Videos.  The user's state in the course is loaded with a single query.
     """
     descriptor_filter = partial(descriptor_affects_grading, course.block_types_affecting_grading)
     return FieldDataCache.cache_for_descriptor_descendents(
@@ -153,7 +155,8 @@ def field_data_cache_for_grading(course, user):
         user,
         course,
         depth=None,
-        descriptor_filter=descriptor_filter
+        descriptor_filter=descriptor_filter,
+        cache_course_user_state=True,
     )
 
 
@@ -311,7 +314,10 @@ def _grade(student, request, course, keep_raw_scores, field_data_cache, scores_c
     # be hidden behind the ScoresClient.
     max_scores_cache.fetch_from_remote(field_data_cache.scorable_locations)
 
-    grading_context = course.grading_context
+    grading_context = get_grading_context(course)
+    load_section_descriptor = section_descriptor_loader(course)
+    # The modules of all the sections share the student's access checks.
+    access_evaluator = CourseAccessEvaluator(student, course.id)
     raw_scores = []
 
     totaled_scores = {}
@@ -320,14 +326,13 @@ def _grade(student, request, course, keep_raw_scores, field_data_cache, scores_c
     for section_format, sections in grading_context['graded_sections'].iteritems():
         format_scores = []
         for section in sections:
-            section_descriptor = section['section_descriptor']
-            section_name = section_descriptor.display_name_with_default
+            section_name = section.display_name
 
             # some problems have state that is updated independently of interaction
             # with the LMS, so they need to always be scored. (E.g. foldit.,
             # combinedopenended)
             should_grade_section = any(
-                descriptor.always_recalculate_grades for descriptor in section['xmoduledescriptors']
+                block.always_recalculate_grades for block in section.scored_blocks
             )
 
             # If there are no problems that always have to be regraded, check to
@@ -335,16 +340,22 @@ def _grade(student, request, course, keep_raw_scores, field_data_cache, scores_c
             # API. If scores exist, we have to calculate grades for this section.
             if not should_grade_section:
                 should_grade_section = any(
-                    descriptor.location.to_deprecated_string() in submissions_scores
-                    for descriptor in section['xmoduledescriptors']
+                    block.usage_key.to_deprecated_string() in submissions_scores
+                    for block in section.scored_blocks
                 )
 
             if not should_grade_section:
                 should_grade_section = any(
-                    descriptor.location in scores_client
-                    for descriptor in section['xmoduledescriptors']
+                    block.usage_key in scores_client
+                    for block in section.scored_blocks
                 )
 
+            # Descriptors are only loaded for the sections that need scoring.
+            section_descriptor = load_section_descriptor(section.usage_key) if should_grade_section else None
+            if should_grade_section and section_descriptor is None:
+                log.warning(u"Graded section %s is no longer in course %s", section.usage_key, course.id)
+                should_grade_section = False
+
             # If we haven't seen a single problem in the section, we don't have
             # to grade it at all! We can assume 0%
             if should_grade_section:
@@ -355,7 +366,8 @@ def _grade(student, request, course, keep_raw_scores, field_data_cache, scores_c
                     # TODO: We need the request to pass into here. If we could forego that, our arguments
                     # would be simpler
                     return get_module_for_descriptor(
-                        student, request, descriptor, field_data_cache, course.id, course=course
+                        student, request, descriptor, field_data_cache, course.id, course=course,
+                        access_evaluator=access_evaluator
                     )
 
                 descendants = yield_dynamic_descriptor_descendants(section_descriptor, student.id, create_module)
@@ -404,7 +416,7 @@ def _grade(student, request, course, keep_raw_scores, field_data_cache, scores_c
             else:
                 log.info(
                     "Unable to grade a section with a total possible score of zero. " +
-                    str(section_descriptor.location)
+                    str(section.usage_key)
                 )
 
         totaled_scores[section_format] = format_scores
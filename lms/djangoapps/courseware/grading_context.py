@@ -0,0 +1,129 @@
+"""
+A compact, picklable version of `CourseDescriptor.grading_context`, kept in
+the default cache so that it is not rebuilt by walking the course for every
+request and grading task.
+
+The context lists, for every graded section, the usage keys of the blocks
+that can affect grading, instead of their descriptors.  Graders load the
+descriptors of a section only when it actually needs scoring.
+
+Cached contexts are keyed by the course id, the edit version of the course,
+and a version stamp reset whenever the course is published, for the
+modulestores which do not keep track of edit versions.
+"""
+from collections import namedtuple
+import hashlib
+
+from django.core.cache import cache
+from django.dispatch.dispatcher import receiver
+
+from openedx.core.lib.cache_utils import course_edit_version, get_version_stamp, reset_version_stamp
+from xmodule.modulestore.django import SignalHandler
+
+
+GRADING_CONTEXT_CACHE_TIMEOUT = 60 * 60 * 24  # 1 day
+
+# A graded section, with the blocks of the section (including itself) which
+# have a score.
+GradedSection = namedtuple('GradedSection', ['usage_key', 'display_name', 'scored_blocks'])
+
+# A block with a score.
+ScoredBlock = namedtuple('ScoredBlock', ['usage_key', 'weight', 'has_score', 'always_recalculate_grades'])
+
+
+def _version_stamp_name(course_key):
+    """Name of the version stamp of a course's cached grading context."""
+    return u'courseware.grading_context.{}'.format(course_key)
+
+
+def _grading_context_cache_key(course):
+    """
+    Cache key of the grading context of `course`.
+    """
+    signature = u'{}|{}'.format(
+        course_edit_version(course),
+        get_version_stamp(_version_stamp_name(course.id)),
+    )
+    return u'courseware.grading_context.{}.{}'.format(
+        course.id, hashlib.md5(signature.encode('utf-8')).hexdigest()
+    )
+
+
+def build_grading_context(course):
+    """
+    Returns the grading context of `course`, computed from its descriptors.
+
+    The grading context is a dictionary with a single key, graded_sections,
+    mapping each section format to the list of the GradedSections with that
+    format.
+    """
+    graded_sections = {}
+    for section_format, sections in course.grading_context['graded_sections'].iteritems():
+        graded_sections[section_format] = [
+            GradedSection(
+                usage_key=section['section_descriptor'].location,
+                display_name=section['section_descriptor'].display_name_with_default,
+                scored_blocks=[
+                    ScoredBlock(
+                        usage_key=descriptor.location,
+                        weight=getattr(descriptor, 'weight', None),
+                        has_score=descriptor.has_score,
+                        always_recalculate_grades=descriptor.always_recalculate_grades,
+                    )
+                    for descriptor in section['xmoduledescriptors']
+                ],
+            )
+            for section in sections
+        ]
+    return {'graded_sections': graded_sections}
+
+
+def get_grading_context(course):
+    """
+    Returns the grading context of `course`, see `build_grading_context`,
+    from the cache if possible.
+    """
+    cache_key = _grading_context_cache_key(course)
+    grading_context = cache.get(cache_key)
+    if grading_context is None:
+        grading_context = build_grading_context(course)
+        cache.set(cache_key, grading_context, GRADING_CONTEXT_CACHE_TIMEOUT)
+    return grading_context
+
+
+def section_descriptor_loader(course):
+    """
+    Returns a function loading the descriptor of a section of `course` from
+    its usage key, or returning None if the course has no such section.
+
+    The chapters and sections of the course are only walked the first time
+    the function is called.
+    """
+    section_descriptors = {}
+
+    def load_section_descriptor(usage_key):
+        """
+        Returns the descriptor of the section of the course with `usage_key`.
+        """
+        if not section_descriptors:
+            for chapter in course.get_children():
+                for section in chapter.get_children():
+                    section_descriptors[(section.location.block_type, section.location.block_id)] = section
+        return section_descriptors.get((usage_key.block_type, usage_key.block_id))
+
+    return load_section_descriptor
+
+
+def invalidate_grading_context(course_key):
+    """
+    Discards the cached grading context of the course.
+    """
+    reset_version_stamp(_version_stamp_name(course_key))
+
+
+@receiver(SignalHandler.course_published)
+def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Discards the cached grading context of a course when it is published.
+    """
+    invalidate_grading_context(course_key)
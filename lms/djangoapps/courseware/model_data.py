@@ -350,6 +350,10 @@ class UserStateCache(object):
     """
     def __init__(self, user, course_id):
         self._cache = defaultdict(dict)
+        # Serialized state of the blocks loaded by `cache_course`, which is
+        # only decoded into `_cache` when the state of the block is accessed.
+        self._serialized_state = {}
+        self._course_cached = False
         self.course_id = course_id
         self.user = user
         self._client = DjangoXBlockUserStateClient(self.user)
@@ -364,13 +368,53 @@ class UserStateCache(object):
             xblocks (list of :class:`XBlock`): XBlocks to cache fields for.
             aside_types (list of str): Aside types to cache fields for.
         """
+        block_keys = _all_usage_keys(xblocks, aside_types)
+        if self._course_cached:
+            # The state of the blocks of the course was loaded by `cache_course`
+            block_keys = [block_key for block_key in block_keys if block_key.course_key != self.course_id]
+            if not block_keys:
+                return
+
         block_field_state = self._client.get_many(
             self.user.username,
-            _all_usage_keys(xblocks, aside_types),
+            block_keys,
         )
         for user_state in block_field_state:
             self._cache[user_state.block_key] = user_state.state
 
+    def cache_course(self):
+        """
+        Load the state of every block of the course for the user into this
+        cache, with a single query.
+
+        The state of each block is only decoded when it is first accessed.
+        """
+        module_states = StudentModule.objects.filter(
+            student=self.user.pk,
+            course_id=self.course_id,
+            state__isnull=False,
+        ).values_list('module_state_key', 'state')
+        for module_state_key, state in module_states:
+            block_key = UsageKey.from_string(module_state_key).map_into_course(self.course_id)
+            if block_key not in self._cache:
+                self._serialized_state[block_key] = state
+        self._course_cached = True
+
+    def _decode_state(self, cache_key):
+        """
+        Decode the state of the block `cache_key` into the cache, if it was
+        loaded by `cache_course` and is accessed for the first time.
+        """
+        serialized_state = self._serialized_state.pop(cache_key, None)
+        if serialized_state is None:
+            return
+
+        state = json.loads(serialized_state)
+        # An empty state is left by the deletion of all the fields of the
+        # block, which is the same as having no state.
+        if state:
+            self._cache[cache_key] = state
+
     @contract(kvs_key=DjangoKeyValueStore.Key)
     def set(self, kvs_key, value):
         """
@@ -413,6 +457,7 @@ class UserStateCache(object):
         pending_updates = defaultdict(dict)
         for kvs_key, value in kv_dict.items():
             cache_key = self._cache_key_for_kvs_key(kvs_key)
+            self._decode_state(cache_key)
 
             pending_updates[cache_key][kvs_key.field_name] = value
 
@@ -425,7 +470,8 @@ class UserStateCache(object):
             log.exception("Saving user state failed for %s", self.user.username)
             raise KeyValueMultiSaveError([])
         finally:
-            self._cache.update(pending_updates)
+            for cache_key, field_state in pending_updates.iteritems():
+                self._cache[cache_key].update(field_state)
 
     @contract(kvs_key=DjangoKeyValueStore.Key)
     def get(self, kvs_key):
@@ -439,6 +485,7 @@ class UserStateCache(object):
         Returns: A django orm object from the cache
         """
         cache_key = self._cache_key_for_kvs_key(kvs_key)
+        self._decode_state(cache_key)
         if cache_key not in self._cache:
             raise KeyError(kvs_key.field_name)
 
@@ -455,6 +502,7 @@ class UserStateCache(object):
         Raises: KeyError if key isn't found in the cache
         """
         cache_key = self._cache_key_for_kvs_key(kvs_key)
+        self._decode_state(cache_key)
         if cache_key not in self._cache:
             raise KeyError(kvs_key.field_name)
 
@@ -477,6 +525,7 @@ class UserStateCache(object):
         Returns: bool
         """
         cache_key = self._cache_key_for_kvs_key(kvs_key)
+        self._decode_state(cache_key)
 
         return (
             cache_key in self._cache and
@@ -484,7 +533,7 @@ class UserStateCache(object):
         )
 
     def __len__(self):
-        return len(self._cache)
+        return len(self._cache) + len(self._serialized_state)
 
     def _cache_key_for_kvs_key(self, key):
         """
@@ -738,6 +787,18 @@ class FieldDataCache(object):
 
                 self.cache[scope].cache_fields(fields, descriptors, self.asides)
 
+    def cache_course_user_state(self):
+        """
+        Load the Scope.user_state data of every block of the course for the
+        user, with a single query, instead of loading it for the blocks of
+        each descriptor added to this FieldDataCache.
+
+        This is cheaper when the state of most of the course is needed, as
+        when grading.  The state of each block is only decoded when accessed.
+        """
+        if self.user.is_authenticated():
+            self.cache[Scope.user_state].cache_course()
+
     def add_descriptor_descendents(self, descriptor, depth=None, descriptor_filter=lambda descriptor: True):
         """
         Add all descendants of `descriptor` to this FieldDataCache.
@@ -781,7 +842,7 @@ class FieldDataCache(object):
     @classmethod
     def cache_for_descriptor_descendents(cls, course_id, user, descriptor, depth=None,
                                          descriptor_filter=lambda descriptor: True,
-                                         select_for_update=False, asides=None):
+                                         select_for_update=False, asides=None, cache_course_user_state=False):
         """
         course_id: the course in the context of which we want StudentModules.
         user: the django user for whom to load modules.
@@ -791,8 +852,12 @@ class FieldDataCache(object):
         descriptor_filter is a function that accepts a descriptor and return whether the field data
             should be cached
         select_for_update: Ignored
+        cache_course_user_state: If True, load the StudentModules of the whole course at once
+            (see `cache_course_user_state`)
         """
         cache = FieldDataCache([], course_id, user, select_for_update, asides=asides)
+        if cache_course_user_state:
+            cache.cache_course_user_state()
         cache.add_descriptor_descendents(descriptor, depth, descriptor_filter)
         return cache
 
@@ -163,6 +163,19 @@ class StudentModuleHistory(models.Model):
     grade = models.FloatField(null=True, blank=True)
     max_grade = models.FloatField(null=True, blank=True)
 
+    @classmethod
+    def for_student_module(cls, student_module):
+        """
+        Returns an unsaved StudentModuleHistory entry recording the current
+        state and grade of `student_module`.
+        """
+        return cls(student_module=student_module,
+                   version=None,
+                   created=student_module.modified,
+                   state=student_module.state,
+                   grade=student_module.grade,
+                   max_grade=student_module.max_grade)
+
     @receiver(post_save, sender=StudentModule)
     def save_history(sender, instance, **kwargs):  # pylint: disable=no-self-argument, unused-argument
         """
@@ -171,13 +184,7 @@ class StudentModuleHistory(models.Model):
         we save.
         """
         if instance.module_type in StudentModuleHistory.HISTORY_SAVING_TYPES:
-            history_entry = StudentModuleHistory(student_module=instance,
-                                                 version=None,
-                                                 created=instance.modified,
-                                                 state=instance.state,
-                                                 grade=instance.grade,
-                                                 max_grade=instance.max_grade)
-            history_entry.save()
+            StudentModuleHistory.for_student_module(instance).save()
 
 
 class XBlockFieldBase(models.Model):
@@ -27,7 +27,7 @@ from django.views.decorators.csrf import csrf_exempt
 import newrelic.agent
 
 from capa.xqueue_interface import XQueueInterface
-from courseware.access import has_access, get_user_role
+from courseware.access import has_access, get_user_role, CourseAccessEvaluator
 from courseware.masquerade import (
     MasqueradingKeyValueStore,
     filter_displayed_blocks,
@@ -49,9 +49,7 @@ from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import UsageKey, CourseKey
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from openedx.core.lib.xblock_utils import (
-    replace_course_urls,
-    replace_jump_to_id_urls,
-    replace_static_urls,
+    replace_urls,
     add_staff_markup,
     wrap_xblock,
     request_token as xblock_request_token,
@@ -77,6 +75,7 @@ from util.json_request import JsonResponse
 from util.sandboxing import can_execute_unsafe_code, get_python_lib_zip
 from util import milestones_helpers
 from verify_student.services import ReverificationService
+from xqueue_outbox.outbox import XQueueOutbox
 
 from edx_proctoring.services import ProctoringService
 from openedx.core.djangoapps.credit.services import CreditService
@@ -95,8 +94,16 @@ XQUEUE_INTERFACE = XQueueInterface(
     settings.XQUEUE_INTERFACE['url'],
     settings.XQUEUE_INTERFACE['django_auth'],
     REQUESTS_AUTH,
+    pool_size=settings.XQUEUE_INTERFACE.get('pool_size'),
 )
 
+# Learner submissions are added to the xqueue outbox, and delivered through
+# XQUEUE_INTERFACE by celery workers, rather than sent during the request.
+if settings.FEATURES.get('ENABLE_XQUEUE_OUTBOX'):
+    XQUEUE_SUBMISSION_INTERFACE = XQueueOutbox(XQUEUE_INTERFACE)
+else:
+    XQUEUE_SUBMISSION_INTERFACE = XQUEUE_INTERFACE
+
 # TODO: course_id and course_key are used interchangeably in this file, which is wrong.
 # Some brave person should make the variable names consistently someday, but the code's
 # coupled enough that it's kind of tricky--you've been warned!
@@ -321,12 +328,15 @@ def get_xqueue_callback_url_prefix(request):
 def get_module_for_descriptor(user, request, descriptor, field_data_cache, course_key,
                               position=None, wrap_xmodule_display=True, grade_bucket_type=None,
                               static_asset_path='', disable_staff_debug_info=False,
-                              course=None):
+                              course=None, access_evaluator=None):
     """
     Implements get_module, extracting out the request-specific functionality.
 
     disable_staff_debug_info : If this is True, exclude staff debug information in the rendering of the module.
 
+    access_evaluator : An optional CourseAccessEvaluator of the user and course, to share between the
+        modules a caller creates one at a time.
+
     See get_module() docstring for further details.
     """
     track_function = make_track_function(request)
@@ -353,7 +363,8 @@ def get_module_for_descriptor(user, request, descriptor, field_data_cache, cours
         user_location=user_location,
         request_token=xblock_request_token(request),
         disable_staff_debug_info=disable_staff_debug_info,
-        course=course
+        course=course,
+        access_evaluator=access_evaluator,
     )
 
 
@@ -362,7 +373,7 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
                                descriptor, course_id, track_function, xqueue_callback_url_prefix,
                                request_token, position=None, wrap_xmodule_display=True, grade_bucket_type=None,
                                static_asset_path='', user_location=None, disable_staff_debug_info=False,
-                               course=None):
+                               course=None, access_evaluator=None):
     """
     Helper function that returns a module system and student_data bound to a user and a descriptor.
 
@@ -378,6 +389,8 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
     Arguments:
         see arguments for get_module()
         request_token (str): A token unique to the request use by xblock initialization
+        access_evaluator (CourseAccessEvaluator): The access evaluator of the user and course, shared
+            with the modules of the descendants of the descriptor. Created if not given.
 
     Returns:
         (LmsModuleSystem, KvsFieldData):  (module system, student_data) bound to, primarily, the user and descriptor
@@ -404,7 +417,7 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
     xqueue_default_queuename = descriptor.location.org + '-' + descriptor.location.course
 
     xqueue = {
-        'interface': XQUEUE_INTERFACE,
+        'interface': XQUEUE_SUBMISSION_INTERFACE,
         'construct_callback': make_xqueue_callback,
         'default_queuename': xqueue_default_queuename.replace(' ', '_'),
         'waittime': settings.XQUEUE_WAITTIME_BETWEEN_REQUESTS
@@ -435,6 +448,9 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
             'storage_bucket_name': getattr(settings, 'AWS_STORAGE_BUCKET_NAME', 'openended')
         }
 
+    if access_evaluator is None:
+        access_evaluator = CourseAccessEvaluator(user, course_id)
+
     def inner_get_module(descriptor):
         """
         Delegate to get_module_for_descriptor_internal() with all values except `descriptor` set.
@@ -456,7 +472,8 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
             static_asset_path=static_asset_path,
             user_location=user_location,
             request_token=request_token,
-            course=course
+            course=course,
+            access_evaluator=access_evaluator,
         )
 
     def _fulfill_content_milestones(user, course_key, content_key):
@@ -630,27 +647,21 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
     # prefix is going to have to be specific to the module, not the directory
     # that the xml was loaded from
 
-    # Rewrite urls beginning in /static to point to course-specific content
-    block_wrappers.append(partial(
-        replace_static_urls,
-        getattr(descriptor, 'data_dir', None),
-        course_id=course_id,
-        static_asset_path=static_asset_path or descriptor.static_asset_path
-    ))
-
-    # Allow URLs of the form '/course/' refer to the root of multicourse directory
+    # Rewrite, in a single pass over the html:
+    # - urls beginning in /static to point to course-specific content
+    # - URLs of the form '/course/', which refer to the root of multicourse directory
     #   hierarchy of this course
-    block_wrappers.append(partial(replace_course_urls, course_id))
-
-    # this will rewrite intra-courseware links (/jump_to_id/<id>). This format
-    # is an improvement over the /course/... format for studio authored courses,
-    # because it is agnostic to course-hierarchy.
+    # - intra-courseware links (/jump_to_id/<id>). This format is an improvement over
+    #   the /course/... format for studio authored courses, because it is agnostic to
+    #   course-hierarchy.
     # NOTE: module_id is empty string here. The 'module_id' will get assigned in the replacement
     # function, we just need to specify something to get the reverse() to work.
     block_wrappers.append(partial(
-        replace_jump_to_id_urls,
+        replace_urls,
         course_id,
         reverse('jump_to_id', kwargs={'course_id': course_id.to_deprecated_string(), 'module_id': ''}),
+        getattr(descriptor, 'data_dir', None),
+        static_asset_path=static_asset_path or descriptor.static_asset_path
     ))
 
     if settings.FEATURES.get('DISPLAY_DEBUG_INFO_TO_STAFF'):
@@ -688,7 +699,7 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
 
     field_data = LmsFieldData(descriptor._field_data, student_data)  # pylint: disable=protected-access
 
-    user_is_staff = bool(has_access(user, u'staff', descriptor.location, course_id))
+    user_is_staff = bool(access_evaluator.has_staff_access)
 
     system = LmsModuleSystem(
         track_function=track_function,
@@ -769,7 +780,7 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
     system.set(u'days_early_for_beta', getattr(descriptor, 'days_early_for_beta'))
 
     # make an ErrorDescriptor -- assuming that the descriptor's system is ok
-    if has_access(user, u'staff', descriptor.location, course_id):
+    if user_is_staff:
         system.error_descriptor_class = ErrorDescriptor
     else:
         system.error_descriptor_class = NonStaffErrorDescriptor
@@ -783,7 +794,7 @@ def get_module_for_descriptor_internal(user, descriptor, student_data, course_id
                                        track_function, xqueue_callback_url_prefix, request_token,
                                        position=None, wrap_xmodule_display=True, grade_bucket_type=None,
                                        static_asset_path='', user_location=None, disable_staff_debug_info=False,
-                                       course=None):
+                                       course=None, access_evaluator=None):
     """
     Actually implement get_module, without requiring a request.
 
@@ -791,7 +802,11 @@ def get_module_for_descriptor_internal(user, descriptor, student_data, course_id
 
     Arguments:
         request_token (str): A unique token for this request, used to isolate xblock rendering
+        access_evaluator (CourseAccessEvaluator): The access evaluator of the user and course, if
+            one is already available
     """
+    if access_evaluator is None:
+        access_evaluator = CourseAccessEvaluator(user, course_id)
 
     (system, student_data) = get_module_system_for_user(
         user=user,
@@ -807,7 +822,8 @@ def get_module_for_descriptor_internal(user, descriptor, student_data, course_id
         user_location=user_location,
         request_token=request_token,
         disable_staff_debug_info=disable_staff_debug_info,
-        course=course
+        course=course,
+        access_evaluator=access_evaluator,
     )
 
     descriptor.bind_for_student(
@@ -826,7 +842,7 @@ def get_module_for_descriptor_internal(user, descriptor, student_data, course_id
     # for the student, since there may be field override data for the student
     # that affects xblock visibility.
     if getattr(user, 'known', True):
-        if not has_access(user, 'load', descriptor, course_id):
+        if not access_evaluator.has_load_access(descriptor):
             return None
 
     return descriptor
@@ -0,0 +1,90 @@
+"""
+Performance test of the 'load' access checks of a student to every unit of a
+course, with has_access called for each unit, and with one
+CourseAccessEvaluator for all of them.
+"""
+from datetime import datetime, timedelta
+import unittest
+
+from django.contrib.auth.models import User
+from mock import patch
+from nose.plugins.skip import SkipTest
+import pytz
+
+from courseware.access import CourseAccessEvaluator, has_access
+from student.tests.factories import UserFactory
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+# The dependency below needs to be installed manually from the development.txt file, which doesn't
+# get installed during unit tests!
+try:
+    from code_block_timer import CodeBlockTimer
+except ImportError:
+    CodeBlockTimer = None
+
+# Number of units of the course.
+UNITS = 500
+UNITS_PER_SEQUENTIAL = 10
+SEQUENTIALS_PER_CHAPTER = 10
+
+# Number of passes over every unit.
+ITERATIONS = 10
+
+
+# Eventually, exclude this attribute from regular unittests while running *only* tests
+# with this attribute during regular performance tests.
+# @attr("perf_test")
+@unittest.skip
+class AccessChecksPerfTest(ModuleStoreTestCase):
+    """
+    This class exists to time the access checks of a student to the units of
+    a course which is not started yet, so that every check goes as far as the
+    staff roles of the student.
+    """
+
+    # Use this attr to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super(AccessChecksPerfTest, self).setUp()
+        self.student = UserFactory.create()
+        self.course = CourseFactory.create(start=datetime.now(pytz.UTC) + timedelta(days=30))
+        self.units = []
+        with self.store.bulk_operations(self.course.id):
+            chapter = sequential = None
+            for index in xrange(UNITS):
+                if index % (UNITS_PER_SEQUENTIAL * SEQUENTIALS_PER_CHAPTER) == 0:
+                    chapter = ItemFactory.create(parent=self.course, category='chapter')
+                if index % UNITS_PER_SEQUENTIAL == 0:
+                    sequential = ItemFactory.create(parent=chapter, category='sequential')
+                self.units.append(
+                    ItemFactory.create(parent=sequential, category='vertical', days_early_for_beta=2)
+                )
+
+    @patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+    def test_access_check_timings(self):
+        """
+        Generate timings of has_access and of the evaluator, which must agree.
+        """
+        if CodeBlockTimer is None:
+            raise SkipTest("CodeBlockTimer undefined.")
+
+        def per_unit(user):
+            """Checks each unit with has_access."""
+            return [has_access(user, 'load', unit, self.course.id) for unit in self.units]
+
+        def evaluator(user):
+            """Checks all the units with one evaluator."""
+            access_evaluator = CourseAccessEvaluator(user, self.course.id)
+            return [access_evaluator.has_load_access(unit) for unit in self.units]
+
+        results = {}
+        for name, check in (('has_access', per_unit), ('evaluator', evaluator)):
+            with CodeBlockTimer("AccessChecks:{}:{}".format(name, UNITS)):
+                for __ in xrange(ITERATIONS):
+                    # a new user object for every pass, like for every request
+                    user = User.objects.get(id=self.student.id)
+                    results[name] = [bool(response) for response in check(user)]
+
+        self.assertEqual(results['has_access'], results['evaluator'])
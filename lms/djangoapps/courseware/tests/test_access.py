@@ -131,6 +131,13 @@ class AccessTestCase(LoginEnrollmentTestCase, ModuleStoreTestCase):
             self.student, 'not_staff_or_instructor', self.course.course_key
         ))
 
+    def test_user_ids_with_staff_access(self):
+        users = [self.beta_user, self.student, self.global_staff, self.course_staff, self.course_instructor]
+        self.assertEqual(
+            access.user_ids_with_staff_access([user.id for user in users], self.course.course_key),
+            set(user.id for user in users if access._has_access_to_course(user, 'staff', self.course.course_key))
+        )
+
     def test__has_access_string(self):
         user = Mock(is_staff=True)
         self.assertFalse(access._has_access_string(user, 'staff', 'not_global'))
@@ -237,6 +244,54 @@ class AccessTestCase(LoginEnrollmentTestCase, ModuleStoreTestCase):
         mock_unit.start = start
         self.verify_access(mock_unit, expected_access, expected_error_type)
 
+    @ddt.data(
+        (False, None),
+        (False, YESTERDAY),
+        (False, TOMORROW),
+        (True, YESTERDAY),
+        (True, TOMORROW),
+    )
+    @ddt.unpack
+    @patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+    def test_course_access_evaluator(self, visible_to_staff_only, start):
+        """
+        Tests that the evaluator answers like has_access.
+        """
+        mock_unit = Mock(user_partitions=[], days_early_for_beta=2)
+        mock_unit._class_tags = {}
+        mock_unit.visible_to_staff_only = visible_to_staff_only
+        mock_unit.start = start
+
+        for user in (self.anonymous_user, self.student, self.beta_user, self.course_staff, self.global_staff):
+            expected = access._has_access_descriptor(user, 'load', mock_unit, course_key=self.course.course_key)
+            evaluator = access.CourseAccessEvaluator(user, self.course.course_key)
+            responses = [evaluator.has_load_access(mock_unit), evaluator.has_load_access(mock_unit)]
+            responses.append(evaluator.has_load_access_to_summary(mock_unit, []))
+            for response in responses:
+                self.assertEqual(bool(response), bool(expected))
+                self.assertEqual(type(response), type(expected))
+
+    @patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+    def test_course_access_evaluator_lookups(self):
+        """
+        Tests that the evaluator looks up the roles of the user only once.
+        """
+        mock_units = []
+        for __ in range(5):
+            mock_unit = Mock(user_partitions=[], days_early_for_beta=2, visible_to_staff_only=False)
+            mock_unit._class_tags = {}
+            mock_unit.start = self.TOMORROW + datetime.timedelta(days=7)
+            mock_units.append(mock_unit)
+
+        evaluator = access.CourseAccessEvaluator(self.student, self.course.course_key)
+        with patch('courseware.access._has_access_to_course', wraps=access._has_access_to_course) as mock_staff:
+            with patch('courseware.access.CourseBetaTesterRole', wraps=access.CourseBetaTesterRole) as mock_beta:
+                responses = [evaluator.has_load_access(unit) for unit in mock_units]
+
+        self.assertFalse(any(responses))
+        self.assertEqual(mock_staff.call_count, 1)
+        self.assertEqual(mock_beta.call_count, 1)
+
     def test__has_access_course_desc_can_enroll(self):
         yesterday = datetime.datetime.now(pytz.utc) - datetime.timedelta(days=1)
         tomorrow = datetime.datetime.now(pytz.utc) + datetime.timedelta(days=1)
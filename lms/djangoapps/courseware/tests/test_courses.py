@@ -19,7 +19,9 @@ from courseware.courses import (
 )
 
 from courseware.courses import get_course_with_access
+from courseware.fragment_cache import invalidate_course_fragments
 from courseware.module_render import get_module_for_descriptor
+from courseware.tests.factories import StaffFactory
 from courseware.tests.helpers import get_request_for_user
 from courseware.model_data import FieldDataCache
 from lms.djangoapps.courseware.courseware_access_exception import CoursewareAccessException
@@ -191,6 +193,28 @@ class CoursesRenderTest(ModuleStoreTestCase):
         self.assertEqual(course_info, u"<a href='/c4x/edX/toy/asset/handouts_sample_handout.txt'>Sample</a>")
 
         # Test when render raises an exception
+        invalidate_course_fragments(self.course.id)
+        with mock.patch('courseware.courses.get_module') as mock_module_render:
+            mock_module_render.return_value = mock.MagicMock(
+                render=mock.Mock(side_effect=Exception('Render failed!'))
+            )
+            course_info = get_course_info_section(self.request, self.course, 'handouts')
+            self.assertIn("this module is temporarily unavailable", course_info)
+
+    def test_get_course_info_section_cached(self):
+        invalidate_course_fragments(self.course.id)
+        course_info = get_course_info_section(self.request, self.course, 'handouts')
+
+        # The second render is served from the cache
+        with mock.patch('courseware.courses.get_module') as mock_module_render:
+            self.assertEqual(get_course_info_section(self.request, self.course, 'handouts'), course_info)
+            self.assertFalse(mock_module_render.called)
+
+    def test_get_course_info_section_not_cached_for_staff(self):
+        invalidate_course_fragments(self.course.id)
+        staff_request = get_request_for_user(StaffFactory.create(course_key=self.course.id))
+        get_course_info_section(staff_request, self.course, 'handouts')
+
         with mock.patch('courseware.courses.get_module') as mock_module_render:
             mock_module_render.return_value = mock.MagicMock(
                 render=mock.Mock(side_effect=Exception('Render failed!'))
@@ -231,6 +255,7 @@ class XmlCoursesRenderTest(ModuleStoreTestCase):
         self.assertEqual(course_info, "<a href='/static/toy/handouts/sample_handout.txt'>Sample</a>")
 
         # Test when render raises an exception
+        invalidate_course_fragments(course.id)
         with mock.patch('courseware.courses.get_module') as mock_module_render:
             mock_module_render.return_value = mock.MagicMock(
                 render=mock.Mock(side_effect=Exception('Render failed!'))
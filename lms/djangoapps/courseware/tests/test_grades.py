@@ -1,6 +1,8 @@
 """
 Test grade calculation.
 """
+import pickle
+
 from django.http import Http404
 from django.test.client import RequestFactory
 
@@ -9,6 +11,7 @@ from nose.plugins.attrib import attr
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
 from courseware.grades import field_data_cache_for_grading, grade, iterate_grades_for, MaxScoresCache
+from courseware.grading_context import get_grading_context, section_descriptor_loader
 from student.tests.factories import UserFactory
 from student.models import CourseEnrollment
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
@@ -194,3 +197,48 @@ class TestFieldDataCacheScorableLocations(ModuleStoreTestCase):
         self.assertNotIn('html', block_types)
         self.assertNotIn('discussion', block_types)
         self.assertIn('problem', block_types)
+
+
+class TestGradingContext(ModuleStoreTestCase):
+    """
+    Tests of the cached grading context.
+    """
+    def setUp(self):
+        super(TestGradingContext, self).setUp()
+        self.course = CourseFactory.create()
+        chapter = ItemFactory.create(category='chapter', parent=self.course)
+        self.section = ItemFactory.create(
+            category='sequential', parent=chapter, metadata={'graded': True, 'format': 'Homework'}
+        )
+        self.vertical = ItemFactory.create(category='vertical', parent=self.section)
+        self.problem = ItemFactory.create(category='problem', parent=self.vertical)
+        ItemFactory.create(category='html', parent=self.vertical)
+        self.course = self.store.get_course(self.course.id)
+
+    def test_grading_context(self):
+        grading_context = get_grading_context(self.course)
+        sections = grading_context['graded_sections']['Homework']
+        self.assertEqual(len(sections), 1)
+        self.assertEqual(sections[0].usage_key, self.section.location)
+        self.assertEqual([block.usage_key for block in sections[0].scored_blocks], [self.problem.location])
+
+        # The cached context doesn't hold descriptors.
+        self.assertEqual(pickle.loads(pickle.dumps(grading_context)), grading_context)
+
+    def test_cached(self):
+        get_grading_context(self.course)
+        with patch('courseware.grading_context.build_grading_context') as mock_build:
+            get_grading_context(self.course)
+        self.assertFalse(mock_build.called)
+
+    def test_invalidated_on_publish(self):
+        get_grading_context(self.course)
+        ItemFactory.create(category='problem', parent=self.vertical)
+        course = self.store.get_course(self.course.id)
+        sections = get_grading_context(course)['graded_sections']['Homework']
+        self.assertEqual(len(sections[0].scored_blocks), 2)
+
+    def test_section_descriptor_loader(self):
+        load_section_descriptor = section_descriptor_loader(self.course)
+        self.assertEqual(load_section_descriptor(self.section.location).location, self.section.location)
+        self.assertIsNone(load_section_descriptor(self.problem.location))
@@ -7,7 +7,8 @@ from nose.plugins.attrib import attr
 from functools import partial
 
 from courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError
-from courseware.models import StudentModule
+from courseware.models import StudentModule, StudentModuleHistory
+from courseware.user_state_client import DjangoXBlockUserStateClient
 from courseware.models import XModuleStudentInfoField, XModuleStudentPrefsField
 
 from student.tests.factories import UserFactory
@@ -19,7 +20,7 @@ from xblock.fields import Scope, BlockScope, ScopeIds
 from xblock.exceptions import KeyValueMultiSaveError
 from xblock.core import XBlock
 from django.test import TestCase
-from django.db import DatabaseError
+from django.db import DatabaseError, IntegrityError
 
 
 def mock_field(scope, name):
@@ -215,7 +216,7 @@ class TestStudentModuleStorage(OtherUserFailureTestMixin, TestCase):
         for key in kv_dict:
             self.kvs.set(key, 'test_value')
 
-        with patch('django.db.models.Model.save', side_effect=DatabaseError):
+        with patch('django.db.models.query.QuerySet.update', side_effect=DatabaseError):
             with self.assertRaises(KeyValueMultiSaveError) as exception_context:
                 self.kvs.set_many(kv_dict)
         self.assertEquals(exception_context.exception.saved_field_names, [])
@@ -272,6 +273,148 @@ class TestMissingStudentModule(TestCase):
             self.assertFalse(self.kvs.has(user_state_key('a_field')))
 
 
+@attr('shard_1')
+class TestCourseUserStateCache(TestCase):
+    """Tests for loading the user_state of a whole course at once"""
+
+    def setUp(self):
+        super(TestCourseUserStateCache, self).setUp()
+        student_module = StudentModuleFactory(state=json.dumps({'a_field': 'a_value'}))
+        self.user = student_module.student
+        self.assertEqual(self.user.id, 1)   # check our assumption hard-coded in the key functions above.
+        StudentModuleFactory(student=self.user, module_state_key=location('other_id'), state=json.dumps({'b_field': 1}))
+        StudentModuleFactory(student=self.user, module_state_key=location('deleted_id'), state='{}')
+
+        self.field_data_cache = FieldDataCache([], course_id, self.user)
+        with self.assertNumQueries(1):
+            self.field_data_cache.cache_course_user_state()
+        self.kvs = DjangoKeyValueStore(self.field_data_cache)
+
+    def test_add_descriptors(self):
+        "Test that adding descriptors of the course doesn't query their user_state again"
+        with self.assertNumQueries(0):
+            self.field_data_cache.add_descriptors_to_cache([mock_descriptor([mock_field(Scope.user_state, 'a_field')])])
+            self.assertEquals('a_value', self.kvs.get(user_state_key('a_field')))
+
+    def test_lazy_decoding(self):
+        "Test that the state of a block is only decoded when it is accessed"
+        with patch('courseware.model_data.json.loads', side_effect=json.loads) as mock_loads:
+            self.assertEquals('a_value', self.kvs.get(user_state_key('a_field')))
+            self.assertTrue(self.kvs.has(user_state_key('a_field')))
+        self.assertEquals(mock_loads.call_count, 1)
+
+    def test_deleted_state(self):
+        "Test that a block whose fields were all deleted has no state"
+        deleted_key = DjangoKeyValueStore.Key(Scope.user_state, 1, location('deleted_id'), 'a_field')
+        with self.assertNumQueries(0):
+            self.assertFalse(self.kvs.has(deleted_key))
+            self.assertRaises(KeyError, self.kvs.get, deleted_key)
+
+    def test_set_field(self):
+        "Test that setting a field keeps the other fields of the block"
+        self.kvs.set(user_state_key('new_field'), 'new_value')
+        with self.assertNumQueries(0):
+            self.assertEquals('a_value', self.kvs.get(user_state_key('a_field')))
+            self.assertEquals('new_value', self.kvs.get(user_state_key('new_field')))
+
+
+@attr('shard_1')
+class TestUserStateWrites(TestCase):
+    """Tests for the number of queries made to write user_state"""
+
+    def setUp(self):
+        super(TestUserStateWrites, self).setUp()
+        self.user = UserFactory.create(username='user')
+        self.sequential_location = course_id.make_usage_key('sequential', 'sequential_id')
+        StudentModuleFactory(
+            student=self.user,
+            module_state_key=self.sequential_location,
+            module_type='sequential',
+            state=json.dumps({'position': 1}),
+        )
+        self.client = DjangoXBlockUserStateClient(self.user)
+
+    def test_update_read_block(self):
+        "Test that updating the state of a block already read doesn't read it again"
+        list(self.client.get_many(self.user.username, [self.sequential_location]))
+        with self.assertNumQueries(1):
+            self.client.set_many(self.user.username, {self.sequential_location: {'position': 2}})
+        with self.assertNumQueries(1):
+            self.client.set_many(self.user.username, {self.sequential_location: {'position': 3}})
+
+        student_module = StudentModule.objects.get(module_state_key=self.sequential_location)
+        self.assertEquals({'position': 3}, json.loads(student_module.state))
+        self.assertFalse(StudentModuleHistory.objects.exists())
+
+    def test_create_many(self):
+        "Test that the StudentModules of many blocks, and their history, are created in bulk"
+        block_keys_to_state = {
+            location('first_id'): {'a_field': 'a_value'},
+            location('second_id'): {'b_field': 'b_value'},
+            location('third_id'): {'c_field': 'c_value'},
+        }
+        # Looking for the StudentModules, creating them, then reading their
+        # ids back to record their history
+        with self.assertNumQueries(4):
+            self.client.set_many(self.user.username, block_keys_to_state)
+
+        for usage_key, state in block_keys_to_state.items():
+            student_module = StudentModule.objects.get(module_state_key=usage_key)
+            self.assertEquals(state, json.loads(student_module.state))
+            self.assertEquals(1, StudentModuleHistory.objects.filter(student_module=student_module).count())
+
+    def test_update_deleted_block(self):
+        "Test that the StudentModule of a block is created again if it was deleted since it was read"
+        list(self.client.get_many(self.user.username, [self.sequential_location]))
+        StudentModule.objects.filter(module_state_key=self.sequential_location).delete()
+
+        self.client.set_many(self.user.username, {self.sequential_location: {'other_field': 'value'}})
+
+        student_module = StudentModule.objects.get(module_state_key=self.sequential_location)
+        self.assertEquals({'other_field': 'value'}, json.loads(student_module.state))
+
+    def _patch_lookups(self, num_missed_lookups):
+        """
+        Patch the client so that its first `num_missed_lookups` lookups of
+        StudentModules find none of them, as if they were created concurrently
+        after being looked for.
+        """
+        get_student_modules = self.client._get_student_modules  # pylint: disable=protected-access
+        lookups = []
+
+        def _get_student_modules(username, block_keys):
+            "Finds no StudentModules for the first lookups"
+            lookups.append(block_keys)
+            if len(lookups) <= num_missed_lookups:
+                return []
+            return get_student_modules(username, block_keys)
+
+        return patch.object(self.client, '_get_student_modules', side_effect=_get_student_modules)
+
+    def test_create_conflict(self):
+        "Test that StudentModules created concurrently are updated instead"
+        new_location = location('new_id')
+        with self._patch_lookups(1):
+            self.client.set_many(self.user.username, {
+                self.sequential_location: {'position': 2},
+                new_location: {'a_field': 'a_value'},
+            })
+
+        student_module = StudentModule.objects.get(module_state_key=self.sequential_location)
+        self.assertEquals({'position': 2}, json.loads(student_module.state))
+        student_module = StudentModule.objects.get(module_state_key=new_location)
+        self.assertEquals({'a_field': 'a_value'}, json.loads(student_module.state))
+
+    def test_create_conflict_retried_once(self):
+        "Test that the creation of StudentModules is retried only once"
+        with self._patch_lookups(2):
+            with self.assertRaises(IntegrityError):
+                self.client.set_many(self.user.username, {
+                    self.sequential_location: {'position': 2},
+                    location('new_id'): {'a_field': 'a_value'},
+                })
+
+
 @attr('shard_1')
 class StorageTestBase(object):
     """
@@ -1433,7 +1433,10 @@ class TestStaffDebugInfo(ModuleStoreTestCase):
             self.assertFalse(mock_grade_histogram.called)
 
     def test_histogram_enabled_for_scored_xmodules(self):
-        """Histograms should display for xmodules which are scored."""
+        """
+        Histograms should display for xmodules which are scored, and be
+        fetched by the staff panel after the page is rendered.
+        """
 
         StudentModuleFactory.create(
             course_id=self.course.id,
@@ -1451,8 +1454,9 @@ class TestStaffDebugInfo(ModuleStoreTestCase):
                 self.location,
                 self.field_data_cache,
             )
-            module.render(STUDENT_VIEW)
-            self.assertTrue(mock_grade_histogram.called)
+            result_fragment = module.render(STUDENT_VIEW)
+            self.assertFalse(mock_grade_histogram.called)
+        self.assertIn('data-histogram-url', result_fragment.content)
 
 
 PER_COURSE_ANONYMIZED_DESCRIPTORS = (LTIDescriptor, )
@@ -1478,6 +1482,7 @@ class TestAnonymousStudentId(ModuleStoreTestCase, LoginEnrollmentTestCase):
         self.course = modulestore().get_course(self.course_key)
 
     @patch('courseware.module_render.has_access', Mock(return_value=True))
+    @patch('courseware.access.CourseAccessEvaluator.has_load_access', Mock(return_value=True))
     def _get_anonymous_id(self, course_id, xblock_class):
         location = course_id.make_usage_key('dummy_category', 'dummy_name')
         descriptor = Mock(
@@ -1914,6 +1919,13 @@ class TestFilteredChildren(ModuleStoreTestCase):
         patcher = patch('courseware.module_render.has_access', self._has_access)
         patcher.start()
         self.addCleanup(patcher.stop)
+        # The runtime checks the 'load' access of the children with an access evaluator.
+        patcher = patch(
+            'courseware.access.CourseAccessEvaluator.has_load_access',
+            lambda evaluator, obj: self._has_access(evaluator.user, 'load', obj, evaluator.course_key)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     @ddt.data(*BLOCK_TYPES)
     @XBlock.register_temp_plugin(PureXBlockWithChildren, identifier='xblock')
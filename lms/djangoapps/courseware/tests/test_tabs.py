@@ -10,6 +10,8 @@ from nose.plugins.attrib import attr
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
 from courseware.courses import get_course_by_id
+from courseware import fragment_cache
+from courseware.fragment_cache import invalidate_course_fragments
 from courseware.tabs import (
     get_course_tab_list, CoursewareTab, CourseInfoTab, ProgressTab,
     ExternalDiscussionCourseTab, ExternalLinkCourseTab
@@ -19,8 +21,10 @@ from courseware.tests.factories import InstructorFactory, StaffFactory
 from courseware.views import get_static_tab_contents, static_tab
 from student.models import CourseEnrollment
 from student.tests.factories import UserFactory
+from openedx.core.lib.xblock_utils import request_token
 from util import milestones_helpers
 from xmodule import tabs as xmodule_tabs
+from xmodule.modulestore.django import SignalHandler
 from xmodule.modulestore.tests.django_utils import (
     TEST_DATA_MIXED_TOY_MODULESTORE, TEST_DATA_MIXED_CLOSED_MODULESTORE
 )
@@ -259,7 +263,13 @@ class StaticTabDateTestCase(LoginEnrollmentTestCase, ModuleStoreTestCase):
         self.assertIn(self.toy_course_key.to_deprecated_string(), tab_content)
         self.assertIn('static_tab', tab_content)
 
+        # Test that the second render is served from the cache
+        with patch('courseware.views.get_module') as mock_module_render:
+            self.assertEqual(get_static_tab_contents(request, course, tab), tab_content)
+            self.assertFalse(mock_module_render.called)
+
         # Test when render raises an exception
+        invalidate_course_fragments(course.id)
         with patch('courseware.views.get_module') as mock_module_render:
             mock_module_render.return_value = MagicMock(
                 render=Mock(side_effect=Exception('Render failed!'))
@@ -267,6 +277,39 @@ class StaticTabDateTestCase(LoginEnrollmentTestCase, ModuleStoreTestCase):
             static_tab = get_static_tab_contents(request, course, tab)
             self.assertIn("this module is temporarily unavailable", static_tab)
 
+    def test_get_static_tab_contents_request_token(self):
+        self.setup_user()
+        course = get_course_by_id(self.toy_course_key)
+        tab = xmodule_tabs.CourseTabList.get_tab_by_slug(course.tabs, 'resources')
+        invalidate_course_fragments(course.id)
+        first_request = get_request_for_user(self.user)
+        self.assertIn(request_token(first_request), get_static_tab_contents(first_request, course, tab))
+
+        # The html served from the cache has the token of its own request
+        second_request = get_request_for_user(self.user)
+        with patch('courseware.views.get_module') as mock_module_render:
+            tab_content = get_static_tab_contents(second_request, course, tab)
+            self.assertFalse(mock_module_render.called)
+        self.assertIn(request_token(second_request), tab_content)
+        self.assertNotIn(request_token(first_request), tab_content)
+
+    def test_get_static_tab_contents_edited(self):
+        # Editing the tab discards its cached html even if the course published
+        # signal isn't received, as when the tab is edited in Studio.
+        listener = fragment_cache._listen_for_course_publish  # pylint: disable=protected-access
+        SignalHandler.course_published.disconnect(listener)
+        self.addCleanup(SignalHandler.course_published.connect, listener)
+        self.setup_user()
+        course = get_course_by_id(self.course.id)
+        tab = xmodule_tabs.CourseTabList.get_tab_by_slug(course.tabs, 'new_tab')
+        self.assertIn("OOGIE BLOOGIE", get_static_tab_contents(get_request_for_user(self.user), course, tab))
+
+        self.page.data = "NEW CONTENT"
+        self.store.update_item(self.page, self.user.id)
+        tab_content = get_static_tab_contents(get_request_for_user(self.user), course, tab)
+        self.assertIn("NEW CONTENT", tab_content)
+        self.assertNotIn("OOGIE BLOOGIE", tab_content)
+
 
 @attr('shard_1')
 class StaticTabDateTestCaseXML(LoginEnrollmentTestCase, ModuleStoreTestCase):
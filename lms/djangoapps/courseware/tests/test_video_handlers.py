@@ -24,6 +24,7 @@ from cache_toolbox.core import del_cached_content
 from xmodule.exceptions import NotFoundError
 
 from xmodule.video_module.transcripts_utils import (
+    Transcript,
     TranscriptException,
     TranscriptsGenerationException,
 )
@@ -248,6 +249,24 @@ class TestTranscriptAvailableTranslationsDispatch(TestVideo):
         response = self.item.transcript(request=request, dispatch='available_translations')
         self.assertEqual(json.loads(response.body), ['en', 'uk'])
 
+    def test_available_translations_asset_index(self):
+        request = Request.blank('/available_translations')
+        response = self.item.transcript(request=request, dispatch='available_translations')
+        self.assertEqual(response.status, '404 Not Found')
+
+        # The index of the assets of the course is kept current on upload and
+        # delete, and the transcripts are not looked up one by one.
+        filename = os.path.split(self.srt_file.name)[1]
+        _upload_file(self.srt_file, self.item_descriptor.location, filename)
+        with patch.object(Transcript, 'asset') as mock_asset:
+            response = self.item.transcript(request=request, dispatch='available_translations')
+        self.assertFalse(mock_asset.called)
+        self.assertEqual(json.loads(response.body), ['uk'])
+
+        Transcript.delete_asset(self.item_descriptor.location, filename)
+        response = self.item.transcript(request=request, dispatch='available_translations')
+        self.assertEqual(response.status, '404 Not Found')
+
 
 @attr('shard_1')
 @ddt.ddt
@@ -232,6 +232,53 @@ class ViewsTestCase(ModuleStoreTestCase):
         mock_user.is_authenticated.return_value = False
         self.assertEqual(views.user_groups(mock_user), [])
 
+    @patch.dict(settings.FEATURES, {'DISPLAY_HISTOGRAMS_TO_STAFF': True})
+    def test_staff_grade_histograms(self):
+        StudentModuleFactory.create(
+            course_id=self.course_key,
+            module_state_key=self.component.location,
+            student=self.user,
+            grade=1,
+            max_grade=1,
+        )
+        usage_ids = [unicode(self.component.location), unicode(self.vertical.location)]
+        url = reverse('staff_grade_histograms', kwargs={'course_id': unicode(self.course_key)})
+
+        # Only staff can see the histograms.
+        self.client.login(username=self.user.username, password='123456')
+        response = self.client.get(url, {'usage_id': usage_ids})
+        self.assertEqual(response.status_code, 404)
+
+        admin = AdminFactory()
+        self.client.login(username=admin.username, password='test')
+        response = self.client.get(url, {'usage_id': usage_ids})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), {
+            usage_ids[0]: [[1.0, 1]],
+            usage_ids[1]: [],
+        })
+
+        # The histograms are cached for a few minutes.
+        StudentModuleFactory.create(
+            course_id=self.course_key,
+            module_state_key=self.component.location,
+            student=admin,
+            grade=0,
+            max_grade=1,
+        )
+        response = self.client.get(url, {'usage_id': usage_ids[0]})
+        self.assertEqual(json.loads(response.content), {usage_ids[0]: [[1.0, 1]]})
+
+        response = self.client.get(url, {'usage_id': 'not a usage id'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_staff_grade_histograms_disabled(self):
+        admin = AdminFactory()
+        self.client.login(username=admin.username, password='test')
+        url = reverse('staff_grade_histograms', kwargs={'course_id': unicode(self.course_key)})
+        response = self.client.get(url, {'usage_id': unicode(self.component.location)})
+        self.assertEqual(response.status_code, 404)
+
     def test_get_current_child(self):
         self.assertIsNone(views.get_current_child(MagicMock()))
         mock_xmodule = MagicMock()
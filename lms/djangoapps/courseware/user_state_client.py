@@ -14,6 +14,8 @@ except ImportError:
 
 import dogstats_wrapper as dog_stats_api
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 from xblock.fields import Scope, ScopeBase
 from courseware.models import StudentModule, StudentModuleHistory
 from edx_user_state_client.interface import XBlockUserStateClient, XBlockUserState
@@ -68,6 +70,9 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
                 the user state.
         """
         self.user = user
+        # The StudentModules read or written by this client, as of their last
+        # read or write, by username and usage key.
+        self._student_modules = {}
 
     def _get_student_modules(self, username, block_keys):
         """
@@ -93,6 +98,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
             for student_module in query:
                 usage_key = student_module.module_state_key.map_into_course(student_module.course_id)
+                self._student_modules[(username, usage_key)] = student_module
                 yield (student_module, usage_key)
 
     def _ddog_increment(self, evt_time, evt_name):
@@ -180,28 +186,57 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
 
-        # We do a find_or_create for every block (rather than re-using field objects
-        # that were queried in get_many) so that if the score has
-        # been changed by some other piece of the code, we don't overwrite
-        # that score.
         if self.user is not None and self.user.username == username:
             user = self.user
         else:
             user = User.objects.get(username=username)
 
         evt_time = time()
+        self._set_student_modules(user, block_keys_to_state, evt_time)
 
-        for usage_key, state in block_keys_to_state.items():
-            student_module, created = StudentModule.objects.get_or_create(
-                student=user,
-                course_id=usage_key.course_key,
-                module_state_key=usage_key,
-                defaults={
-                    'state': json.dumps(state),
-                    'module_type': usage_key.block_type,
-                },
+        # Event for the entire set_many call.
+        self._ddog_histogram(evt_time, 'set_many.blks_updated', len(block_keys_to_state))
+
+    def _set_student_modules(self, user, block_keys_to_state, evt_time, retry_create=True):
+        """
+        Update the StudentModules of ``user`` with the supplied states, and
+        create those that don't exist.
+
+        Arguments:
+            user (:class:`~User`): The user whose StudentModules are set.
+            block_keys_to_state (dict): A dict mapping UsageKeys to state dicts.
+            evt_time (float): The time of the set_many call, for DataDog events.
+            retry_create (bool): Whether to update the StudentModules again if
+                some of them were created concurrently while creating them.
+        """
+        username = user.username
+
+        # Only the state of existing StudentModules is updated, so that a
+        # score changed by some other piece of the code isn't overwritten, and
+        # StudentModules already read by this client need not be read again.
+        # Those of problems are, though, to record their current score in
+        # their history.
+        student_modules = {}
+        unread_keys = []
+        for usage_key in block_keys_to_state:
+            student_module = self._student_modules.get((username, usage_key))
+            if student_module is None or student_module.module_type in StudentModuleHistory.HISTORY_SAVING_TYPES:
+                unread_keys.append(usage_key)
+            else:
+                student_modules[usage_key] = student_module
+        if unread_keys:
+            student_modules.update(
+                (usage_key, student_module)
+                for student_module, usage_key in self._get_student_modules(username, unread_keys)
             )
 
+        modified = timezone.now()
+        new_block_keys_to_state = {}
+        history_entries = []
+        for usage_key, state in block_keys_to_state.items():
+            student_module = student_modules.get(usage_key)
+            created = student_module is None
+
             num_fields_before = num_fields_after = num_new_fields_set = len(state)
             num_fields_updated = 0
             if not created:
@@ -213,10 +248,23 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
                 current_state.update(state)
                 num_fields_after = len(current_state)
                 student_module.state = json.dumps(current_state)
-                # We just read this object, so we know that we can do an update
-                student_module.save(force_update=True)
+                student_module.modified = modified
+                updated = StudentModule.objects.filter(id=student_module.id).update(
+                    state=student_module.state,
+                    modified=modified,
+                )
+                if not updated:
+                    # The StudentModule was deleted since it was read, so it
+                    # is created again, with only the supplied state.
+                    self._student_modules.pop((username, usage_key), None)
+                    created = True
+                    num_fields_before = num_fields_after = len(state)
+                elif student_module.module_type in StudentModuleHistory.HISTORY_SAVING_TYPES:
+                    history_entries.append(StudentModuleHistory.for_student_module(student_module))
+            if created:
+                new_block_keys_to_state[usage_key] = state
 
-            # The rest of this method exists only to submit DataDog events.
+            # The rest of this loop exists only to submit DataDog events.
             # Remove it once we're no longer interested in the data.
             #
             # Record whether a state row has been created or updated.
@@ -236,8 +284,67 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
             num_fields_updated = max(0, len(state) - num_new_fields_set)
             self._ddog_histogram(evt_time, 'set_many.fields_updated', num_fields_updated)
 
-        # Event for the entire set_many call.
-        self._ddog_histogram(evt_time, 'set_many.blks_updated', len(block_keys_to_state))
+        if history_entries:
+            StudentModuleHistory.objects.bulk_create(history_entries)
+        if new_block_keys_to_state:
+            self._create_student_modules(user, new_block_keys_to_state, evt_time, retry_create)
+
+    def _create_student_modules(self, user, block_keys_to_state, evt_time, retry_create=True):
+        """
+        Create the StudentModules of ``user`` with the supplied states, along
+        with the history of those of problems.
+
+        Arguments:
+            user (:class:`~User`): The user to create StudentModules for.
+            block_keys_to_state (dict): A dict mapping UsageKeys to state dicts.
+            evt_time (float): The time of the set_many call, for DataDog events.
+            retry_create (bool): Whether to update the StudentModules instead
+                if some of them were created concurrently.  Otherwise the
+                IntegrityError is raised.
+        """
+        student_modules = [
+            StudentModule(
+                student=user,
+                course_id=usage_key.course_key,
+                module_state_key=usage_key,
+                state=json.dumps(state),
+                module_type=usage_key.block_type,
+            )
+            for usage_key, state in block_keys_to_state.items()
+        ]
+
+        savepoint = transaction.savepoint()
+        try:
+            if len(student_modules) == 1:
+                # Saving a single StudentModule tells us its id, and records
+                # its history through the post_save signal.
+                student_modules[0].save(force_insert=True)
+            else:
+                StudentModule.objects.bulk_create(student_modules)
+        except IntegrityError:
+            transaction.savepoint_rollback(savepoint)
+            if not retry_create:
+                raise
+            # Some of them were created since they were looked for, so they
+            # are updated instead.  This is only tried once.
+            self._set_student_modules(user, block_keys_to_state, evt_time, retry_create=False)
+            return
+        transaction.savepoint_commit(savepoint)
+
+        if len(student_modules) == 1:
+            self._student_modules[(user.username, block_keys_to_state.keys()[0])] = student_modules[0]
+            return
+
+        history_keys = [
+            usage_key for usage_key in block_keys_to_state
+            if usage_key.block_type in StudentModuleHistory.HISTORY_SAVING_TYPES
+        ]
+        if history_keys:
+            # bulk_create doesn't tell the ids of the new StudentModules
+            StudentModuleHistory.objects.bulk_create([
+                StudentModuleHistory.for_student_module(student_module)
+                for student_module, __ in self._get_student_modules(user.username, history_keys)
+            ])
 
     def delete_many(self, username, block_keys, scope=Scope.user_state, fields=None):
         """
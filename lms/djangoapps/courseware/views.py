@@ -38,6 +38,7 @@ from courseware.courses import (
     sort_by_announcement,
     sort_by_start_date,
     UserNotEnrolled)
+from courseware.fragment_cache import cache_fragment_html, fragment_cache_key, get_cached_fragment_html
 from courseware.masquerade import setup_masquerade
 from openedx.core.djangoapps.credit.api import (
     get_credit_requirement_status,
@@ -75,6 +76,7 @@ from opaque_keys import InvalidKeyError
 from util.milestones_helpers import get_prerequisite_courses_display
 
 from microsite_configuration import microsite
+from openedx.core.lib.xblock_utils import grade_histograms
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from opaque_keys.edx.keys import CourseKey, UsageKey
 from instructor.enrollment import uses_shib
@@ -84,6 +86,7 @@ from util.db import commit_on_success_with_read_committed
 import survey.utils
 import survey.views
 
+from util.json_request import JsonResponse
 from util.views import ensure_valid_course_key
 from eventtracking import tracker
 import analytics
@@ -95,6 +98,9 @@ template_imports = {'urllib': urllib}
 
 CONTENT_DEPTH = 2
 
+# Number of grade histograms which can be fetched by a single request.
+MAX_GRADE_HISTOGRAMS = 100
+
 
 def user_groups(user):
     """
@@ -1158,6 +1164,37 @@ def submission_history(request, course_id, student_username, location):
     return render_to_response('courseware/submission_history.html', context)
 
 
+@login_required
+@require_GET
+@ensure_valid_course_key
+def staff_grade_histograms(request, course_id):
+    """
+    Returns, as JSON, the grade histograms of the problems whose usage ids
+    are given by the `usage_id` query parameters, keyed by usage id.
+
+    The staff debug panels of a unit fetch the histograms of all of its
+    problems with a single request, once the page is loaded.
+    """
+    if not settings.FEATURES.get('DISPLAY_HISTOGRAMS_TO_STAFF'):
+        raise Http404
+
+    course_key = SlashSeparatedCourseKey.from_deprecated_string(course_id)
+    get_course_with_access(request.user, 'staff', course_key)
+
+    usage_ids = request.GET.getlist('usage_id')
+    if len(usage_ids) > MAX_GRADE_HISTOGRAMS:
+        return HttpResponseBadRequest(_(u'Too many problems.'))
+    try:
+        usage_keys = [UsageKey.from_string(usage_id).map_into_course(course_key) for usage_id in usage_ids]
+    except InvalidKeyError:
+        return HttpResponseBadRequest(escape(_(u'Invalid location.')))
+
+    histograms = grade_histograms(usage_keys)
+    return JsonResponse(dict(
+        (usage_id, histograms[usage_key]) for usage_id, usage_key in zip(usage_ids, usage_keys)
+    ))
+
+
 def notification_image_for_tab(course_tab, user, course):
     """
     Returns the notification image path for the given course_tab if applicable, otherwise None.
@@ -1185,8 +1222,14 @@ def get_static_tab_contents(request, course, tab):
         tab.type,
         tab.url_slug,
     )
+    descriptor = modulestore().get_item(loc)
+    cache_key = fragment_cache_key(request.user, course, descriptor)
+    html = get_cached_fragment_html(request, cache_key)
+    if html is not None:
+        return html
+
     field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
-        course.id, request.user, modulestore().get_item(loc), depth=0
+        course.id, request.user, descriptor, depth=0
     )
     tab_module = get_module(
         request.user, request, loc, field_data_cache, static_asset_path=course.static_asset_path, course=course
@@ -1203,6 +1246,8 @@ def get_static_tab_contents(request, course, tab):
             log.exception(
                 u"Error rendering course=%s, tab=%s", course, tab['url_slug']
             )
+        else:
+            cache_fragment_html(request, cache_key, html)
 
     return html
 
@@ -31,7 +31,7 @@ from django_comment_client.base.views import (
     get_thread_created_event_data,
     track_forum_event,
 )
-from django_comment_client.utils import get_accessible_discussion_modules, is_commentable_cohorted
+from django_comment_client.utils import get_accessible_discussion_summaries, is_commentable_cohorted
 from lms.lib.comment_client.comment import Comment
 from lms.lib.comment_client.thread import Thread
 from lms.lib.comment_client.utils import CommentClientRequestError
@@ -181,7 +181,7 @@ def get_course_topics(request, course_key):
         return module.sort_key or module.discussion_target
 
     course = _get_course_or_404(course_key, request.user)
-    discussion_modules = get_accessible_discussion_modules(course, request.user)
+    discussion_modules = get_accessible_discussion_summaries(course, request.user)
     modules_by_category = defaultdict(list)
     for module in discussion_modules:
         modules_by_category[module.discussion_category].append(module)
@@ -0,0 +1,3 @@
+# importing signals is necessary to activate signal handler, which invalidates
+# the cached discussion module summaries every time a course is published
+import django_comment_client.signals  # pylint: disable=unused-import
@@ -0,0 +1,18 @@
+"""
+Signal handlers for invalidating cached discussion data.
+"""
+from django.dispatch.dispatcher import receiver
+
+from openedx.core.lib.cache_utils import reset_version_stamp
+from xmodule.modulestore.django import SignalHandler
+
+
+@receiver(SignalHandler.course_published)
+def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Catches the signal that a course has been published in Studio and
+    invalidates the cached discussion module summaries of that course.
+    """
+    # Import here to avoid a circular import.
+    from django_comment_client.utils import discussion_summaries_version_stamp_name
+    reset_version_stamp(discussion_summaries_version_stamp_name(course_key))
@@ -10,6 +10,35 @@ class MockCommentServiceRequestHandler(BaseHTTPRequestHandler):
     '''
     protocol = "HTTP/1.0"
 
+    def do_GET(self):
+        '''
+        Handle a GET request from the client
+        Used by the APIs for retrieving comment threads, comments and users
+        '''
+        logger.debug("Comment Service received GET request to path %s", self.path)
+        self.server.get_paths.append(self.path)
+
+        if 'X-Edx-Api-Key' in self.headers:
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+            self.wfile.write(self.server._response_str)
+        else:
+            self.send_response(500, 'Bad Request: does not contain API key')
+            self.send_header('Content-type', 'text/plain')
+            self.end_headers()
+
+    def do_DELETE(self):
+        '''
+        Handle a DELETE request from the client
+        Used by the APIs for deleting comment threads and comments
+        '''
+        logger.debug("Comment Service received DELETE request to path %s", self.path)
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.end_headers()
+        self.wfile.write(self.server._response_str)
+
     def do_POST(self):
         '''
         Handle a POST request from the client
@@ -90,7 +119,7 @@ class MockCommentServiceRequestHandler(BaseHTTPRequestHandler):
 class MockCommentServiceServer(HTTPServer):
     '''
     A mock Comment Service server that responds
-    to POST requests to localhost.
+    to GET, POST, PUT and DELETE requests to localhost.
     '''
     def __init__(self, port_num,
                  response={'username': 'new', 'external_id': 1}):
@@ -101,6 +130,8 @@ class MockCommentServiceServer(HTTPServer):
             and sent in response to comment service requests.
         '''
         self._response_str = json.dumps(response)
+        # Paths of the GET requests received, in order
+        self.get_paths = []
 
         handler = MockCommentServiceRequestHandler
         address = ('', port_num)
@@ -0,0 +1,62 @@
+"""
+Tests for the HTTP layer of the comments service client.
+"""
+import threading
+
+from django.test import TestCase
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+
+from django_comment_client.tests.mock_cs_server.mock_cs_server import MockCommentServiceServer
+from lms.lib.comment_client import utils
+from request_cache.middleware import RequestCache
+
+
+@override_settings(COMMENTS_SERVICE_KEY='test_api_key')
+class PerformRequestTestCase(TestCase):
+    """
+    Runs `perform_request` against a local fake comments service.
+    """
+    def setUp(self):
+        super(PerformRequestTestCase, self).setUp()
+        self.server = MockCommentServiceServer(port_num=0, response={'id': 'abc', 'username': 'robot'})
+        self.addCleanup(self.server.shutdown)
+        server_thread = threading.Thread(target=self.server.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+        self.url = 'http://127.0.0.1:{}/api/v1/users/1'.format(self.server.server_address[1])
+        self.addCleanup(RequestCache.clear_request_cache)
+
+    def start_request(self):
+        """
+        Simulates the start of a request, as seen by the request cache.
+        """
+        RequestCache().process_request(RequestFactory().get('/'))
+
+    def test_session_is_shared(self):
+        self.assertIs(utils.get_session(), utils.get_session())
+
+    def test_identical_gets_are_coalesced_within_a_request(self):
+        self.start_request()
+        first = utils.perform_request('get', self.url, {'course_id': 'a/b/c'})
+        second = utils.perform_request('get', self.url, {'course_id': 'a/b/c'})
+        self.assertEqual(first, {'id': 'abc', 'username': 'robot'})
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertEqual(len(self.server.get_paths), 1)
+
+        # Different parameters are a different request
+        utils.perform_request('get', self.url, {'course_id': 'd/e/f'})
+        self.assertEqual(len(self.server.get_paths), 2)
+
+    def test_write_clears_coalesced_gets(self):
+        self.start_request()
+        utils.perform_request('get', self.url)
+        utils.perform_request('delete', self.url)
+        utils.perform_request('get', self.url)
+        self.assertEqual(len(self.server.get_paths), 2)
+
+    def test_no_coalescing_outside_a_request(self):
+        utils.perform_request('get', self.url)
+        utils.perform_request('get', self.url)
+        self.assertEqual(len(self.server.get_paths), 2)
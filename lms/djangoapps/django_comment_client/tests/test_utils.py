@@ -23,7 +23,7 @@ from student.tests.factories import UserFactory, AdminFactory, CourseEnrollmentF
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
 from openedx.core.djangoapps.util.testing import ContentGroupTestCase
 from student.roles import CourseStaffRole
-from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory, check_mongo_calls
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase, TEST_DATA_MIXED_TOY_MODULESTORE
 from xmodule.modulestore.django import modulestore
 from opaque_keys.edx.locator import CourseLocator
@@ -894,6 +894,22 @@ class CategoryMapTestCase(CategoryMapTestMixin, ModuleStoreTestCase):
             ["Topic_A", "Topic_B", "Topic_C", "discussion1", "discussion2", "discussion3"]
         )
 
+    def test_summaries_cached(self):
+        self.create_discussion("Chapter 1", "Discussion 1")
+        utils.get_discussion_category_map(self.course, self.user)
+        with check_mongo_calls(0):
+            utils.get_discussion_category_map(self.course, self.user)
+            utils.get_discussion_categories_ids(self.course, self.user)
+
+    def test_summaries_invalidated_on_publish(self):
+        self.create_discussion("Chapter 1", "Discussion 1")
+        self.assertItemsEqual(utils.get_discussion_categories_ids(self.course, self.user), ["discussion1"])
+        self.create_discussion("Chapter 1", "Discussion 2")
+        self.assertItemsEqual(
+            utils.get_discussion_categories_ids(self.course, self.user),
+            ["discussion1", "discussion2"]
+        )
+
 
 @attr('shard_1')
 class ContentGroupCategoryMapTestCase(CategoryMapTestMixin, ContentGroupTestCase):
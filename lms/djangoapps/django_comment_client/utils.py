@@ -1,10 +1,11 @@
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from datetime import datetime
 import json
 import logging
 
 import pytz
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.db import connection
 from django.http import HttpResponse
@@ -18,9 +19,10 @@ from django_comment_common.models import Role, FORUM_ROLE_STUDENT
 from django_comment_client.permissions import check_permissions_by_view, has_permission, get_team
 from django_comment_client.settings import MAX_COMMENT_DEPTH
 from edxmako import lookup_template
+from openedx.core.lib.cache_utils import course_edit_version, get_version_stamp
 
 from courseware import courses
-from courseware.access import has_access
+from courseware.access import has_access, CourseAccessEvaluator
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
 from openedx.core.djangoapps.course_groups.cohorts import (
     get_course_cohort_settings, get_cohort_by_id, get_cohort_id, is_course_cohorted
@@ -30,6 +32,23 @@ from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 
 log = logging.getLogger(__name__)
 
+DISCUSSION_SUMMARIES_CACHE_TIMEOUT = 60 * 60 * 24  # 1 day
+
+# The subset of a discussion module's fields needed to build the category map
+# and to decide whether a user can load the module.  Instances are cached per
+# course so that the forum does not have to load every discussion module.
+DiscussionModuleSummary = namedtuple('DiscussionModuleSummary', [
+    'location',
+    'discussion_id',
+    'discussion_category',
+    'discussion_target',
+    'sort_key',
+    'start',
+    'days_early_for_beta',
+    'visible_to_staff_only',
+    'merged_group_access',
+])
+
 
 def extract(dic, keys):
     return {k: dic.get(k) for k in keys}
@@ -106,6 +125,90 @@ def get_accessible_discussion_modules(course, user, include_all=False):  # pylin
     ]
 
 
+def discussion_summaries_version_stamp_name(course_key):
+    """
+    Returns the name of the version stamp included in the cache key of the
+    discussion module summaries of the given course.
+    """
+    return u"django_comment_client.discussion_summaries.{}".format(course_key)
+
+
+def _discussion_summaries_cache_key(course):
+    """
+    Returns the cache key under which the discussion module summaries of the
+    given course are stored.
+
+    The key changes when the course is edited in Studio, which bumps its
+    subtree_edited_on, and when it is published by this process.
+    """
+    return u"django_comment_client.discussion_summaries.{}.{}.{}".format(
+        course.id,
+        course_edit_version(course),
+        get_version_stamp(discussion_summaries_version_stamp_name(course.id)),
+    )
+
+
+def get_discussion_module_summaries(course):
+    """
+    Return a list of `DiscussionModuleSummary` for every valid discussion
+    module in this course, regardless of user access.
+
+    The list is cached per course version.
+    """
+    cache_key = _discussion_summaries_cache_key(course)
+    summaries = cache.get(cache_key)
+    if summaries is None:
+        summaries = [
+            DiscussionModuleSummary(
+                location=module.location,
+                discussion_id=module.discussion_id,
+                discussion_category=module.discussion_category,
+                discussion_target=module.discussion_target,
+                sort_key=module.sort_key,
+                start=module.start,
+                days_early_for_beta=module.days_early_for_beta,
+                visible_to_staff_only=module.visible_to_staff_only,
+                merged_group_access=module.merged_group_access,
+            )
+            for module in modulestore().get_items(course.id, qualifiers={'category': 'discussion'})
+            if has_required_keys(module)
+        ]
+        cache.set(cache_key, summaries, DISCUSSION_SUMMARIES_CACHE_TIMEOUT)
+    return summaries
+
+
+class DiscussionSummaryAccessChecker(object):
+    """
+    Decides whether a user can load discussion modules from their cached
+    `DiscussionModuleSummary`, without loading the modules themselves.
+
+    The checks are those of `courseware.access.CourseAccessEvaluator`, so the
+    user's staff access and partition groups are looked up once and reused
+    for every summary.
+    """
+    def __init__(self, course, user):
+        self.user_partitions = course.user_partitions
+        self.evaluator = CourseAccessEvaluator(user, course.id)
+
+    def has_load_access(self, summary):
+        """
+        Returns True iff the user can load the discussion module described by `summary`.
+        """
+        return bool(self.evaluator.has_load_access_to_summary(summary, self.user_partitions))
+
+
+def get_accessible_discussion_summaries(course, user, include_all=False):  # pylint: disable=invalid-name
+    """
+    Return the `DiscussionModuleSummary` of all valid discussion modules in
+    this course that are accessible to the given user.
+    """
+    summaries = get_discussion_module_summaries(course)
+    if include_all:
+        return list(summaries)
+    checker = DiscussionSummaryAccessChecker(course, user)
+    return [summary for summary in summaries if checker.has_load_access(summary)]
+
+
 def get_discussion_id_map_entry(module):
     """
     Returns a tuple of (discussion_id, metadata) suitable for inclusion in the results of get_discussion_id_map().
@@ -164,7 +267,7 @@ def get_discussion_id_map(course, user):
     Transform the list of this course's discussion modules (visible to a given user) into a dictionary of metadata keyed
     by discussion_id.
     """
-    return dict(map(get_discussion_id_map_entry, get_accessible_discussion_modules(course, user)))
+    return dict(map(get_discussion_id_map_entry, get_accessible_discussion_summaries(course, user)))
 
 
 def _filter_unstarted_categories(category_map):
@@ -264,7 +367,7 @@ def get_discussion_category_map(course, user, cohorted_if_in_list=False, exclude
     """
     unexpanded_category_map = defaultdict(list)
 
-    modules = get_accessible_discussion_modules(course, user)
+    modules = get_accessible_discussion_summaries(course, user)
 
     course_cohort_settings = get_course_cohort_settings(course.id)
 
@@ -379,7 +482,8 @@ def get_discussion_categories_ids(course, user, include_all=False):
 
     """
     accessible_discussion_ids = [
-        module.discussion_id for module in get_accessible_discussion_modules(course, user, include_all=include_all)
+        summary.discussion_id
+        for summary in get_accessible_discussion_summaries(course, user, include_all=include_all)
     ]
     return course.top_level_discussion_topic_ids + accessible_discussion_ids
 
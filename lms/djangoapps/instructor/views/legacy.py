@@ -33,7 +33,7 @@ from xmodule.modulestore.django import modulestore
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
 from courseware import grades
-from courseware.access import has_access
+from courseware.access import has_access, user_ids_with_staff_access
 from courseware.courses import get_course_with_access, get_cms_course_link
 from courseware.models import StudentModule
 from django_comment_common.models import FORUM_ROLE_ADMINISTRATOR
@@ -802,9 +802,10 @@ def _do_enroll_students(course, course_key, students, secure=False, overload=Fal
     status = dict([x, 'unprocessed'] for x in new_students)
 
     if overload:  # delete all but staff
-        todelete = CourseEnrollment.objects.filter(course_id=course_key)
+        todelete = CourseEnrollment.objects.filter(course_id=course_key).select_related('user')
+        staff_ids = user_ids_with_staff_access([enrollee.user_id for enrollee in todelete], course_key)
         for enrollee in todelete:
-            if not has_access(enrollee.user, 'staff', course) and enrollee.user.email.lower() not in new_students_lc:
+            if enrollee.user_id not in staff_ids and enrollee.user.email.lower() not in new_students_lc:
                 status[enrollee.user.email] = 'deleted'
                 enrollee.deactivate()
             else:
@@ -15,7 +15,8 @@ from django.core.urlresolvers import reverse
 import xmodule.graders as xmgraders
 from django.core.exceptions import ObjectDoesNotExist
 from microsite_configuration import microsite
-from student.models import CourseEnrollmentAllowed
+from student.models import CourseEnrollmentAllowed, UserProfile
+from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 from edx_proctoring.api import get_all_exam_attempts
 
 
@@ -37,6 +38,9 @@ AVAILABLE_FEATURES = STUDENT_FEATURES + PROFILE_FEATURES
 COURSE_REGISTRATION_FEATURES = ('code', 'course_id', 'created_by', 'created_at', 'is_valid')
 COUPON_FEATURES = ('code', 'course_id', 'percentage_discount', 'description', 'expiration_date', 'is_active')
 
+# Number of students fetched per query by iter_enrolled_students_features.
+ENROLLED_STUDENTS_CHUNK_SIZE = 1000
+
 
 def sale_order_record_features(course_id, features):
     """
@@ -219,6 +223,76 @@ def enrolled_students_features(course_key, features):
     return [extract_student(student, features) for student in students]
 
 
+def iter_enrolled_students_features(course_key, features, chunk_size=ENROLLED_STUDENTS_CHUNK_SIZE):
+    """
+    Yield the same student features dictionaries as `enrolled_students_features`,
+    without loading every enrolled student in memory.
+
+    Students are fetched `chunk_size` at a time, paginated on their unique
+    username, and only the columns of the requested features are read.
+    Profile and cohort features of each chunk are fetched with one query each.
+    """
+    student_features = [x for x in STUDENT_FEATURES if x in features]
+    profile_features = [x for x in PROFILE_FEATURES if x in features]
+    meta_features = [(feature, feature.split('.')[1]) for feature in features if 'meta.' in feature]
+    include_cohort_column = 'cohort' in features
+
+    profile_columns = list(profile_features)
+    if meta_features and 'meta' not in profile_columns:
+        profile_columns.append('meta')
+
+    students = User.objects.filter(
+        courseenrollment__course_id=course_key,
+        courseenrollment__is_active=1,
+    ).order_by('username').values(
+        'id', 'username', *[feature for feature in student_features if feature not in ('id', 'username')]
+    )
+
+    last_username = None
+    while True:
+        chunk = students if last_username is None else students.filter(username__gt=last_username)
+        chunk = list(chunk[:chunk_size])
+        if not chunk:
+            return
+        last_username = chunk[-1]['username']
+        user_ids = [student['id'] for student in chunk]
+
+        profiles = {}
+        if profile_columns:
+            profiles = dict(
+                (profile['user_id'], profile)
+                for profile in UserProfile.objects.filter(user_id__in=user_ids).values('user_id', *profile_columns)
+            )
+
+        cohorts = {}
+        if include_cohort_column:
+            memberships = CourseUserGroup.users.through.objects.filter(
+                user_id__in=user_ids,
+                courseusergroup__course_id=course_key,
+            ).values_list('user_id', 'courseusergroup__name')
+            for user_id, cohort_name in memberships:
+                cohorts.setdefault(user_id, cohort_name)
+
+        for student in chunk:
+            student_dict = dict((feature, student[feature]) for feature in student_features)
+            profile = profiles.get(student['id'])
+            if profile is not None:
+                student_dict.update((feature, profile[feature]) for feature in profile_features)
+
+                # now fetch the requested meta fields
+                if meta_features:
+                    meta_dict = json.loads(profile['meta']) if profile['meta'] else {}
+                    for meta_feature, meta_key in meta_features:
+                        student_dict[meta_feature] = meta_dict.get(meta_key)
+
+            if include_cohort_column:
+                student_dict['cohort'] = cohorts.get(student['id'], "[unassigned]")
+            yield student_dict
+
+        if len(chunk) < chunk_size:
+            return
+
+
 def list_may_enroll(course_key, features):
     """
     Return info about students who may enroll in a course as a dict.
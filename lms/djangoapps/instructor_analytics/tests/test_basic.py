@@ -17,7 +17,7 @@ from shoppingcart.models import (
 )
 from course_modes.models import CourseMode
 from instructor_analytics.basic import (
-    sale_record_features, sale_order_record_features, enrolled_students_features,
+    sale_record_features, sale_order_record_features, enrolled_students_features, iter_enrolled_students_features,
     course_registration_features, coupon_codes_features, list_may_enroll,
     AVAILABLE_FEATURES, STUDENT_FEATURES, PROFILE_FEATURES,
     get_proctored_exam_results)
@@ -116,6 +116,14 @@ class TestAnalyticsBasic(ModuleStoreTestCase):
             else:
                 self.assertEqual(report['cohort'], '[unassigned]')
 
+    def test_iter_enrolled_students_features(self):
+        query_features = ('id', 'username', 'name', 'email', 'meta.position', 'cohort')
+        expected = enrolled_students_features(self.course_key, query_features)
+        # One query each for the users, profiles and cohorts of each chunk of 7 students
+        with self.assertNumQueries(3 * 5):
+            userreports = list(iter_enrolled_students_features(self.course_key, query_features, chunk_size=7))
+        self.assertEqual(userreports, expected)
+
     def test_available_features(self):
         self.assertEqual(len(AVAILABLE_FEATURES), len(STUDENT_FEATURES + PROFILE_FEATURES))
         self.assertEqual(set(AVAILABLE_FEATURES), set(STUDENT_FEATURES + PROFILE_FEATURES))
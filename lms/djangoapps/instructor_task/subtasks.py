@@ -214,13 +214,14 @@ class SubtaskStatus(object):
         return unicode(repr(self))
 
 
-def initialize_subtask_info(entry, action_name, total_num, subtask_id_list):
+def initialize_subtask_info(entry, action_name, total_num, subtask_id_list, skipped=0):
     """
     Store initial subtask information to InstructorTask object.
 
     The InstructorTask's "task_output" field is initialized.  This is a JSON-serialized dict.
-    Counters for 'attempted', 'succeeded', 'failed', 'skipped' keys are initialized to zero,
-    as is the 'duration_ms' value.  A 'start_time' is stored for later duration calculations,
+    Counters for 'attempted', 'succeeded', 'failed' keys are initialized to zero, as is the
+    'duration_ms' value, and 'skipped' is initialized to `skipped`, the number of items that
+    were skipped before creating subtasks.  A 'start_time' is stored for later duration calculations,
     and the total number of "things to do" is set, so the user can be told how much needs to be
     done overall.  The `action_name` is also stored, to help with constructing more readable
     task_progress messages.
@@ -248,7 +249,7 @@ def initialize_subtask_info(entry, action_name, total_num, subtask_id_list):
         'action_name': action_name,
         'attempted': 0,
         'failed': 0,
-        'skipped': 0,
+        'skipped': skipped,
         'succeeded': 0,
         'total': total_num,
         'duration_ms': int(0),
@@ -351,6 +352,48 @@ def queue_subtasks_for_query(
     return progress
 
 
+def queue_subtasks_for_items(
+    entry, action_name, create_subtask_fcn, items, items_per_task, total_num=None, skipped=0
+):
+    """
+    Generates and queues subtasks to each execute a chunk of a list of "items".
+
+    Arguments:
+        `entry` : the InstructorTask object for which subtasks are being queued.
+        `action_name` : a past-tense verb that can be used for constructing readable status messages.
+        `create_subtask_fcn` : a function of two arguments that constructs the desired kind of subtask object.
+            Arguments are the list of items to be processed by this subtask, and a SubtaskStatus
+            object reflecting initial status (and containing the subtask's id).
+        `items` : the list of JSON-serializable items that should be passed to subtasks.
+        `items_per_task` : maximum number of items passed to a subtask.
+        `total_num` : total number of items of the task, including those that were skipped before
+            creating subtasks.  Defaults to the number of `items`.
+        `skipped` : number of items that were skipped before creating subtasks.
+
+    Returns:  the task progress as stored in the InstructorTask object.
+
+    """
+    item_lists = [items[index:index + items_per_task] for index in xrange(0, len(items), items_per_task)]
+    subtask_id_list = [str(uuid4()) for _ in item_lists]
+
+    TASK_LOG.info(
+        "Task %s: creating %s subtasks to process %s items.",
+        entry.task_id,
+        len(item_lists),
+        len(items),
+    )
+    if total_num is None:
+        total_num = len(items)
+    progress = initialize_subtask_info(entry, action_name, total_num, subtask_id_list, skipped)
+
+    for subtask_id, item_list in zip(subtask_id_list, item_lists):
+        subtask_status = SubtaskStatus.create(subtask_id)
+        new_subtask = create_subtask_fcn(item_list, subtask_status)
+        new_subtask.apply_async()
+
+    return progress
+
+
 def _acquire_subtask_lock(task_id):
     """
     Mark the specified task_id as being in progress.
@@ -42,6 +42,7 @@ from instructor_task.tasks_helper import (
     upload_may_enroll_csv,
     upload_exec_summary_report,
     generate_students_certificates,
+    generate_certificates_for_subtask,
     upload_proctored_exam_results_report
 )
 
@@ -250,10 +251,32 @@ def generate_certificates(entry_id, xmodule_instance_args):
         xmodule_instance_args.get('task_id'), entry_id, action_name
     )
 
-    task_fn = partial(generate_students_certificates, xmodule_instance_args)
+    task_fn = partial(
+        generate_students_certificates, xmodule_instance_args, create_subtask_fcn=_create_certificates_subtask
+    )
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def generate_certificates_subtask(entry_id, course_id, user_ids, subtask_status_dict):
+    """
+    Grade a chunk of students and generate their certificates, as a subtask
+    of `generate_certificates`.
+    """
+    return generate_certificates_for_subtask(entry_id, course_id, user_ids, subtask_status_dict)
+
+
+def _create_certificates_subtask(entry_id, course_id, user_ids, subtask_status):
+    """
+    Creates the subtask generating the certificates of the given students.
+    """
+    return generate_certificates_subtask.subtask(
+        (entry_id, unicode(course_id), user_ids, subtask_status.to_dict()),
+        task_id=subtask_status.task_id,
+        routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+    )
+
+
 @task(base=BaseInstructorTask)  # pylint: disable=E1102
 def cohort_students(entry_id, xmodule_instance_args):
     """
@@ -8,6 +8,7 @@ from collections import OrderedDict
 from datetime import datetime
 from django.conf import settings
 from eventtracking import tracker
+from functools import partial
 from itertools import chain
 from time import time
 import unicodecsv
@@ -40,20 +41,26 @@ from certificates.models import (
     certificate_info_for_user,
     CertificateStatuses
 )
-from certificates.api import generate_user_certificates
+from certificates.api import generate_certificates_for_students
 from courseware.courses import get_course_by_id, get_problems_in_section
 from courseware.grades import iterate_grades_for
 from courseware.models import StudentModule
 from courseware.model_data import DjangoKeyValueStore, FieldDataCache
 from courseware.module_render import get_module_for_descriptor_internal
-from instructor_analytics.basic import enrolled_students_features, list_may_enroll, get_proctored_exam_results
+from instructor_analytics.basic import iter_enrolled_students_features, list_may_enroll, get_proctored_exam_results
 from instructor_analytics.csvs import format_dictlist
 from instructor_task.models import ReportStore, InstructorTask, PROGRESS
+from instructor_task.subtasks import (
+    SubtaskStatus,
+    check_subtask_is_valid,
+    queue_subtasks_for_items,
+    update_subtask_status,
+)
 from lms.djangoapps.lms_xblock.runtime import LmsPartitionService
-from openedx.core.djangoapps.course_groups.cohorts import get_cohort
+from openedx.core.djangoapps.course_groups.cohorts import get_cohorts_for_users
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
-from opaque_keys.edx.keys import UsageKey
+from opaque_keys.edx.keys import CourseKey, UsageKey
 from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort, is_course_cohorted
 from student.models import CourseEnrollment, CourseAccessRole
 from verify_student.models import SoftwareSecurePhotoVerification
@@ -61,6 +68,10 @@ from verify_student.models import SoftwareSecurePhotoVerification
 # define different loggers for use within tasks and on client side
 TASK_LOG = logging.getLogger('edx.celery.task')
 
+# Number of students whose certificates are generated together, with their
+# data fetched in bulk.
+CERTIFICATE_GENERATION_CHUNK_SIZE = 100
+
 # define value to use when no task_id is provided:
 UNKNOWN_TASK_ID = 'unknown-task_id'
 FILTERED_OUT_ROLES = ['staff', 'instructor', 'finance_admin', 'sales_admin']
@@ -684,6 +695,10 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     certificate_whitelist = CertificateWhitelist.objects.filter(course_id=course_id, whitelist=True)
     whitelisted_user_ids = [entry.user_id for entry in certificate_whitelist]
 
+    student_cohorts = {}
+    if course_is_cohorted:
+        student_cohorts = get_cohorts_for_users(course_id, enrolled_students.values_list('id', flat=True))
+
     # Loop over all our students and build our CSV lists in memory
     header = None
     rows = []
@@ -735,7 +750,7 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
 
             cohorts_group_name = []
             if course_is_cohorted:
-                group = get_cohort(student, course_id, assign=False)
+                group = student_cohorts.get(student.id)
                 cohorts_group_name.append(group.name if group else '')
 
             group_configs_group_names = []
@@ -937,21 +952,24 @@ def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input
     current_step = {'step': 'Calculating Profile Info'}
     task_progress.update_task_state(extra_meta=current_step)
 
-    # compute the student features table and format it
+    # compute the student features table, streaming its rows into the CSV
     query_features = task_input.get('features')
-    student_data = enrolled_students_features(course_id, query_features)
-    header, rows = format_dictlist(student_data, query_features)
-
-    task_progress.attempted = task_progress.succeeded = len(rows)
-    task_progress.skipped = task_progress.total - task_progress.attempted
+    student_data = iter_enrolled_students_features(course_id, query_features)
 
-    rows.insert(0, header)
+    def student_rows():
+        """ Yields the CSV row of each student, counting them as they go """
+        for student_dict in student_data:
+            task_progress.attempted += 1
+            yield [student_dict.get(feature, '') for feature in query_features]
 
     current_step = {'step': 'Uploading CSV'}
     task_progress.update_task_state(extra_meta=current_step)
 
     # Perform the upload
-    upload_csv_to_report_store(rows, 'student_profile_info', course_id, start_date)
+    upload_csv_to_report_store(chain([query_features], student_rows()), 'student_profile_info', course_id, start_date)
+
+    task_progress.succeeded = task_progress.attempted
+    task_progress.skipped = task_progress.total - task_progress.attempted
 
     return task_progress.update_task_state(extra_meta=current_step)
 
@@ -1286,10 +1304,18 @@ def upload_proctored_exam_results_report(_xmodule_instance_args, _entry_id, cour
 
 
 def generate_students_certificates(
-        _xmodule_instance_args, _entry_id, course_id, task_input, action_name):  # pylint: disable=unused-argument
+        _xmodule_instance_args, entry_id, course_id, task_input, action_name,  # pylint: disable=unused-argument
+        create_subtask_fcn=None):
     """
     For a given `course_id`, generate certificates for all students
     that are enrolled.
+
+    Students are graded and their certificates requested in chunks of
+    CERTIFICATE_GENERATION_CHUNK_SIZE.  If `create_subtask_fcn` is given and
+    there are more than settings.CERTIFICATE_GENERATION_STUDENTS_PER_TASK
+    students, they are divided among subtasks created by calling
+    `create_subtask_fcn(entry_id, course_id, user_ids, subtask_status)`,
+    instead of being processed by this task.
     """
     start_time = time()
     enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
@@ -1302,27 +1328,86 @@ def generate_students_certificates(
 
     task_progress.skipped = task_progress.total - len(students_require_certs)
 
+    students_per_task = settings.CERTIFICATE_GENERATION_STUDENTS_PER_TASK
+    if create_subtask_fcn is not None and len(students_require_certs) > students_per_task:
+        return queue_subtasks_for_items(
+            InstructorTask.objects.get(pk=entry_id),
+            action_name,
+            partial(create_subtask_fcn, entry_id, course_id),
+            [student.id for student in students_require_certs],
+            students_per_task,
+            total_num=task_progress.total,
+            skipped=task_progress.skipped,
+        )
+
     current_step = {'step': 'Generating Certificates'}
     task_progress.update_task_state(extra_meta=current_step)
 
     course = modulestore().get_course(course_id, depth=0)
-    # Generate certificate for each student
-    for student in students_require_certs:
-        task_progress.attempted += 1
-        status = generate_user_certificates(
-            student,
-            course_id,
-            course=course
-        )
-
-        if status in [CertificateStatuses.generating, CertificateStatuses.downloadable]:
-            task_progress.succeeded += 1
-        else:
-            task_progress.failed += 1
+    # Generate certificates for each chunk of students
+    for students in _chunks(students_require_certs, CERTIFICATE_GENERATION_CHUNK_SIZE):
+        statuses = generate_certificates_for_students(students, course_id, course=course)
+        succeeded = _count_generated_certificates(statuses)
+        task_progress.attempted += len(students)
+        task_progress.succeeded += succeeded
+        task_progress.failed += len(students) - succeeded
 
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+def generate_certificates_for_subtask(entry_id, course_id, user_ids, subtask_status_dict):
+    """
+    Generate certificates for the students with the given `user_ids`, as a
+    subtask of `generate_students_certificates`, and record the results in
+    the subtask status of the InstructorTask `entry_id`.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    TASK_LOG.info(
+        u"Task %s: generating certificates for %d students of course %s as subtask of instructor task %d",
+        current_task_id, len(user_ids), course_id, entry_id
+    )
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    course_key = CourseKey.from_string(course_id)
+    course = modulestore().get_course(course_key, depth=0)
+    students = list(User.objects.filter(id__in=user_ids))
+    try:
+        for chunk in _chunks(students, CERTIFICATE_GENERATION_CHUNK_SIZE):
+            statuses = generate_certificates_for_students(chunk, course_key, course=course)
+            succeeded = _count_generated_certificates(statuses)
+            subtask_status.increment(succeeded=succeeded, failed=len(chunk) - succeeded)
+    except Exception:
+        # Count the students that were not processed as failed, to keep the counts consistent.
+        TASK_LOG.exception(u"Task %s: certificate generation subtask failed unexpectedly!", current_task_id)
+        subtask_status.increment(failed=len(user_ids) - subtask_status.attempted, state=FAILURE)
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+        raise
+
+    subtask_status.increment(state=SUCCESS)
+    update_subtask_status(entry_id, current_task_id, subtask_status)
+    return subtask_status.to_dict()
+
+
+def _chunks(items, chunk_size):
+    """
+    Yields successive chunks of at most `chunk_size` items of the list `items`.
+    """
+    for index in xrange(0, len(items), chunk_size):
+        yield items[index:index + chunk_size]
+
+
+def _count_generated_certificates(statuses):
+    """
+    Returns the number of certificates whose generation was requested, in
+    the dict of statuses returned by `generate_certificates_for_students`.
+    """
+    return sum(
+        1 for status in statuses.itervalues()
+        if status in [CertificateStatuses.generating, CertificateStatuses.downloadable]
+    )
+
+
 def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
     """
     Within a given course, cohort students in bulk, then upload the results
@@ -7,9 +7,13 @@ Tests that CSV grade report generation works with unicode emails.
 
 """
 import ddt
+import json
 from mock import Mock, patch
 import tempfile
 import unicodecsv
+from uuid import uuid4
+
+from celery.states import SUCCESS
 from django.core.urlresolvers import reverse
 from django.test.utils import override_settings
 
@@ -30,7 +34,9 @@ from student.models import CourseEnrollment, CourseEnrollmentAllowed, ManualEnro
 from verify_student.tests.factories import SoftwareSecurePhotoVerificationFactory
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.partitions.partitions import Group, UserPartition
-from instructor_task.models import ReportStore
+from instructor_task.models import InstructorTask, ReportStore
+from instructor_task.tasks import _create_certificates_subtask
+from instructor_task.tests.factories import InstructorTaskFactory
 from instructor_task.tasks_helper import (
     cohort_students_and_upload,
     upload_grades_csv,
@@ -40,6 +46,7 @@ from instructor_task.tasks_helper import (
     upload_enrollment_report,
     upload_exec_summary_report,
     generate_students_certificates,
+    generate_certificates_for_subtask,
 )
 from openedx.core.djangoapps.util.testing import ContentGroupTestCase, TestConditionalContent
 
@@ -859,6 +866,19 @@ class TestStudentReport(TestReportMixin, InstructorTaskCourseTestCase):
         self.assertEquals(len(links), 1)
         self.assertDictContainsSubset({'attempted': 1, 'succeeded': 1, 'failed': 0}, result)
 
+    def test_missing_feature_cells(self):
+        """
+        Test that every row has a cell for each header column, even for
+        features the student data doesn't hold.
+        """
+        self.create_student('student', 'student@example.com')
+        task_input = {'features': ['username', 'unknown_feature', 'email']}
+        with patch('instructor_task.tasks_helper._get_current_task'):
+            upload_students_csv(None, None, self.course.id, task_input, 'calculated')
+        self.verify_rows_in_csv([
+            {'username': 'student', 'unknown_feature': '', 'email': 'student@example.com'},
+        ])
+
     @ddt.data([u'student', u'student\xec'])
     def test_unicode_usernames(self, students):
         """
@@ -1313,11 +1333,11 @@ class TestCertificateGeneration(InstructorTaskModuleTestCase):
         super(TestCertificateGeneration, self).setUp()
         self.initialize_course()
 
-    def test_certificate_generation_for_students(self):
+    def _create_students(self):
         """
-        Verify that certificates generated for all eligible students enrolled in a course.
+        Creates 10 students, 2 of which already have certificates and 5 of
+        which are white-listed.  Returns the students without certificates.
         """
-        # create 10 students
         students = [self.create_student(username='student_{}'.format(i), email='student_{}@example.com'.format(i))
                     for i in xrange(1, 11)]
 
@@ -1334,9 +1354,17 @@ class TestCertificateGeneration(InstructorTaskModuleTestCase):
         for student in students[2:7]:
             CertificateWhitelistFactory.create(user=student, course_id=self.course.id, whitelist=True)
 
+        return students[2:]
+
+    def test_certificate_generation_for_students(self):
+        """
+        Verify that certificates generated for all eligible students enrolled in a course.
+        """
+        self._create_students()
+
         current_task = Mock()
         current_task.update_state = Mock()
-        with self.assertNumQueries(125):
+        with self.assertNumQueries(84):
             with patch('instructor_task.tasks_helper._get_current_task') as mock_current_task:
                 mock_current_task.return_value = current_task
                 with patch('capa.xqueue_interface.XQueueInterface.send_to_queue') as mock_queue:
@@ -1353,3 +1381,54 @@ class TestCertificateGeneration(InstructorTaskModuleTestCase):
             },
             result
         )
+
+    @override_settings(CERTIFICATE_GENERATION_STUDENTS_PER_TASK=3)
+    def test_certificate_generation_in_subtasks(self):
+        """
+        Verify that the students are divided among subtasks, whose counts add
+        up to those of a single task.
+        """
+        students = self._create_students()
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_key='dummy_task_key',
+            task_type='generate_certificates_all_student',
+        )
+
+        with patch('instructor_task.tasks_helper._get_current_task'):
+            with patch('capa.xqueue_interface.XQueueInterface.send_to_queue') as mock_queue:
+                mock_queue.return_value = (0, "Successfully queued")
+                with patch(
+                    'instructor_task.tasks.generate_certificates_for_subtask', wraps=generate_certificates_for_subtask
+                ) as mock_subtask:
+                    progress = generate_students_certificates(
+                        None, entry.id, self.course.id, None, 'certificates generated',
+                        create_subtask_fcn=_create_certificates_subtask,
+                    )
+
+        # the initial progress of the task counts the skipped students
+        self.assertDictContainsSubset(
+            {'total': 10, 'attempted': 0, 'succeeded': 0, 'failed': 0, 'skipped': 2},
+            progress
+        )
+        subtask_user_ids = [call_args[0][2] for call_args in mock_subtask.call_args_list]
+        self.assertEqual([len(user_ids) for user_ids in subtask_user_ids], [3, 3, 2])
+        self.assertItemsEqual(sum(subtask_user_ids, []), [student.id for student in students])
+
+        entry = InstructorTask.objects.get(pk=entry.id)
+        subtasks = json.loads(entry.subtasks)
+        self.assertEqual(subtasks['total'], 3)
+        self.assertEqual(subtasks['succeeded'], 3)
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertDictContainsSubset(
+            {
+                'action_name': 'certificates generated',
+                'total': 10,
+                'attempted': 8,
+                'succeeded': 5,
+                'failed': 3,
+                'skipped': 2
+            },
+            json.loads(entry.task_output)
+        )
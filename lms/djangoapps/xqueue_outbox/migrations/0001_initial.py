@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        # Adding model 'XQueueSubmission'
+        db.create_table('xqueue_outbox_xqueuesubmission', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('queue_name', self.gf('django.db.models.fields.CharField')(max_length=128, blank=True)),
+            ('xqueue_header', self.gf('django.db.models.fields.TextField')()),
+            ('xqueue_body', self.gf('django.db.models.fields.TextField')()),
+            ('created', self.gf('django.db.models.fields.DateTimeField')(auto_now_add=True, blank=True)),
+            ('next_attempt', self.gf('django.db.models.fields.DateTimeField')(db_index=True)),
+            ('attempts', self.gf('django.db.models.fields.IntegerField')(default=0)),
+            ('last_error', self.gf('django.db.models.fields.CharField')(max_length=255, blank=True)),
+            ('failed', self.gf('django.db.models.fields.BooleanField')(default=False)),
+        ))
+        db.send_create_signal('xqueue_outbox', ['XQueueSubmission'])
+
+
+    def backwards(self, orm):
+        # Deleting model 'XQueueSubmission'
+        db.delete_table('xqueue_outbox_xqueuesubmission')
+
+
+    models = {
+        'xqueue_outbox.xqueuesubmission': {
+            'Meta': {'object_name': 'XQueueSubmission'},
+            'attempts': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'created': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'failed': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'last_error': ('django.db.models.fields.CharField', [], {'max_length': '255', 'blank': 'True'}),
+            'next_attempt': ('django.db.models.fields.DateTimeField', [], {'db_index': 'True'}),
+            'queue_name': ('django.db.models.fields.CharField', [], {'max_length': '128', 'blank': 'True'}),
+            'xqueue_body': ('django.db.models.fields.TextField', [], {}),
+            'xqueue_header': ('django.db.models.fields.TextField', [], {})
+        }
+    }
+
+    complete_apps = ['xqueue_outbox']
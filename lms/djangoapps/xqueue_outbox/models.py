@@ -0,0 +1,36 @@
+"""
+Submissions to xqueue waiting to be delivered.
+
+WE'RE USING MIGRATIONS!
+
+If you make changes to this model, be sure to create an appropriate migration
+file and check it in at the same time as your model changes. To do that,
+
+1. Go to the edx-platform dir
+2. ./manage.py schemamigration xqueue_outbox --auto description_of_your_change
+3. Add the migration file created in edx-platform/lms/djangoapps/xqueue_outbox/migrations/
+"""
+from django.db import models
+
+
+class XQueueSubmission(models.Model):
+    """
+    A submission to xqueue, stored until it is delivered.
+
+    Rows are deleted once xqueue accepted the submission.  Rows which could
+    not be delivered after `xqueue_outbox.outbox.MAX_DELIVERY_ATTEMPTS`
+    attempts are kept, with `failed` set, for inspection.
+    """
+    queue_name = models.CharField(max_length=128, blank=True)
+    xqueue_header = models.TextField()
+    xqueue_body = models.TextField()
+
+    created = models.DateTimeField(auto_now_add=True)
+
+    # Time after which the next delivery attempt may be made.  Pushed into
+    # the future while a worker is delivering the submission, and after each
+    # failed attempt.
+    next_attempt = models.DateTimeField(db_index=True)
+    attempts = models.IntegerField(default=0)
+    last_error = models.CharField(max_length=255, blank=True)
+    failed = models.BooleanField(default=False)
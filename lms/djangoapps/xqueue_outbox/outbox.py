@@ -0,0 +1,146 @@
+"""
+Asynchronous submission to xqueue through a durable outbox.
+
+`XQueueOutbox.send_to_queue` stores the submission in the `XQueueSubmission`
+table, within the transaction of the learner's request, and returns without
+waiting for xqueue.  The `xqueue_outbox.tasks.deliver_xqueue_submission` task
+scheduled for the submission then sends it.  Submissions whose delivery
+failed are retried, with an exponential backoff, by the periodic
+`xqueue_outbox.tasks.deliver_xqueue_outbox` task.
+
+A worker claims a submission before sending it by moving its `next_attempt`
+DELIVERY_LEASE into the future, so that a submission is not sent by two
+workers at once, and is sent again if the worker claiming it died.
+"""
+import json
+import logging
+from datetime import timedelta
+
+from django.utils import timezone
+
+import dogstats_wrapper as dog_stats_api
+from capa.xqueue_interface import XQUEUE_METRIC_NAME
+from xqueue_outbox.models import XQueueSubmission
+
+log = logging.getLogger(__name__)
+
+# Attempts after which a submission is marked as failed and no longer retried.
+MAX_DELIVERY_ATTEMPTS = 10
+
+# Delay before retrying a failed delivery, doubled after each further failure.
+RETRY_DELAY = timedelta(seconds=30)
+MAX_RETRY_DELAY = timedelta(hours=1)
+
+# Time a worker is given to deliver the submission it claimed.
+DELIVERY_LEASE = timedelta(minutes=5)
+
+# Number of submissions delivered by a run of the periodic task.
+DELIVERY_BATCH_SIZE = 500
+
+
+class XQueueOutbox(object):
+    """
+    Stands in for an `XQueueInterface` in the xqueue dict of the module
+    system, adding submissions to the outbox instead of sending them.
+
+    Submissions are then delivered through `xqueue_interface`.
+    """
+    def __init__(self, xqueue_interface):
+        self.xqueue_interface = xqueue_interface
+
+    def send_to_queue(self, header, body, files_to_upload=None):
+        """
+        Adds a submission to the outbox, see `XQueueInterface.send_to_queue`.
+
+        Submissions with uploaded files are sent right away, as the files
+        only exist for the duration of the request.
+
+        Returns (error_code, msg) where error_code != 0 indicates an error
+        """
+        if files_to_upload is not None:
+            return self.xqueue_interface.send_to_queue(header, body, files_to_upload)
+
+        queue_name = json.loads(header).get('queue_name', u'')
+        submission = XQueueSubmission.objects.create(
+            queue_name=queue_name or u'',
+            xqueue_header=header,
+            xqueue_body=body,
+            next_attempt=timezone.now(),
+        )
+        dog_stats_api.increment(XQUEUE_METRIC_NAME, tags=[
+            u'action:add_to_outbox',
+            u'queue:{}'.format(queue_name)
+        ])
+
+        # Imported here, as the tasks deliver submissions through the
+        # interface of `courseware.module_render`, which uses this module.
+        from xqueue_outbox.tasks import deliver_xqueue_submission
+        deliver_xqueue_submission.delay(submission.id)
+
+        return (0, 'Queued submission')
+
+
+def retry_delay(attempts):
+    """
+    Returns the time to wait before the next delivery attempt of a
+    submission whose delivery failed `attempts` times.
+    """
+    return min(RETRY_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+
+
+def deliver_submission(submission, xqueue_interface):
+    """
+    Sends the submission to xqueue if it is due and not claimed by another
+    worker, and removes it from the outbox once xqueue accepted it.
+
+    Returns True if the submission was accepted by xqueue.
+    """
+    now = timezone.now()
+    if submission.failed or submission.next_attempt > now:
+        return False
+
+    claimed = XQueueSubmission.objects.filter(
+        id=submission.id,
+        next_attempt=submission.next_attempt,
+    ).update(next_attempt=now + DELIVERY_LEASE)
+    if not claimed:
+        return False
+
+    (error, msg) = xqueue_interface.send_to_queue(submission.xqueue_header, submission.xqueue_body)
+    if not error:
+        XQueueSubmission.objects.filter(id=submission.id).delete()
+        return True
+
+    attempts = submission.attempts + 1
+    failed = attempts >= MAX_DELIVERY_ATTEMPTS
+    XQueueSubmission.objects.filter(id=submission.id).update(
+        attempts=attempts,
+        last_error=unicode(msg)[:255],
+        next_attempt=timezone.now() + retry_delay(attempts),
+        failed=failed,
+    )
+    if failed:
+        log.error(
+            u"Giving up on delivering submission %d to xqueue %s after %d attempts: %s",
+            submission.id, submission.queue_name, attempts, msg
+        )
+    else:
+        log.warning(
+            u"Failed to deliver submission %d to xqueue %s (attempt %d): %s",
+            submission.id, submission.queue_name, attempts, msg
+        )
+    return False
+
+
+def deliver_due_submissions(xqueue_interface, batch_size=DELIVERY_BATCH_SIZE):
+    """
+    Delivers up to `batch_size` of the submissions due for a delivery
+    attempt, oldest first.
+
+    Returns the number of submissions accepted by xqueue.
+    """
+    submissions = XQueueSubmission.objects.filter(
+        failed=False,
+        next_attempt__lte=timezone.now(),
+    ).order_by('next_attempt')[:batch_size]
+    return sum(1 for submission in submissions if deliver_submission(submission, xqueue_interface))
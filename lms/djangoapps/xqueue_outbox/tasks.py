@@ -0,0 +1,44 @@
+"""
+Celery tasks delivering the submissions of the xqueue outbox.
+"""
+from celery.task import task  # pylint: disable=import-error,no-name-in-module
+
+from xqueue_outbox.models import XQueueSubmission
+from xqueue_outbox.outbox import deliver_submission, deliver_due_submissions
+
+
+def _xqueue_interface():
+    """
+    Returns the interface through which the LMS sends submissions to xqueue.
+    """
+    from courseware.module_render import XQUEUE_INTERFACE
+    return XQUEUE_INTERFACE
+
+
+@task(name='xqueue_outbox.deliver_xqueue_submission', default_retry_delay=2, max_retries=5)
+def deliver_xqueue_submission(submission_id):
+    """
+    Delivers a submission just added to the outbox.
+
+    The task may start before the request adding the submission commits, in
+    which case the submission is looked for again a little later.  It is
+    not found at all if the request was rolled back, or if the submission
+    was delivered by `deliver_xqueue_outbox` in the meantime.
+    """
+    try:
+        submission = XQueueSubmission.objects.get(id=submission_id)
+    except XQueueSubmission.DoesNotExist:
+        if deliver_xqueue_submission.request.retries < deliver_xqueue_submission.max_retries:
+            raise deliver_xqueue_submission.retry()
+        return False
+    return deliver_submission(submission, _xqueue_interface())
+
+
+@task(name='xqueue_outbox.deliver_xqueue_outbox')
+def deliver_xqueue_outbox():
+    """
+    Delivers the submissions of the outbox due for a delivery attempt.
+
+    This task should be run every minute or so.
+    """
+    return deliver_due_submissions(_xqueue_interface())
@@ -0,0 +1,104 @@
+"""
+Tests for the xqueue outbox.
+"""
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from mock import Mock, patch
+from nose.plugins.attrib import attr
+
+from capa.xqueue_interface import make_xheader
+from xqueue_outbox.models import XQueueSubmission
+from xqueue_outbox.outbox import (
+    MAX_DELIVERY_ATTEMPTS,
+    XQueueOutbox,
+    deliver_due_submissions,
+    deliver_submission,
+)
+
+
+@attr('shard_1')
+class TestXQueueOutbox(TestCase):
+    """
+    Tests of the submission and delivery of xqueue submissions.
+    """
+    def setUp(self):
+        super(TestXQueueOutbox, self).setUp()
+        self.header = make_xheader('http://lms/callback', 'key', 'test-queue')
+        self.body = '{"student_response": "answer"}'
+        self.xqueue_interface = Mock()
+        self.xqueue_interface.send_to_queue.return_value = (0, 'Queued submission')
+
+        patcher = patch('courseware.module_render.XQUEUE_INTERFACE', self.xqueue_interface)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _add_submission(self, **kwargs):
+        """
+        Adds a submission to the outbox without delivering it.
+        """
+        kwargs.setdefault('next_attempt', timezone.now())
+        return XQueueSubmission.objects.create(
+            queue_name='test-queue', xqueue_header=self.header, xqueue_body=self.body, **kwargs
+        )
+
+    def test_send_to_queue(self):
+        # The delivery task runs eagerly in tests.
+        result = XQueueOutbox(self.xqueue_interface).send_to_queue(self.header, self.body)
+
+        self.assertEqual(result[0], 0)
+        self.xqueue_interface.send_to_queue.assert_called_once_with(self.header, self.body)
+        self.assertFalse(XQueueSubmission.objects.exists())
+
+    def test_send_files_to_queue(self):
+        files = [Mock()]
+        result = XQueueOutbox(self.xqueue_interface).send_to_queue(self.header, self.body, files)
+
+        self.assertEqual(result, (0, 'Queued submission'))
+        self.xqueue_interface.send_to_queue.assert_called_once_with(self.header, self.body, files)
+        self.assertFalse(XQueueSubmission.objects.exists())
+
+    def test_failed_delivery(self):
+        self.xqueue_interface.send_to_queue.return_value = (1, 'cannot connect to server')
+        XQueueOutbox(self.xqueue_interface).send_to_queue(self.header, self.body)
+
+        submission = XQueueSubmission.objects.get()
+        self.assertEqual(submission.attempts, 1)
+        self.assertEqual(submission.last_error, 'cannot connect to server')
+        self.assertGreater(submission.next_attempt, timezone.now())
+        self.assertFalse(submission.failed)
+
+        # Not retried before it is due.
+        self.assertEqual(deliver_due_submissions(self.xqueue_interface), 0)
+        self.assertEqual(self.xqueue_interface.send_to_queue.call_count, 1)
+
+        self.xqueue_interface.send_to_queue.return_value = (0, 'Queued submission')
+        XQueueSubmission.objects.update(next_attempt=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(deliver_due_submissions(self.xqueue_interface), 1)
+        self.assertFalse(XQueueSubmission.objects.exists())
+
+    def test_give_up_delivery(self):
+        self.xqueue_interface.send_to_queue.return_value = (1, 'unexpected HTTP status code [500]')
+        self._add_submission(attempts=MAX_DELIVERY_ATTEMPTS - 1)
+
+        self.assertEqual(deliver_due_submissions(self.xqueue_interface), 0)
+        submission = XQueueSubmission.objects.get()
+        self.assertTrue(submission.failed)
+        self.assertEqual(submission.attempts, MAX_DELIVERY_ATTEMPTS)
+
+        XQueueSubmission.objects.update(next_attempt=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(deliver_due_submissions(self.xqueue_interface), 0)
+        self.assertEqual(self.xqueue_interface.send_to_queue.call_count, 1)
+
+    def test_claimed_submission(self):
+        submission = self._add_submission()
+        stale_submission = XQueueSubmission.objects.get(id=submission.id)
+
+        self.xqueue_interface.send_to_queue.return_value = (1, 'cannot connect to server')
+        self.assertFalse(deliver_submission(submission, self.xqueue_interface))
+
+        # Another worker holding the submission as it was before the first
+        # attempt does not send it again.
+        self.assertFalse(deliver_submission(stale_submission, self.xqueue_interface))
+        self.assertEqual(self.xqueue_interface.send_to_queue.call_count, 1)
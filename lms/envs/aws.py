@@ -211,11 +211,16 @@ PAYMENT_REPORT_GENERATOR_GROUP = ENV_TOKENS.get('PAYMENT_REPORT_GENERATOR_GROUP'
 # Bulk Email overrides
 BULK_EMAIL_DEFAULT_FROM_EMAIL = ENV_TOKENS.get('BULK_EMAIL_DEFAULT_FROM_EMAIL', BULK_EMAIL_DEFAULT_FROM_EMAIL)
 BULK_EMAIL_EMAILS_PER_TASK = ENV_TOKENS.get('BULK_EMAIL_EMAILS_PER_TASK', BULK_EMAIL_EMAILS_PER_TASK)
+CERTIFICATE_GENERATION_STUDENTS_PER_TASK = ENV_TOKENS.get(
+    'CERTIFICATE_GENERATION_STUDENTS_PER_TASK', CERTIFICATE_GENERATION_STUDENTS_PER_TASK
+)
 BULK_EMAIL_DEFAULT_RETRY_DELAY = ENV_TOKENS.get('BULK_EMAIL_DEFAULT_RETRY_DELAY', BULK_EMAIL_DEFAULT_RETRY_DELAY)
 BULK_EMAIL_MAX_RETRIES = ENV_TOKENS.get('BULK_EMAIL_MAX_RETRIES', BULK_EMAIL_MAX_RETRIES)
 BULK_EMAIL_INFINITE_RETRY_CAP = ENV_TOKENS.get('BULK_EMAIL_INFINITE_RETRY_CAP', BULK_EMAIL_INFINITE_RETRY_CAP)
 BULK_EMAIL_LOG_SENT_EMAILS = ENV_TOKENS.get('BULK_EMAIL_LOG_SENT_EMAILS', BULK_EMAIL_LOG_SENT_EMAILS)
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = ENV_TOKENS.get('BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS', BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
+BULK_EMAIL_SEND_CONCURRENCY = ENV_TOKENS.get('BULK_EMAIL_SEND_CONCURRENCY', BULK_EMAIL_SEND_CONCURRENCY)
+BULK_EMAIL_MAX_SENDS_PER_SECOND = ENV_TOKENS.get('BULK_EMAIL_MAX_SENDS_PER_SECOND', BULK_EMAIL_MAX_SENDS_PER_SECOND)
 # We want Bulk Email running on the high-priority queue, so we define the
 # routing key that points to it. At the moment, the name is the same.
 # We have to reset the value here, since we have changed the value of the queue name.
@@ -567,6 +572,13 @@ if FEATURES.get('ENABLE_THIRD_PARTY_AUTH'):
             'schedule': datetime.timedelta(hours=ENV_TOKENS.get('THIRD_PARTY_AUTH_SAML_FETCH_PERIOD_HOURS', 24)),
         }
 
+# Retry the deliveries of xqueue submissions which failed
+if FEATURES.get('ENABLE_XQUEUE_OUTBOX') and ENV_TOKENS.get('XQUEUE_OUTBOX_DELIVERY_PERIOD_SECONDS', 60) is not None:
+    CELERYBEAT_SCHEDULE['deliver-xqueue-outbox'] = {
+        'task': 'xqueue_outbox.deliver_xqueue_outbox',
+        'schedule': datetime.timedelta(seconds=ENV_TOKENS.get('XQUEUE_OUTBOX_DELIVERY_PERIOD_SECONDS', 60)),
+    }
+
 ##### OAUTH2 Provider ##############
 if FEATURES.get('ENABLE_OAUTH2_PROVIDER'):
     OAUTH_OIDC_ISSUER = ENV_TOKENS['OAUTH_OIDC_ISSUER']
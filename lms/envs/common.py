@@ -427,6 +427,10 @@ FEATURES = {
 
     # Enable LTI Provider feature.
     'ENABLE_LTI_PROVIDER': False,
+
+    # Add learner submissions to the xqueue outbox, from which celery workers
+    # deliver them to xqueue, instead of sending them during the request.
+    'ENABLE_XQUEUE_OUTBOX': True,
 }
 
 # Ignore static asset files on import which match this pattern
@@ -1773,6 +1777,14 @@ BULK_EMAIL_LOG_SENT_EMAILS = False
 # parallel, and what the SES rate is.
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = 0.02
 
+# Number of connections over which each bulk email subtask sends its
+# messages concurrently.
+BULK_EMAIL_SEND_CONCURRENCY = 4
+
+# Maximum number of messages sent per second by each bulk email subtask,
+# or None for no limit.
+BULK_EMAIL_MAX_SENDS_PER_SECOND = None
+
 ############################# Email Opt In ####################################
 
 # Minimum age for organization-wide email opt in
@@ -1843,8 +1855,12 @@ INSTALLED_APPS = (
     'util',
     'certificates',
     'dashboard',
+    'xqueue_outbox',
     'instructor',
     'instructor_task',
+    # Installed even when the Metrics tab is disabled, since its rollups are
+    # updated when StudentModules are deleted.
+    'class_dashboard',
     'open_ended_grading',
     'psychometrics',
     'licenses',
@@ -2104,8 +2120,6 @@ VERIFY_STUDENT = {
 
 ### This enables the Metrics tab for the Instructor dashboard ###########
 FEATURES['CLASS_DASHBOARD'] = False
-if FEATURES.get('CLASS_DASHBOARD'):
-    INSTALLED_APPS += ('class_dashboard',)
 
 ################ Enable credit eligibility feature ####################
 ENABLE_CREDIT_ELIGIBILITY = False
@@ -2167,6 +2181,10 @@ BADGR_ISSUER_SLUG = "example-issuer"
 ###################### Grade Downloads ######################
 GRADES_DOWNLOAD_ROUTING_KEY = HIGH_MEM_QUEUE
 
+# Courses with more enrolled students than this generate their certificates
+# in parallel subtasks of this many students each.
+CERTIFICATE_GENERATION_STUDENTS_PER_TASK = 500
+
 GRADES_DOWNLOAD = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': 'edx-grades',
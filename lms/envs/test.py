@@ -307,6 +307,9 @@ GIT_REPO_DIR = TEST_ROOT / "course_repos"
 CELERY_ALWAYS_EAGER = True
 CELERY_RESULT_BACKEND = 'djcelery.backends.cache:CacheBackend'
 
+# Send bulk email messages one at a time, in the order the tests mock their results.
+BULK_EMAIL_SEND_CONCURRENCY = 1
+
 ######################### MARKETING SITE ###############################
 
 MKTG_URL_LINK_MAP = {
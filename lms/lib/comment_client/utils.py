@@ -1,14 +1,26 @@
 from contextlib import contextmanager
+import copy
 import dogstats_wrapper as dog_stats_api
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+import threading
 from django.conf import settings
 from time import time
 from uuid import uuid4
 from django.utils.translation import get_language
 
+import request_cache
+
 log = logging.getLogger(__name__)
 
+# Name of the request cache holding the responses of GET requests already
+# made to the comments service while handling the current request.
+RESPONSE_CACHE_NAME = 'comment_client.responses'
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
@@ -31,14 +43,51 @@ def merge_dict(dic1, dic2):
     return dict(dic1.items() + dic2.items())
 
 
+def get_session():
+    """
+    Returns the process-wide `requests.Session` used to talk to the comments
+    service, so that HTTP connections are pooled and kept alive across calls.
+
+    The pool size is controlled by the COMMENTS_SERVICE_POOL_SIZE setting.
+    """
+    global _SESSION  # pylint: disable=global-statement
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                pool_size = getattr(settings, 'COMMENTS_SERVICE_POOL_SIZE', 10)
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _SESSION = session
+    return _SESSION
+
+
+def _get_response_cache():
+    """
+    Returns the per-request cache of GET responses, or None when we are not
+    handling a request (e.g. in management commands and celery tasks).
+    """
+    if request_cache.get_request() is None:
+        return None
+    return request_cache.get_cache(RESPONSE_CACHE_NAME)
+
+
 @contextmanager
-def request_timer(request_id, method, url, tags=None):
+def request_timer(request_id, method, url, tags=None, endpoint=None):
     start = time()
     with dog_stats_api.timer('comment_client.request.time', tags=tags):
         yield
     end = time()
     duration = end - start
 
+    if endpoint:
+        dog_stats_api.histogram(
+            'comment_client.request.latency',
+            value=duration,
+            tags=[u'endpoint:{}'.format(endpoint)]
+        )
+
     log.info(
         u"comment_client_request_log: request_id={request_id}, method={method}, "
         u"url={url}, duration={duration}".format(
@@ -60,8 +109,29 @@ def perform_request(method, url, data_or_params=None, raw=False,
     if metric_action:
         metric_tags.append(u'action:{}'.format(metric_action))
 
+    # A low-cardinality name for the operation, used to break down latency.
+    model_class_tags = [tag for tag in metric_tags if tag.startswith(u'model_class:')]
+    endpoint = u'.'.join(
+        [tag.split(u':', 1)[1] for tag in model_class_tags] + [metric_action or method]
+    )
+
     if data_or_params is None:
         data_or_params = {}
+
+    # Identical GETs made while handling one request are only sent once.
+    # Any other method may change what those GETs return, so it empties the
+    # cache instead.
+    response_cache = _get_response_cache()
+    cache_key = None
+    if response_cache is not None:
+        if method == 'get':
+            cache_key = (url, raw, repr(sorted(data_or_params.items())))
+            if cache_key in response_cache:
+                dog_stats_api.increment('comment_client.request.deduplicated', tags=metric_tags)
+                return copy.deepcopy(response_cache[cache_key])
+        else:
+            response_cache.clear()
+
     headers = {
         'X-Edx-Api-Key': getattr(settings, "COMMENTS_SERVICE_KEY", None),
         'Accept-Language': get_language(),
@@ -75,8 +145,8 @@ def perform_request(method, url, data_or_params=None, raw=False,
     else:
         data = None
         params = merge_dict(data_or_params, request_id_dict)
-    with request_timer(request_id, method, url, metric_tags):
-        response = requests.request(
+    with request_timer(request_id, method, url, metric_tags, endpoint=endpoint):
+        response = get_session().request(
             method,
             url,
             data=data,
@@ -102,6 +172,8 @@ def perform_request(method, url, data_or_params=None, raw=False,
         raise CommentClient500Error(response.text)
     else:
         if raw:
+            if cache_key is not None:
+                response_cache[cache_key] = response.text
             return response.text
         else:
             try:
@@ -129,6 +201,8 @@ def perform_request(method, url, data_or_params=None, raw=False,
                     value=data.get('num_pages', 1),
                     tags=metric_tags
                 )
+            if cache_key is not None:
+                response_cache[cache_key] = copy.deepcopy(data)
             return data
 
 
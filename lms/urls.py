@@ -345,6 +345,8 @@ if settings.COURSEWARE_ENABLED:
         # Takes optional student_id for instructor use--shows profile as that student sees it.
         url(r'^courses/{}/progress/(?P<student_id>[^/]*)/$'.format(settings.COURSE_ID_PATTERN),
             'courseware.views.progress', name="student_progress"),
+        url(r'^courses/{}/grade_histograms$'.format(settings.COURSE_ID_PATTERN),
+            'courseware.views.staff_grade_histograms', name="staff_grade_histograms"),
 
         # For the instructor
         url(r'^courses/{}/instructor$'.format(settings.COURSE_ID_PATTERN),
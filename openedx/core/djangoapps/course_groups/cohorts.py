@@ -6,14 +6,16 @@ forums, and to the cohort admin views.
 import logging
 import random
 
+from django.core.cache import cache
 from django.db import transaction
-from django.db.models.signals import post_save, m2m_changed
+from django.db.models.signals import post_delete, post_save, m2m_changed
 from django.dispatch import receiver
 from django.http import Http404
 from django.utils.translation import ugettext as _
 
 from courseware import courses
 from eventtracking import tracker
+from openedx.core.lib.cache_utils import get_version_stamp, invalidate_after_commit, reset_version_stamp
 from request_cache.middleware import RequestCache
 from student.models import get_user_by_username_or_email
 
@@ -22,11 +24,60 @@ from .models import CourseUserGroup, CourseCohort, CourseCohortsSettings, Course
 
 log = logging.getLogger(__name__)
 
+# The cohort of each user in a course is kept in the default cache, under a
+# key including a version stamp of the course.  The entry of a user is
+# deleted when their cohort membership changes, and the stamp is reset when
+# the cohorts or the cohort settings of the course change.
+COHORT_MEMBERSHIP_CACHE_TIMEOUT = 60 * 60  # 1 hour
+
+# Cached for the users who are in no cohort, since None means a cache miss.
+_NO_COHORT = 0
+
+# Number of users whose cohort is looked up by a single query.
+COHORT_LOOKUP_CHUNK_SIZE = 1000
+
+
+def _membership_version_stamp_name(course_key):
+    """Name of the version stamp of a course's cached cohort memberships."""
+    return u'course_groups.cohorts.membership.{}'.format(course_key)
+
+
+def _membership_cache_keys(course_key, user_ids):
+    """
+    Returns a dict mapping each of `user_ids` to the cache key of their cohort
+    in the course.
+    """
+    stamp = get_version_stamp(_membership_version_stamp_name(course_key))
+    return {
+        user_id: u'course_groups.cohorts.membership.{}.{}.{}'.format(course_key, stamp, user_id)
+        for user_id in user_ids
+    }
+
+
+def _delete_cohort_memberships(course_key, user_ids):
+    """Deletes the cached cohort of `user_ids` in the course."""
+    cache.delete_many(_membership_cache_keys(course_key, user_ids).values())
+
+
+def invalidate_cohort_membership(course_key, user_ids=None):
+    """
+    Discards the cached cohort of `user_ids` in the course, or of all of its
+    users if `user_ids` is None, now and again once the current transaction
+    is committed.
+    """
+    if user_ids is None:
+        invalidate_after_commit(reset_version_stamp, _membership_version_stamp_name(course_key))
+    else:
+        invalidate_after_commit(_delete_cohort_memberships, course_key, list(user_ids))
+
 
 @receiver(post_save, sender=CourseUserGroup)
 def _cohort_added(sender, **kwargs):
     """Emits a tracking log event each time a cohort is created"""
     instance = kwargs["instance"]
+    if instance.group_type == CourseUserGroup.COHORT:
+        # The cached memberships hold the cohort, which may have been renamed.
+        invalidate_cohort_membership(instance.course_id)
     if kwargs["created"] and instance.group_type == CourseUserGroup.COHORT:
         tracker.emit(
             "edx.cohort.created",
@@ -34,9 +85,24 @@ def _cohort_added(sender, **kwargs):
         )
 
 
+@receiver(post_delete, sender=CourseUserGroup)
+def _cohort_deleted(sender, **kwargs):  # pylint: disable=unused-argument
+    """Discards the cached memberships of a course when one of its cohorts is deleted"""
+    invalidate_cohort_membership(kwargs["instance"].course_id)
+
+
+@receiver(post_save, sender=CourseCohortsSettings)
+def _cohort_settings_changed(sender, **kwargs):  # pylint: disable=unused-argument
+    """Discards the cached memberships of a course when its cohort settings change"""
+    invalidate_cohort_membership(kwargs["instance"].course_id)
+
+
 @receiver(m2m_changed, sender=CourseUserGroup.users.through)
 def _cohort_membership_changed(sender, **kwargs):
-    """Emits a tracking log event each time cohort membership is modified"""
+    """
+    Emits a tracking log event each time cohort membership is modified, and
+    discards the cached cohort of the users concerned.
+    """
     def get_event_iter(user_id_iter, cohort_iter):
         return (
             {"cohort_id": cohort.id, "cohort_name": cohort.name, "user_id": user_id}
@@ -59,16 +125,19 @@ def _cohort_membership_changed(sender, **kwargs):
     if reverse:
         user_id_iter = [instance.id]
         if action == "pre_clear":
-            cohort_iter = instance.course_groups.filter(group_type=CourseUserGroup.COHORT)
+            cohort_iter = list(instance.course_groups.filter(group_type=CourseUserGroup.COHORT))
         else:
-            cohort_iter = CourseUserGroup.objects.filter(pk__in=pk_set, group_type=CourseUserGroup.COHORT)
+            cohort_iter = list(CourseUserGroup.objects.filter(pk__in=pk_set, group_type=CourseUserGroup.COHORT))
     else:
         cohort_iter = [instance] if instance.group_type == CourseUserGroup.COHORT else []
         if action == "pre_clear":
-            user_id_iter = (user.id for user in instance.users.all())
+            user_id_iter = [user.id for user in instance.users.all()]
         else:
             user_id_iter = pk_set
 
+    for course_key in set(cohort.course_id for cohort in cohort_iter):
+        invalidate_cohort_membership(course_key, user_id_iter)
+
     for event in get_event_iter(user_id_iter, cohort_iter):
         tracker.emit(event_name, event)
 
@@ -173,19 +242,20 @@ def get_cohort(user, course_key, assign=True, use_cached=False):
         return request_cache.data.setdefault(cache_key, None)
 
     # If course is cohorted, check if the user already has a cohort.
-    try:
-        cohort = CourseUserGroup.objects.get(
-            course_id=course_key,
-            group_type=CourseUserGroup.COHORT,
-            users__id=user.id,
-        )
+    cohort = _get_cohorts_for_users(course_key, [user.id])[user.id]
+    if cohort is not None:
         return request_cache.data.setdefault(cache_key, cohort)
-    except CourseUserGroup.DoesNotExist:
+    elif not assign:
         # Didn't find the group. If we do not want to assign, return here.
-        if not assign:
-            # Do not cache the cohort here, because in the next call assign
-            # may be True, and we will have to assign the user a cohort.
-            return None
+        # Do not cache the cohort here, because in the next call assign
+        # may be True, and we will have to assign the user a cohort.
+        return None
+
+    # The cached membership may be outdated, so make sure the user still has
+    # no cohort before assigning one.
+    cohort = _get_cohorts_for_users(course_key, [user.id], use_cache=False)[user.id]
+    if cohort is not None:
+        return request_cache.data.setdefault(cache_key, cohort)
 
     # Otherwise assign the user a cohort.
     course = courses.get_course(course_key)
@@ -204,6 +274,73 @@ def get_cohort(user, course_key, assign=True, use_cached=False):
     return request_cache.data.setdefault(cache_key, cohort)
 
 
+def get_cohorts_for_users(course_key, user_ids):
+    """
+    Returns the cohorts of many users in a course.
+
+    Unlike `get_cohort`, users who are not in a cohort are not assigned one.
+
+    Arguments:
+        course_key: CourseKey
+        user_ids: ids of the users whose cohort is wanted
+
+    Returns:
+        A dict mapping each of `user_ids` to the CourseUserGroup of the user's
+        cohort, or to None if the course isn't cohorted or the user isn't in
+        a cohort.
+
+    Raises:
+       Http404 if the course doesn't exist.
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return {}
+    if not get_course_cohort_settings(course_key).is_cohorted:
+        return dict.fromkeys(user_ids)
+    return _get_cohorts_for_users(course_key, user_ids)
+
+
+def _get_cohorts_for_users(course_key, user_ids, use_cache=True):
+    """
+    Returns a dict mapping each of `user_ids` to their cohort in the course,
+    or to None, from the cache if possible and `use_cache` is True.  The
+    memberships read from the database are cached.
+    """
+    cache_keys = _membership_cache_keys(course_key, user_ids)
+    cached = cache.get_many(cache_keys.values()) if use_cache else {}
+
+    cohorts = {}
+    missing_user_ids = []
+    for user_id, cache_key in cache_keys.iteritems():
+        if cache_key in cached:
+            cohorts[user_id] = cached[cache_key] or None
+        else:
+            missing_user_ids.append(user_id)
+
+    if missing_user_ids:
+        # The users of the same cohort share a single CourseUserGroup object.
+        course_cohorts = {}
+        for start in xrange(0, len(missing_user_ids), COHORT_LOOKUP_CHUNK_SIZE):
+            memberships = CourseUserGroup.users.through.objects.filter(
+                user_id__in=missing_user_ids[start:start + COHORT_LOOKUP_CHUNK_SIZE],
+                courseusergroup__course_id=course_key,
+                courseusergroup__group_type=CourseUserGroup.COHORT,
+            ).select_related('courseusergroup')
+            for membership in memberships:
+                cohorts[membership.user_id] = course_cohorts.setdefault(
+                    membership.courseusergroup_id, membership.courseusergroup
+                )
+
+        for user_id in missing_user_ids:
+            cohorts.setdefault(user_id, None)
+        cache.set_many(
+            {cache_keys[user_id]: cohorts[user_id] or _NO_COHORT for user_id in missing_user_ids},
+            COHORT_MEMBERSHIP_CACHE_TIMEOUT
+        )
+
+    return cohorts
+
+
 def migrate_cohort_settings(course):
     """
     Migrate all the cohort settings associated with this course from modulestore to mysql.
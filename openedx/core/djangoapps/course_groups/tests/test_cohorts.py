@@ -6,6 +6,8 @@ import ddt
 from mock import call, patch
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.signals import request_finished
 from django.db import IntegrityError
 from django.http import Http404
 from django.test import TestCase
@@ -254,12 +256,14 @@ class TestCohorts(ModuleStoreTestCase):
 
     @ddt.data(
         (True, 2),
-        (False, 6),
+        (False, 4),
     )
     @ddt.unpack
     def test_get_cohort_sql_queries(self, use_cached, num_sql_queries):
         """
         Test number of queries by cohorts.get_cohort() with and without caching.
+        Without the request cache, the membership is still read from the
+        shared cache after the first call.
         """
         course = modulestore().get_course(self.toy_course_key)
         config_course_cohorts(course, is_cohorted=True)
@@ -295,6 +299,97 @@ class TestCohorts(ModuleStoreTestCase):
         # get_cohort should return a group for user
         self.assertEquals(cohorts.get_cohort(user, course.id).name, "AutoGroup")
 
+    def test_get_cohorts_for_users(self):
+        """
+        Make sure cohorts.get_cohorts_for_users() returns the cohort of every
+        user, with a single query for the users whose cohort isn't cached.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        users = [UserFactory() for __ in range(3)]
+        self.assertEqual(
+            cohorts.get_cohorts_for_users(course.id, [user.id for user in users]),
+            {user.id: None for user in users}
+        )
+
+        config_course_cohorts(course, is_cohorted=True)
+        first_cohort = CohortFactory(course_id=course.id, name="FirstCohort", users=users[:2])
+        second_cohort = CohortFactory(course_id=course.id, name="SecondCohort", users=users[2:])
+        other_user = UserFactory()
+
+        with self.assertNumQueries(2):
+            user_cohorts = cohorts.get_cohorts_for_users(course.id, [user.id for user in users] + [other_user.id])
+        self.assertEqual(
+            user_cohorts,
+            {users[0].id: first_cohort, users[1].id: first_cohort, users[2].id: second_cohort, other_user.id: None}
+        )
+
+        # Only the cohort settings are read once the memberships are cached.
+        with self.assertNumQueries(1):
+            self.assertEqual(cohorts.get_cohorts_for_users(course.id, [other_user.id]), {other_user.id: None})
+        # Users are not assigned a cohort.
+        self.assertIsNone(cohorts.get_cohort(other_user, course.id, assign=False))
+
+    def test_cohort_membership_cache_invalidation(self):
+        """
+        Make sure the cached cohort of a user is discarded when they change
+        cohort, or when their cohort is renamed or deleted.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, is_cohorted=True)
+        first_cohort = CohortFactory(course_id=course.id, name="FirstCohort")
+        second_cohort = CohortFactory(course_id=course.id, name="SecondCohort")
+        user = UserFactory(username="test", email="a@b.com")
+        first_cohort.users.add(user)
+        self.assertEqual(cohorts.get_cohort(user, course.id), first_cohort)
+
+        cohorts.add_user_to_cohort(second_cohort, user.username)
+        self.assertEqual(cohorts.get_cohort(user, course.id), second_cohort)
+
+        second_cohort.name = "RenamedCohort"
+        second_cohort.save()
+        self.assertEqual(cohorts.get_cohort(user, course.id).name, "RenamedCohort")
+
+        second_cohort.delete()
+        self.assertIsNone(cohorts.get_cohort(user, course.id, assign=False))
+
+    def test_cohort_membership_invalidated_again_after_commit(self):
+        """
+        Make sure the cached cohort of a user is discarded again once the
+        request is finished, in case it was read before the change was committed.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, is_cohorted=True)
+        first_cohort = CohortFactory(course_id=course.id, name="FirstCohort")
+        second_cohort = CohortFactory(course_id=course.id, name="SecondCohort")
+        user = UserFactory(username="test", email="a@b.com")
+        first_cohort.users.add(user)
+        cohorts.add_user_to_cohort(second_cohort, user.username)
+
+        # Another process reads the membership before the change is committed.
+        cache_key = cohorts._membership_cache_keys(course.id, [user.id])[user.id]  # pylint: disable=protected-access
+        cache.set(cache_key, first_cohort)
+        self.assertEqual(cohorts.get_cohort(user, course.id), first_cohort)
+
+        request_finished.send(sender=None)
+        self.assertEqual(cohorts.get_cohort(user, course.id), second_cohort)
+
+    def test_get_cohort_with_assign_outdated_cache(self):
+        """
+        Make sure cohorts.get_cohort() doesn't assign a cohort to a user whose
+        cached membership is outdated.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, is_cohorted=True, auto_cohorts=["AutoGroup"])
+        cohort = CohortFactory(course_id=course.id, name="TestCohort")
+        user = UserFactory(username="test", email="a@b.com")
+        self.assertIsNone(cohorts.get_cohort(user, course.id, assign=False))
+
+        # Adding the membership row directly doesn't discard the cached membership.
+        CourseUserGroup.users.through.objects.create(courseusergroup=cohort, user=user)
+
+        self.assertEqual(cohorts.get_cohort(user, course.id), cohort)
+        self.assertEqual(list(user.course_groups.filter(course_id=course.id)), [cohort])
+
     def test_cohorting_with_auto_cohorts(self):
         """
         Make sure cohorts.get_cohort() does the right thing.
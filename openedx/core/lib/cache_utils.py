@@ -3,8 +3,19 @@ Utilities related to caching.
 """
 
 import functools
+import threading
+from uuid import uuid4
+
+from celery.signals import task_postrun
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.db import transaction
+from django.dispatch import receiver
+from lru_cache import LRUCache  # pylint: disable=unused-import
 from xblock.core import XBlock
 
+VERSION_STAMP_TIMEOUT = 60 * 60 * 24 * 7  # 1 week
+
 
 def memoize_in_request_cache(request_cache_attr_name=None):
     """
@@ -47,3 +58,99 @@ def hashvalue(arg):
         return unicode(arg.location)
     else:
         return unicode(arg)
+
+
+def _version_stamp_cache_key(name):
+    """Cache key of the version stamp called `name`."""
+    return u'cache_utils.version_stamp.{}'.format(name)
+
+
+def get_version_stamp(name, backend=None):
+    """
+    Returns the current value of the version stamp called `name`, which is
+    kept in the default cache, or in `backend` if given, creating it if needed.
+
+    Including a version stamp in cache keys allows discarding every entry
+    built with it at once, by calling `reset_version_stamp`.  The stamp is
+    the empty string if it can't be stored in the cache.
+    """
+    if backend is None:
+        backend = cache
+    cache_key = _version_stamp_cache_key(name)
+    stamp = backend.get(cache_key)
+    if stamp is None:
+        backend.add(cache_key, uuid4().hex, VERSION_STAMP_TIMEOUT)
+        # Another process may have added its stamp first, so read it back.
+        stamp = backend.get(cache_key) or u''
+    return stamp
+
+
+def reset_version_stamp(name, backend=None):
+    """
+    Changes the version stamp called `name`, so that cache keys built with
+    its previous value are no longer used.
+    """
+    if backend is None:
+        backend = cache
+    backend.delete(_version_stamp_cache_key(name))
+
+
+_PENDING_INVALIDATIONS = threading.local()
+
+
+def invalidate_after_commit(invalidate, *args):
+    """
+    Calls `invalidate(*args)` now, and again once the current transaction is
+    over, if there is one.
+
+    Another process may read the changed data before the transaction is
+    committed, and cache it again; the second call discards that entry.
+    Pending calls are made when the request or celery task is finished, which
+    is after TransactionMiddleware and commit_on_success have committed.
+    """
+    invalidate(*args)
+    if transaction.is_managed():
+        if not hasattr(_PENDING_INVALIDATIONS, 'calls'):
+            _PENDING_INVALIDATIONS.calls = []
+        _PENDING_INVALIDATIONS.calls.append((invalidate, args))
+
+
+@receiver(request_finished)
+@receiver(task_postrun)
+def run_pending_invalidations(**kwargs):  # pylint: disable=unused-argument
+    """
+    Makes the calls deferred by `invalidate_after_commit`.
+    """
+    calls = getattr(_PENDING_INVALIDATIONS, 'calls', None)
+    _PENDING_INVALIDATIONS.calls = []
+    for invalidate, args in calls or ():
+        invalidate(*args)
+
+
+def _course_publish_stamp_name(course_key):
+    """Name of the version stamp of a course reset when it is published."""
+    return u'cache_utils.course_publish.{}'.format(course_key)
+
+
+def course_publish_version(course_key):
+    """
+    Returns a version stamp of the course, which `reset_course_publish_version`
+    changes whenever the course is published, from Studio or the LMS.
+    """
+    return get_version_stamp(_course_publish_stamp_name(course_key))
+
+
+def reset_course_publish_version(course_key):
+    """
+    Changes the version stamp returned by `course_publish_version`.
+    """
+    reset_version_stamp(_course_publish_stamp_name(course_key))
+
+
+def course_edit_version(course):
+    """
+    Returns a string that changes whenever published content of `course`
+    changes, if its modulestore keeps track of that, and u'' otherwise.
+    """
+    edited_on = getattr(course, 'subtree_edited_on', None)
+    return edited_on.isoformat() if edited_on else u''
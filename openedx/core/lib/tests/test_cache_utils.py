@@ -2,10 +2,14 @@
 Tests for cache_utils.py
 """
 import ddt
-from mock import MagicMock
+from django.core.cache import cache
+from django.core.signals import request_finished
+from mock import MagicMock, Mock, patch
 from unittest import TestCase
 
-from openedx.core.lib.cache_utils import memoize_in_request_cache
+from openedx.core.lib.cache_utils import (
+    memoize_in_request_cache, LRUCache, get_version_stamp, reset_version_stamp, invalidate_after_commit
+)
 
 
 @ddt.ddt
@@ -62,3 +66,84 @@ class TestMemoizeInRequestCache(TestCase):
                 func_to_memoize(*arg_list2)
 
             self.assertEquals(self.func_to_count.call_count, 2)
+
+
+class TestLRUCache(TestCase):
+    """
+    Test the LRUCache class.
+    """
+    def test_get_and_set(self):
+        cache = LRUCache(maxsize=2)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('a', 'default'), 'default')
+        cache.set('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_clear(self):
+        cache = LRUCache()
+        cache.set('a', 1)
+        cache.clear()
+        self.assertIsNone(cache.get('a'))
+
+
+class TestVersionStamp(TestCase):
+    """
+    Test the version stamp helpers.
+    """
+    def setUp(self):
+        super(TestVersionStamp, self).setUp()
+        cache.clear()
+
+    def test_stamp_is_stable(self):
+        self.assertEqual(get_version_stamp('test'), get_version_stamp('test'))
+        self.assertNotEqual(get_version_stamp('test'), get_version_stamp('other'))
+
+    def test_reset_changes_stamp(self):
+        stamp = get_version_stamp('test')
+        reset_version_stamp('test')
+        self.assertNotEqual(stamp, get_version_stamp('test'))
+
+    def test_stamp_in_backend(self):
+        backend = MagicMock()
+        backend.get.return_value = 'stamp'
+        self.assertEqual(get_version_stamp('test', backend), 'stamp')
+        reset_version_stamp('test', backend)
+        self.assertTrue(backend.delete.called)
+        self.assertIsNone(cache.get(backend.get.call_args[0][0]))
+
+
+class TestInvalidateAfterCommit(TestCase):
+    """
+    Test the invalidate_after_commit helper function.
+    """
+    @patch('openedx.core.lib.cache_utils.transaction.is_managed', Mock(return_value=False))
+    def test_outside_transaction(self):
+        invalidate = Mock()
+        invalidate_after_commit(invalidate, 'key')
+        request_finished.send(sender=None)
+        self.assertEqual(invalidate.call_count, 1)
+
+    @patch('openedx.core.lib.cache_utils.transaction.is_managed', Mock(return_value=True))
+    def test_in_transaction(self):
+        invalidate = Mock()
+        invalidate_after_commit(invalidate, 'key')
+        invalidate.assert_called_once_with('key')
+        request_finished.send(sender=None)
+        self.assertEqual(invalidate.call_count, 2)
+        invalidate.assert_called_with('key')
+
+        # Pending calls are only made once.
+        request_finished.send(sender=None)
+        self.assertEqual(invalidate.call_count, 2)
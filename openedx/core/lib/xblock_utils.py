@@ -12,6 +12,9 @@ from lxml import html, etree
 from contracts import contract
 
 from django.conf import settings
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.db import connections
 from django.utils.timezone import UTC
 from django.utils.html import escape
 from django.contrib.auth.models import User
@@ -28,6 +31,10 @@ from xmodule.modulestore.django import modulestore
 
 log = logging.getLogger(__name__)
 
+# Grade histograms are cached briefly, as staff viewing a unit don't need
+# them to reflect the latest submissions.
+GRADE_HISTOGRAM_CACHE_TIMEOUT = 60 * 5  # 5 minutes
+
 
 def wrap_fragment(fragment, new_content):
     """
@@ -184,6 +191,74 @@ def replace_static_urls(data_dir, block, view, frag, context, course_id=None, st
     ))
 
 
+def replace_urls(course_id, jump_to_id_base_url, data_dir, block, view, frag, context, static_asset_path=''):  # pylint: disable=unused-argument
+    """
+    Updates the supplied module with a new get_html function that wraps
+    the old get_html function and applies replace_static_urls,
+    replace_course_urls and replace_jump_to_id_urls in a single pass
+    """
+    return wrap_fragment(frag, static_replace.replace_urls(
+        frag.content,
+        course_id,
+        data_directory=data_dir,
+        static_asset_path=static_asset_path,
+        jump_to_id_base_url=jump_to_id_base_url,
+    ))
+
+
+def _grade_histogram_cache_key(module_id):
+    """Cache key of the grade histogram of a module."""
+    return u'xblock_utils.grade_histogram.{}'.format(module_id.to_deprecated_string())
+
+
+def grade_histograms(module_ids):
+    """
+    Returns a dict mapping each of `module_ids` to the histogram of grades on
+    that problem, see `grade_histogram`.
+
+    The histograms not found in the cache are read with a single query, from
+    the read replica if there is one.
+    """
+    cache_keys = dict((module_id, _grade_histogram_cache_key(module_id)) for module_id in module_ids)
+    cached = cache.get_many(cache_keys.values())
+    histograms = dict(
+        (module_id, cached[cache_key]) for module_id, cache_key in cache_keys.iteritems() if cache_key in cached
+    )
+    missing = dict(
+        (module_id.to_deprecated_string(), module_id) for module_id in cache_keys if module_id not in histograms
+    )
+    if not missing:
+        return histograms
+
+    database = 'read_replica' if 'read_replica' in settings.DATABASES else 'default'
+    cursor = connections[database].cursor()
+
+    placeholders = ', '.join(['%s'] * len(missing))
+    query = """\
+        SELECT courseware_studentmodule.module_id, courseware_studentmodule.grade,
+        COUNT(courseware_studentmodule.student_id)
+        FROM courseware_studentmodule
+        WHERE courseware_studentmodule.module_id IN ({})
+        GROUP BY courseware_studentmodule.module_id, courseware_studentmodule.grade""".format(placeholders)
+    # Passing module ids this way prevents sql-injection.
+    cursor.execute(query, missing.keys())
+
+    grades = dict((module_id, []) for module_id in missing.itervalues())
+    for module_id, grade, count in cursor.fetchall():
+        grades[missing[module_id]].append((grade, count))
+
+    for module_id, module_grades in grades.iteritems():
+        module_grades.sort(key=lambda x: x[0])
+        if len(module_grades) >= 1 and module_grades[0][0] is None:
+            module_grades = []
+        histograms[module_id] = module_grades
+    cache.set_many(
+        dict((cache_keys[module_id], histograms[module_id]) for module_id in grades),
+        GRADE_HISTOGRAM_CACHE_TIMEOUT
+    )
+    return histograms
+
+
 def grade_histogram(module_id):
     '''
     Print out a histogram of grades on a given problem in staff member debug info.
@@ -192,23 +267,7 @@ def grade_histogram(module_id):
     it, their grade is None. Since there will always be at least one such student
     this function almost always returns [].
     '''
-    from django.db import connection
-    cursor = connection.cursor()
-
-    query = """\
-        SELECT courseware_studentmodule.grade,
-        COUNT(courseware_studentmodule.student_id)
-        FROM courseware_studentmodule
-        WHERE courseware_studentmodule.module_id=%s
-        GROUP BY courseware_studentmodule.grade"""
-    # Passing module_id this way prevents sql-injection.
-    cursor.execute(query, [module_id.to_deprecated_string()])
-
-    grades = list(cursor.fetchall())
-    grades.sort(key=lambda x: x[0])  # Add ORDER BY to sql query?
-    if len(grades) >= 1 and grades[0][0] is None:
-        return []
-    return grades
+    return grade_histograms([module_id])[module_id]
 
 
 @contract(user=User, has_instructor_access=bool, block=XBlock, view=basestring, frag=Fragment, context="dict|None")
@@ -246,12 +305,13 @@ def add_staff_markup(user, has_instructor_access, disable_staff_debug_info, bloc
     if isinstance(block, SequenceModule) or getattr(block, 'HIDDEN', False):
         return frag
 
-    block_id = block.location
+    # The histogram is fetched by the staff panel once the page is loaded, see
+    # courseware.views.staff_grade_histograms.
     if block.has_score and settings.FEATURES.get('DISPLAY_HISTOGRAMS_TO_STAFF'):
-        histogram = grade_histogram(block_id)
-        render_histogram = len(histogram) > 0
+        histogram_url = reverse('staff_grade_histograms', kwargs={'course_id': unicode(block.location.course_key)})
+        render_histogram = True
     else:
-        histogram = None
+        histogram_url = None
         render_histogram = False
 
     if settings.FEATURES.get('ENABLE_LMS_MIGRATION') and hasattr(block.runtime, 'filestore'):
@@ -303,7 +363,7 @@ def add_staff_markup(user, has_instructor_access, disable_staff_debug_info, bloc
         'edit_link': edit_link,
         'user': user,
         'xqa_server': settings.FEATURES.get('XQA_SERVER', "http://your_xqa_server.com"),
-        'histogram': json.dumps(histogram),
+        'histogram_url': histogram_url,
         'render_histogram': render_histogram,
         'block_content': frag.content,
         'is_released': is_released,